@@ -0,0 +1,267 @@
+import os
+import time
+import logging
+import tempfile
+from threading import Lock
+from contextlib import ExitStack
+
+import pandas as pd
+
+from core.market_data import get_provider
+
+logger = logging.getLogger(__name__)
+
+# Columns returned to callers; corporate actions are only kept on disk
+OHLCV_COLUMNS = ["Adj Close", "Close", "High", "Low", "Open", "Volume"]
+ACTION_COLUMNS = ["Dividends", "Stock Splits"]
+
+DEFAULT_CACHE_DIR = os.getenv("STOCKIFY_CACHE_DIR", os.path.join(".cache", "ohlcv"))
+
+# How long a stored history is considered fresh before asking the provider again
+DEFAULT_MAX_AGE = int(os.getenv("STOCKIFY_OHLCV_MAX_AGE", "900"))
+
+
+def atomic_pickle(entry, path):
+    """Pickle entry to path through a temp file so readers never see a partial pickle"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        pd.to_pickle(entry, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _history_window(start):
+    # Without a start yfinance defaults to one month, so ask for everything explicitly
+    return {"period": "max"} if start is None else {"start": start}
+
+
+def yf_downloader(ticker, start=None):
+    """Download unadjusted bars plus corporate actions from Yahoo Finance"""
+    return get_provider().download(
+        ticker,
+        **_history_window(start),
+        multi_level_index=False,
+        auto_adjust=False,
+        actions=True,
+    )
+
+
+def yf_batch_downloader(tickers, start=None):
+    """Download several tickers in one grouped Yahoo Finance request, split per ticker"""
+    data = get_provider().download(
+        list(tickers),
+        **_history_window(start),
+        group_by="ticker",
+        auto_adjust=False,
+        actions=True,
+    )
+    if data is None or data.empty:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {tickers[0]: data}
+    available = set(data.columns.get_level_values(0))
+    return {ticker: data[ticker].dropna(how="all") for ticker in tickers if ticker in available}
+
+
+class OHLCVCache:
+    """
+    Incremental on-disk OHLCV store keyed by ticker.
+
+    The full history is downloaded once; later refreshes only ask the
+    downloader for bars from the last stored date onwards. A split or
+    dividend in the new bars, or a change in the Close/Adj Close ratio of
+    the overlapping bar, means every stored adjusted value is stale, so
+    the ticker is invalidated and re-downloaded in full.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, downloader=None, max_age=DEFAULT_MAX_AGE, batch_downloader=None):
+        """
+        Args:
+            cache_dir (str): Directory holding one pickle file per ticker
+            downloader (callable): ``downloader(ticker, start=None) -> DataFrame``
+            max_age (int): Seconds before a stored history is refreshed
+            batch_downloader (callable): ``batch_downloader(tickers, start=None) -> {ticker: DataFrame}``;
+                defaults to one grouped Yahoo request, or to calling downloader per
+                ticker when a custom downloader is given
+        """
+        self.cache_dir = cache_dir
+        self.downloader = downloader or yf_downloader
+        if batch_downloader is None and downloader is None:
+            batch_downloader = yf_batch_downloader
+        self.batch_downloader = batch_downloader
+        self.max_age = max_age
+        self._locks = {}
+        self._locks_lock = Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.stats = {"hits": 0, "refreshes": 0, "misses": 0}
+
+    def _lock_for(self, ticker):
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, Lock())
+
+    def _path(self, ticker):
+        return os.path.join(self.cache_dir, f"{ticker.upper()}.pkl")
+
+    def _load(self, ticker):
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry for {ticker}: {str(e)}")
+            return None
+
+    def _save(self, ticker, entry):
+        atomic_pickle(entry, self._path(ticker))
+
+    def _download(self, ticker, start=None):
+        return self._normalize(self.downloader(ticker, start=start))
+
+    def _download_many(self, tickers, start=None):
+        """Download several tickers in one request, returning normalized frames for all of them"""
+        if self.batch_downloader is None:
+            return {ticker: self._download(ticker, start=start) for ticker in tickers}
+        frames = self.batch_downloader(tickers, start=start)
+        return {ticker: self._normalize(frames.get(ticker)) for ticker in tickers}
+
+    @staticmethod
+    def _normalize(df):
+        if df is None or df.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS + ACTION_COLUMNS)
+        df = df.copy()
+        df.index = pd.DatetimeIndex(df.index).tz_localize(None)
+        df.index.name = "Date"
+        for column in ACTION_COLUMNS:
+            if column not in df.columns:
+                df[column] = 0.0
+        return df.sort_index()
+
+    @staticmethod
+    def _adjustment_changed(stored, fresh):
+        """Return True if bars shared by both frames disagree on the adjustment factor"""
+        overlap = stored.index.intersection(fresh.index)
+        if overlap.empty or "Adj Close" not in fresh.columns:
+            return False
+        old_ratio = stored.loc[overlap, "Adj Close"] / stored.loc[overlap, "Close"]
+        new_ratio = fresh.loc[overlap, "Adj Close"] / fresh.loc[overlap, "Close"]
+        return not ((old_ratio - new_ratio).abs() < 1e-6).all()
+
+    def _refresh(self, ticker, stored, fresh=None):
+        last_date = stored.index.max()
+        if fresh is None:
+            fresh = self._download(ticker, start=last_date.strftime("%Y-%m-%d"))
+        if fresh.empty:
+            return stored
+
+        new_bars = fresh[fresh.index > last_date]
+        has_actions = (new_bars[ACTION_COLUMNS].fillna(0) != 0).any().any()
+        if has_actions or self._adjustment_changed(stored, fresh):
+            logger.info(f"Corporate action detected for {ticker}, invalidating cached history")
+            return self._download(ticker)
+
+        # Newer rows win so the last stored (possibly intraday) bar is replaced
+        merged = pd.concat([stored[~stored.index.isin(fresh.index)], fresh])
+        return merged.sort_index()
+
+    def get(self, ticker, start=None, end=None):
+        """
+        Get the daily history for a ticker, fetching only missing bars
+
+        Args:
+            ticker (str): Stock ticker
+            start (str | datetime): First date to return (inclusive)
+            end (str | datetime): Last date to return (inclusive)
+
+        Returns:
+            pd.DataFrame: Bars indexed by date in ascending order
+        """
+        return self._slice(self._get_history(ticker), start, end)
+
+    @staticmethod
+    def _slice(data, start, end):
+        if start is None and end is None:
+            return data
+        return data.loc[start:end]
+
+    def _get_history(self, ticker):
+        ticker = ticker.upper()
+        with self._lock_for(ticker):
+            entry = self._load(ticker)
+            if entry is not None and time.time() - entry["fetched_at"] < self.max_age:
+                self.stats["hits"] += 1
+                return entry["data"]
+
+            if entry is None or entry["data"].empty:
+                logger.info(f"Downloading full history for {ticker}")
+                self.stats["misses"] += 1
+                data = self._download(ticker)
+            else:
+                logger.info(f"Refreshing cached history for {ticker}")
+                self.stats["refreshes"] += 1
+                data = self._refresh(ticker, entry["data"])
+
+            if not data.empty:
+                self._save(ticker, {"fetched_at": time.time(), "data": data})
+            return data
+
+    def get_many(self, tickers, start=None, end=None):
+        """
+        Get daily histories for several tickers with at most two grouped downloads
+
+        Fresh tickers are served from disk. Tickers never stored are fetched
+        together in one full-history request, and stale ones together in one
+        request starting from the oldest of their last stored dates.
+
+        Args:
+            tickers (list): Stock tickers
+            start (str | datetime): First date to return (inclusive)
+            end (str | datetime): Last date to return (inclusive)
+
+        Returns:
+            dict: Ticker to bars indexed by date in ascending order
+        """
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        histories, missing, stale = {}, [], {}
+        with ExitStack() as stack:
+            # Sorted acquisition so concurrent batches cannot deadlock each other
+            for ticker in sorted(tickers):
+                stack.enter_context(self._lock_for(ticker))
+
+            for ticker in tickers:
+                entry = self._load(ticker)
+                if entry is None or entry["data"].empty:
+                    missing.append(ticker)
+                elif time.time() - entry["fetched_at"] >= self.max_age:
+                    stale[ticker] = entry["data"]
+                else:
+                    histories[ticker] = entry["data"]
+            self.stats["hits"] += len(histories)
+            self.stats["misses"] += len(missing)
+            self.stats["refreshes"] += len(stale)
+
+            if missing:
+                logger.info(f"Downloading full history for {missing}")
+                histories.update(self._download_many(missing))
+            if stale:
+                logger.info(f"Refreshing cached history for {list(stale)}")
+                since = min(data.index.max() for data in stale.values()).strftime("%Y-%m-%d")
+                fresh = self._download_many(list(stale), start=since)
+                for ticker, stored in stale.items():
+                    histories[ticker] = self._refresh(ticker, stored, fresh[ticker])
+
+            for ticker in missing + list(stale):
+                if not histories[ticker].empty:
+                    self._save(ticker, {"fetched_at": time.time(), "data": histories[ticker]})
+
+        return {ticker: self._slice(histories[ticker], start, end) for ticker in tickers}
+
+    def invalidate(self, ticker):
+        """Drop the stored history for a ticker"""
+        with self._lock_for(ticker.upper()):
+            path = self._path(ticker)
+            if os.path.exists(path):
+                os.remove(path)
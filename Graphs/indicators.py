@@ -0,0 +1,261 @@
+import os
+import math
+import time
+import logging
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from Graphs.cache import DEFAULT_CACHE_DIR, atomic_pickle
+
+logger = logging.getLogger(__name__)
+
+SMA_WINDOWS = (20, 50, 200)
+EMA_SPANS = (12, 26)
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_WINDOW, BOLLINGER_STD = 20, 2
+VWAP_WINDOW = 20
+
+INDICATOR_COLUMNS = (
+    [f"SMA_{window}" for window in SMA_WINDOWS]
+    + [f"EMA_{span}" for span in EMA_SPANS]
+    + [f"RSI_{RSI_PERIOD}", "MACD", "MACD_Signal", "MACD_Hist", "BB_Upper", "BB_Middle", "BB_Lower", f"VWAP_{VWAP_WINDOW}"]
+)
+
+INPUT_COLUMNS = ["Close", "High", "Low", "Volume"]
+
+# Input rows kept in the state so every rolling window can be completed from it
+TAIL_ROWS = max(SMA_WINDOWS + (BOLLINGER_WINDOW, VWAP_WINDOW)) - 1
+
+DEFAULT_INDICATOR_DIR = os.getenv(
+    "STOCKIFY_INDICATOR_DIR", os.path.join(os.path.dirname(DEFAULT_CACHE_DIR) or ".", "indicators")
+)
+
+
+# Segments up to this many rows are smoothed in a loop, which beats pandas' per-call setup
+EWM_LOOP_ROWS = 32
+
+
+def _rolling_sum(x, window):
+    """Trailing sum over axis 0, NaN until a full window of valid values"""
+    out = np.full(x.shape, np.nan)
+    if len(x) < window:
+        return out
+    valid = ~np.isnan(x)
+    zero = np.zeros((1,) + x.shape[1:])
+    sums = np.concatenate([zero, np.cumsum(np.where(valid, x, 0.0), axis=0)])
+    gaps = np.concatenate([zero, np.cumsum(~valid, axis=0)])
+    out[window - 1:] = np.where(gaps[window:] - gaps[:-window] > 0, np.nan, sums[window:] - sums[:-window])
+    return out
+
+
+def _rolling_std(x, window):
+    """Trailing population standard deviation over axis 0"""
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = sliding_window_view(x, window, axis=0).std(axis=-1)
+    return out
+
+
+def _ewm(x, alpha, seed=None):
+    """
+    Exponential average with adjust=False over axis 0, skipping NaNs
+
+    With a seed (the previous output row) the recursion continues from it,
+    so a tail update matches a full computation.
+    """
+    if seed is not None:
+        x = np.concatenate([np.broadcast_to(seed, (1,) + x.shape[1:]), x])
+    if len(x) > EWM_LOOP_ROWS:
+        flat = pd.DataFrame(x.reshape(len(x), -1)).ewm(alpha=alpha, adjust=False, ignore_na=True).mean()
+        out = flat.to_numpy().reshape(x.shape)
+    elif x.ndim == 1:
+        out = np.empty_like(x)
+        current = math.nan
+        for i, value in enumerate(x.tolist()):
+            if math.isnan(current):
+                current = value
+            elif not math.isnan(value):
+                current += alpha * (value - current)
+            out[i] = current
+    else:
+        out = np.empty_like(x)
+        current = x[0]
+        for i, value in enumerate(x):
+            current = np.where(np.isnan(current), value, np.where(np.isnan(value), current, current + alpha * (value - current)))
+            out[i] = current
+    return out[1:] if seed is not None else out
+
+
+def compute_indicators(bars, state=None):
+    """
+    Compute every indicator for ascending bars, continuing from a stored state
+
+    Works column-wise, so ``bars`` may hold one ticker (columns Close, High,
+    Low, Volume) or many (a (field, ticker) column MultiIndex). With a
+    state, ``bars`` must be exactly the rows after the state's anchor date
+    and only those rows are computed.
+
+    Args:
+        bars (pd.DataFrame): Daily bars in ascending order
+        state (dict): State returned by a previous call, or None for a full computation
+
+    Returns:
+        tuple: (DataFrame of INDICATOR_COLUMNS for the rows of bars, with
+        (indicator, ticker) columns for many tickers; state anchored at the
+        second-to-last bar so a revised last bar can be recomputed)
+    """
+    fields = [field for field in INPUT_COLUMNS if field in bars]
+    close_input = bars["Close"]
+    columns = close_input.columns if isinstance(close_input, pd.DataFrame) else None
+    inputs = {field: bars[field].to_numpy(dtype=float) for field in fields}
+    new_rows = len(bars)
+    if state:
+        combined = {field: np.concatenate([state["tail"][field], inputs[field]]) for field in fields}
+    else:
+        combined = inputs
+    close = combined["Close"]
+    raw = {}
+
+    for window in SMA_WINDOWS:
+        raw[f"SMA_{window}"] = _rolling_sum(close, window)[-new_rows:] / window
+
+    emas = {}
+    for span in sorted(set(EMA_SPANS) | {MACD_FAST, MACD_SLOW}):
+        emas[span] = _ewm(inputs["Close"], 2 / (span + 1), state["ema"][span] if state else None)
+    for span in EMA_SPANS:
+        raw[f"EMA_{span}"] = emas[span]
+
+    # Wilder smoothing of gains and losses
+    delta = np.diff(close, axis=0, prepend=np.full((1,) + close.shape[1:], np.nan))[-new_rows:]
+    avg_gain = _ewm(np.clip(delta, 0, None), 1 / RSI_PERIOD, state["rsi_gain"] if state else None)
+    avg_loss = _ewm(-np.clip(delta, None, 0), 1 / RSI_PERIOD, state["rsi_loss"] if state else None)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw[f"RSI_{RSI_PERIOD}"] = 100 - 100 / (1 + avg_gain / avg_loss)
+
+    macd = emas[MACD_FAST] - emas[MACD_SLOW]
+    signal = _ewm(macd, 2 / (MACD_SIGNAL + 1), state["macd_signal"] if state else None)
+    raw["MACD"], raw["MACD_Signal"], raw["MACD_Hist"] = macd, signal, macd - signal
+
+    middle = _rolling_sum(close, BOLLINGER_WINDOW)[-new_rows:] / BOLLINGER_WINDOW
+    std = _rolling_std(close, BOLLINGER_WINDOW)[-new_rows:]
+    raw["BB_Upper"], raw["BB_Middle"], raw["BB_Lower"] = middle + BOLLINGER_STD * std, middle, middle - BOLLINGER_STD * std
+
+    if len(fields) == len(INPUT_COLUMNS):
+        typical = (combined["High"] + combined["Low"] + close) / 3
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw[f"VWAP_{VWAP_WINDOW}"] = (
+                _rolling_sum(typical * combined["Volume"], VWAP_WINDOW) / _rolling_sum(combined["Volume"], VWAP_WINDOW)
+            )[-new_rows:]
+
+    if columns is None:
+        out = pd.DataFrame(raw, index=bars.index)
+    else:
+        out = pd.concat({name: pd.DataFrame(values, index=bars.index, columns=columns) for name, values in raw.items()}, axis=1)
+
+    if new_rows < 2:
+        # Nothing settled beyond the previous anchor
+        return out, state
+    tail_index = bars.index[:-1]
+    if state:
+        tail_index = state["tail_index"].append(tail_index)
+    new_state = {
+        "anchor": bars.index[-2],
+        "tail_index": tail_index[-TAIL_ROWS:],
+        "tail": {field: values[:-1][-TAIL_ROWS:] for field, values in combined.items()},
+        "ema": {span: values[-2] for span, values in emas.items()},
+        "rsi_gain": avg_gain[-2],
+        "rsi_loss": avg_loss[-2],
+        "macd_signal": signal[-2],
+    }
+    return out, new_state
+
+
+class IndicatorStore:
+    """
+    Per-ticker indicator history kept on disk next to the OHLCV cache.
+
+    Each entry holds the computed indicator frame plus the state at its
+    second-to-last bar. When the OHLCV history grows, only bars after that
+    anchor are computed. If the stored input tail no longer matches the
+    bars (a split rewrote history), the ticker is recomputed in full.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_INDICATOR_DIR):
+        self.cache_dir = cache_dir
+        self._locks = {}
+        self._locks_lock = Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.stats = {"full": 0, "incremental": 0}
+
+    def _lock_for(self, ticker):
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, Lock())
+
+    def _path(self, ticker):
+        return os.path.join(self.cache_dir, f"{ticker.upper()}.pkl")
+
+    def _load(self, ticker):
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable indicator entry for {ticker}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _tail_matches(state, bars):
+        anchor = state["anchor"]
+        if anchor not in bars.index:
+            return False
+        positions = bars.index.get_indexer(state["tail_index"])
+        if (positions < 0).any():
+            return False
+        for field, tail in state["tail"].items():
+            if field not in bars:
+                return False
+            current = bars[field].to_numpy(dtype=float)[positions]
+            if not np.allclose(current, tail, equal_nan=True):
+                return False
+        return True
+
+    def get(self, ticker, bars):
+        """
+        Indicators for every bar of a ticker's ascending daily history
+
+        Args:
+            ticker (str): Stock ticker
+            bars (pd.DataFrame): Full daily history from the OHLCV cache
+
+        Returns:
+            pd.DataFrame: Indicator columns aligned to bars
+        """
+        ticker = ticker.upper()
+        with self._lock_for(ticker):
+            entry = self._load(ticker)
+            state = entry["state"] if entry else None
+            if state is not None and bars.index[-1] > state["anchor"] and self._tail_matches(state, bars):
+                settled_rows = bars.index.searchsorted(state["anchor"], side="right")
+                values, new_state = compute_indicators(bars.iloc[settled_rows:], state)
+                frame = pd.concat([entry["frame"].loc[:state["anchor"]], values])
+                self.stats["incremental"] += 1
+            else:
+                frame, new_state = compute_indicators(bars)
+                self.stats["full"] += 1
+
+            # A lone recomputed last bar leaves the anchor where it was, so nothing to store
+            if new_state is not None and new_state is not state:
+                atomic_pickle({"updated_at": time.time(), "state": new_state, "frame": frame}, self._path(ticker))
+            return frame
+
+    def invalidate(self, ticker):
+        """Drop the stored indicators for a ticker"""
+        with self._lock_for(ticker.upper()):
+            path = self._path(ticker)
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,101 @@
+import io
+
+import numpy as np
+import orjson
+import pandas as pd
+
+# Media types accepted by /data through the Accept header
+RECORDS_JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.stockify.columnar+json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+
+SUPPORTED_MEDIA_TYPES = [RECORDS_JSON, COLUMNAR_JSON, ARROW_STREAM, PARQUET]
+
+
+def negotiate_media_type(accept_header):
+    """
+    Pick the response format for /data from an Accept header
+
+    Args:
+        accept_header (str): Raw Accept header value, may be empty
+
+    Returns:
+        str: One of SUPPORTED_MEDIA_TYPES, records JSON when nothing matches
+    """
+    if not accept_header:
+        return RECORDS_JSON
+
+    candidates = []
+    for position, part in enumerate(accept_header.split(",")):
+        fields = [f.strip() for f in part.split(";")]
+        media_type = fields[0].lower()
+        quality = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_type in SUPPORTED_MEDIA_TYPES and quality > 0:
+            candidates.append((-quality, position, media_type))
+
+    return min(candidates)[2] if candidates else RECORDS_JSON
+
+
+def _epoch_ms(index):
+    return index.values.astype("datetime64[ms]").astype(np.int64)
+
+
+def _columnar(df: pd.DataFrame) -> dict:
+    payload = {"Date": _epoch_ms(df.index)}
+    for column in df.columns:
+        payload[column] = np.ascontiguousarray(df[column].to_numpy())
+    return payload
+
+
+def to_columnar_json(df: pd.DataFrame) -> bytes:
+    """Serialize bars as one array per column with epoch-ms dates"""
+    return orjson.dumps(_columnar(df), option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def batch_to_columnar_json(frames: dict) -> bytes:
+    """Serialize several tickers' bars as columnar JSON keyed by ticker, listing tickers without data"""
+    payload = {
+        "data": {ticker: _columnar(df) for ticker, df in frames.items() if not df.empty},
+        "missing": [ticker for ticker, df in frames.items() if df.empty],
+    }
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _to_arrow_table(df: pd.DataFrame):
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+
+
+def to_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """Serialize bars as an Arrow IPC stream"""
+    import pyarrow as pa
+
+    table = _to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_parquet(df: pd.DataFrame) -> bytes:
+    """Serialize bars as a Parquet file"""
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    pq.write_table(_to_arrow_table(df), buffer)
+    return buffer.getvalue()
+
+
+SERIALIZERS = {
+    COLUMNAR_JSON: to_columnar_json,
+    ARROW_STREAM: to_arrow_ipc,
+    PARQUET: to_parquet,
+}
@@ -1,11 +1,140 @@
-import yfinance as yf
 import pandas as pd
-import time
 
-# Function to fetch historical stock data
-def getCandlestickChartData(ticker: str) -> pd.DataFrame:
-    # Download stock data using Yahoo Finance API
-    df = yf.download(ticker, multi_level_index=False, auto_adjust=False)
-    
+from Graphs.cache import OHLCVCache, OHLCV_COLUMNS
+from Graphs.indicators import INDICATOR_COLUMNS, IndicatorStore, compute_indicators
+from core.metrics import register_cache
+
+# Shared on-disk store so repeat requests only fetch bars newer than the last stored date
+ohlcv_cache = OHLCVCache()
+# A refresh still downloads, so only histories served straight from disk count as hits
+register_cache("ohlcv", lambda: ohlcv_cache.stats, hits=("hits",), misses=("refreshes", "misses"))
+
+# Daily indicators are stored with their state so new bars only compute the tail
+indicator_store = IndicatorStore()
+register_cache("indicators", lambda: indicator_store.stats, hits=("incremental",), misses=("full",))
+
+# Resample rules for the supported chart intervals
+INTERVAL_RULES = {
+    "1d": None,
+    "1wk": "W-FRI",
+    "1mo": "ME",
+}
+
+# How each column is aggregated when daily bars are resampled
+RESAMPLE_AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+}
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Aggregate ascending daily bars into weekly or monthly bars"""
+    if interval not in INTERVAL_RULES:
+        raise ValueError(f"Unsupported interval '{interval}', expected one of {list(INTERVAL_RULES)}")
+    rule = INTERVAL_RULES[interval]
+    if rule is None or df.empty:
+        return df
+
+    aggregations = {c: RESAMPLE_AGGREGATIONS[c] for c in df.columns if c in RESAMPLE_AGGREGATIONS}
+    resampled = df.resample(rule).agg(aggregations)
+    # Periods without a single bar (market holidays spanning a week) have no close
+    if "Close" in resampled.columns:
+        return resampled.dropna(subset=["Close"])
+    return resampled.dropna(how="all")
+
+
+def validate_columns(columns):
+    """Raise ValueError for any requested column that is not an OHLCV column"""
+    if columns:
+        unknown = [c for c in columns if c not in OHLCV_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown}, expected a subset of {OHLCV_COLUMNS}")
+
+
+def _chart_frame(df: pd.DataFrame, interval: str, columns) -> pd.DataFrame:
+    # Resample every bar column so empty periods are told apart by Close, then keep the requested ones
+    df = resample_ohlcv(df[[c for c in OHLCV_COLUMNS if c in df.columns]], interval)
+    df = df[[c for c in (columns or OHLCV_COLUMNS) if c in df.columns]]
+
     # Return the data (with most recent dates first)
-    return df.sort_index(ascending=False)
\ No newline at end of file
+    return df.sort_index(ascending=False)
+
+
+# Function to fetch historical stock data
+def getCandlestickChartData(ticker: str, start=None, end=None, interval: str = "1d", columns=None) -> pd.DataFrame:
+    validate_columns(columns)
+
+    # Load stock data from the local cache, downloading only missing bars
+    df = ohlcv_cache.get(ticker, start=start, end=end)
+    return _chart_frame(df, interval, columns)
+
+
+def getCandlestickChartBatch(ranges, interval: str = "1d", columns=None) -> dict:
+    """
+    Chart data for several tickers, downloading every uncached ticker in one grouped request
+
+    Args:
+        ranges (list): ``(ticker, start, end)`` tuples; start and end may be None
+        interval (str): One of INTERVAL_RULES
+        columns (list): Subset of OHLCV_COLUMNS, all when omitted
+
+    Returns:
+        dict: Ticker to bars, most recent first, in request order
+    """
+    validate_columns(columns)
+    if interval not in INTERVAL_RULES:
+        raise ValueError(f"Unsupported interval '{interval}', expected one of {list(INTERVAL_RULES)}")
+
+    histories = ohlcv_cache.get_many([ticker for ticker, _, _ in ranges])
+    return {
+        ticker: _chart_frame(histories[ticker.upper()].loc[start:end], interval, columns)
+        for ticker, start, end in ranges
+    }
+
+
+def getIndicatorData(ticker: str, start=None, end=None, interval: str = "1d", indicators=None) -> pd.DataFrame:
+    """
+    Close prices with technical indicators, most recent first
+
+    Daily indicators come from the incremental store; weekly and monthly ones
+    are computed on the resampled bars, which are short enough to redo.
+    """
+    if indicators:
+        unknown = [name for name in indicators if name not in INDICATOR_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown indicators {unknown}, expected a subset of {INDICATOR_COLUMNS}")
+
+    bars = ohlcv_cache.get(ticker)
+    if bars.empty:
+        return pd.DataFrame(columns=["Close"] + list(indicators or INDICATOR_COLUMNS))
+    if interval == "1d":
+        values = indicator_store.get(ticker, bars)
+    else:
+        bars = resample_ohlcv(bars, interval)
+        values = compute_indicators(bars)[0]
+
+    df = pd.concat([bars[["Close"]], values[list(indicators or INDICATOR_COLUMNS)]], axis=1)
+    return df.loc[start:end].sort_index(ascending=False)
+
+
+def iter_ohlcv_frames(tickers, start=None, end=None, interval: str = "1d", columns=None):
+    """
+    Yield one ascending frame per ticker for bulk export, loading a single ticker at a time
+
+    Each frame has the bar date as a ``Date`` column and a leading
+    ``Ticker`` column. Tickers without data are skipped.
+    """
+    validate_columns(columns)
+    if interval not in INTERVAL_RULES:
+        raise ValueError(f"Unsupported interval '{interval}', expected one of {list(INTERVAL_RULES)}")
+    for ticker in tickers:
+        df = getCandlestickChartData(ticker, start=start, end=end, interval=interval, columns=columns)
+        if df.empty:
+            continue
+        df = df.sort_index().reset_index()
+        df.insert(0, "Ticker", ticker)
+        yield df
@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+from threading import Event, Lock, Thread
+
+from Report.llm_scheduler import BATCH, llm_priority
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOBS_DB = os.getenv("STOCKIFY_JOBS_DB", os.path.join(".cache", "report_jobs.sqlite3"))
+
+# Seconds without a heartbeat after which another worker may take over a job
+JOB_LEASE_SECONDS = float(os.getenv("STOCKIFY_JOB_LEASE", "60"))
+
+# Identifies this process as the owner of the jobs it runs
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+COLUMNS = ["id", "symbols", "status", "stages", "result", "error", "created_at", "updated_at", "owner", "heartbeat_at"]
+
+# Job lifecycle states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def report_stages(symbols):
+    """Ordered stage names of the report pipeline for a list of symbols"""
+    return ["market"] + [f"company:{symbol}" for symbol in symbols] + ["strategist", "team_lead"]
+
+
+class JobStore:
+    """SQLite-backed store for report jobs, safe to use from worker threads"""
+
+    def __init__(self, path=DEFAULT_JOBS_DB):
+        self.path = path
+        self._lock = Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    symbols TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stages TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    heartbeat_at REAL
+                )
+                """
+            )
+            # Stores created before job leases existed
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _row_to_job(row):
+        job_id, symbols, status, stages, result, error, created_at, updated_at, owner, heartbeat_at = row
+        return {
+            "job_id": job_id,
+            "symbols": json.loads(symbols),
+            "status": status,
+            "stages": json.loads(stages),
+            "result": result,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "owner": owner,
+            "heartbeat_at": heartbeat_at,
+        }
+
+    def create(self, symbols, owner=None):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        stages = {stage: "pending" for stage in report_stages(symbols)}
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, NULL, NULL, ?, ?, ?, ?)",
+                (job_id, json.dumps(symbols), QUEUED, json.dumps(stages), now, now, owner, now),
+            )
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def delete(self, job_id):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def update(self, job_id, status=None, result=None, error=None, owner=None):
+        """
+        Update a job's status, result or error
+
+        Args:
+            owner (str): When given, only update while this worker still holds the job
+
+        Returns:
+            bool: Whether the job was updated
+        """
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = COALESCE(?, status), result = COALESCE(?, result),
+                    error = COALESCE(?, error), updated_at = ?
+                WHERE id = ? AND (? IS NULL OR owner = ?)
+                """,
+                (status, result, error, time.time(), job_id, owner, owner),
+            )
+            return cursor.rowcount == 1
+
+    def set_stage(self, job_id, stage, status, owner=None):
+        # Read-modify-write under the lock so concurrent company stages don't clobber each other
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT stages FROM jobs WHERE id = ? AND (? IS NULL OR owner = ?)", (job_id, owner, owner)
+            ).fetchone()
+            if row is None:
+                return
+            stages = json.loads(row[0])
+            stages[stage] = status
+            conn.execute(
+                "UPDATE jobs SET stages = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(stages), time.time(), job_id),
+            )
+
+    def unfinished(self):
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def heartbeat(self, owner):
+        """Renew the lease on every unfinished job held by owner"""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN (?, ?)",
+                (time.time(), owner, QUEUED, RUNNING),
+            )
+
+    def claim_stale(self, owner, lease=JOB_LEASE_SECONDS):
+        """
+        Take over unfinished jobs whose owner stopped renewing its lease
+
+        Each job is claimed with a conditional UPDATE, so when several
+        workers start at once every job goes to exactly one of them.
+
+        Returns:
+            list: Jobs now owned by owner, reset to queued
+        """
+        now = time.time()
+        claimed = []
+        for job in self.unfinished():
+            if job["owner"] == owner:
+                continue
+            with self._lock, self._connect() as conn:
+                cursor = conn.execute(
+                    """
+                    UPDATE jobs SET owner = ?, heartbeat_at = ?, status = ?, updated_at = ?
+                    WHERE id = ? AND status IN (?, ?)
+                        AND (owner IS NULL OR heartbeat_at IS NULL OR heartbeat_at < ?)
+                    """,
+                    (owner, now, QUEUED, now, job["job_id"], QUEUED, RUNNING, now - lease),
+                )
+            if cursor.rowcount == 1:
+                claimed.append({**job, "owner": owner, "status": QUEUED})
+        return claimed
+
+    def release(self, job_id, owner):
+        """Give up a claimed job so another worker, or a later claim, can run it"""
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE jobs SET owner = NULL WHERE id = ? AND owner = ?", (job_id, owner))
+
+
+class ReportJobManager:
+    """
+    Runs report jobs on a bounded pool and records their progress in a JobStore.
+
+    Every job is leased to the worker running it, which renews the lease
+    while the job is unfinished. Jobs whose owner stops renewing (the
+    worker died) are claimed by another worker, so each job runs once
+    however many workers share the store.
+    """
+
+    def __init__(self, store, pool, report_fn=None, worker_id=WORKER_ID, lease=JOB_LEASE_SECONDS):
+        self.store = store
+        self.pool = pool
+        self._report_fn = report_fn
+        self.worker_id = worker_id
+        self.lease = lease
+        self._stop = Event()
+        self._thread = None
+
+    @property
+    def report_fn(self):
+        # The report pipeline pulls in the LLM SDK, so it is imported by the first job
+        if self._report_fn is None:
+            from Report.report import get_final_investment_report
+
+            self._report_fn = get_final_investment_report
+        return self._report_fn
+
+    def submit(self, symbols):
+        """
+        Queue a report job
+
+        Args:
+            symbols (list): Normalized stock symbols
+
+        Returns:
+            str: Job id
+
+        Raises:
+            PoolSaturated: If the worker pool cannot accept more jobs
+        """
+        job_id = self.store.create(symbols, owner=self.worker_id)
+        try:
+            self.pool.submit(self._run, job_id, symbols)
+        except Exception:
+            self.store.delete(job_id)
+            raise
+        return job_id
+
+    def _run(self, job_id, symbols):
+        if not self.store.update(job_id, status=RUNNING, owner=self.worker_id):
+            logger.warning(f"Report job {job_id} was taken over by another worker, skipping")
+            return
+        logger.info(f"Running report job {job_id} for {symbols}")
+        # Background jobs yield the LLM budget to interactive requests
+        priority_token = llm_priority.set(BATCH)
+        try:
+            report = self.report_fn(
+                symbols,
+                progress=lambda stage, status: self.store.set_stage(job_id, stage, status, owner=self.worker_id),
+            )
+            if report.startswith("Error generating final investment report"):
+                self.store.update(job_id, status=FAILED, error=report, owner=self.worker_id)
+            else:
+                self.store.update(job_id, status=DONE, result=report, owner=self.worker_id)
+        except Exception as e:
+            logger.error(f"Report job {job_id} failed: {str(e)}")
+            self.store.update(job_id, status=FAILED, error=str(e), owner=self.worker_id)
+        finally:
+            llm_priority.reset(priority_token)
+
+    def resume_unfinished(self):
+        """Claim and requeue jobs whose worker stopped renewing their lease"""
+        resumed = 0
+        for job in self.store.claim_stale(self.worker_id, self.lease):
+            try:
+                self.pool.submit(self._run, job["job_id"], job["symbols"])
+                resumed += 1
+            except Exception as e:
+                # Pool is full; leave the job for a later claim rather than failing it
+                logger.warning(f"Could not resume report job {job['job_id']}: {str(e)}")
+                self.store.release(job["job_id"], self.worker_id)
+        if resumed:
+            logger.info(f"Resumed {resumed} unfinished report jobs")
+        return resumed
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.lease / 3):
+            try:
+                self.store.heartbeat(self.worker_id)
+                self.resume_unfinished()
+            except Exception as e:
+                logger.error(f"Report job heartbeat failed: {str(e)}")
+
+    def start(self):
+        """Resume orphaned jobs, then keep leases fresh and pick up jobs of workers that die later"""
+        self.resume_unfinished()
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._heartbeat, name="report-jobs-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
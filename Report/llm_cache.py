@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+
+from Graphs.cache import DEFAULT_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_CACHE_DIR = os.getenv("STOCKIFY_LLM_CACHE_DIR", os.path.join(".cache", "llm"))
+
+# Prompts embed market data, so an answer is only reused while that data is fresh
+DEFAULT_LLM_CACHE_TTL = int(os.getenv("STOCKIFY_LLM_CACHE_TTL", str(DEFAULT_MAX_AGE)))
+DEFAULT_LLM_CACHE_ENTRIES = int(os.getenv("STOCKIFY_LLM_CACHE_ENTRIES", "512"))
+
+# Disk budget for cached responses; least recently used files go first once exceeded
+DEFAULT_LLM_CACHE_DISK_BYTES = int(os.getenv("STOCKIFY_LLM_CACHE_DISK_MB", "256")) * 1024 * 1024
+
+# Seconds between sweeps for expired files while the size budget holds
+PRUNE_INTERVAL = 300
+
+
+def agent_cache_key(agent, prompt):
+    """Content hash of everything that determines an agent's answer"""
+    model = getattr(agent, "model", None)
+    identity = {
+        "model": getattr(model, "id", None),
+        "description": getattr(agent, "description", None),
+        "instructions": getattr(agent, "instructions", None),
+        "prompt": prompt,
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of agent responses: an in-memory LRU in front of one
+    JSON file per key on disk. Entries expire ttl seconds after they were
+    written, in both tiers.
+
+    Expired files are deleted at startup and then on writes, at most every
+    PRUNE_INTERVAL seconds or as soon as the directory outgrows
+    max_disk_bytes, in which case the least recently read files go too.
+    A file's mtime is its write time and its atime, set explicitly on disk
+    hits, its last use.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_LLM_CACHE_DIR, ttl=DEFAULT_LLM_CACHE_TTL, max_entries=DEFAULT_LLM_CACHE_ENTRIES,
+                 max_disk_bytes=DEFAULT_LLM_CACHE_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = Lock()
+        self._prune_lock = Lock()
+        self._disk_bytes = 0
+        self._pruned_at = 0.0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "pruned": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.prune()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            # Record the read for LRU pruning without touching the write time
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {key}: {str(e)}")
+            return None
+
+    def _write_disk(self, key, entry):
+        if not self.cache_dir:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+                size = f.tell()
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            logger.warning(f"Could not write LLM cache entry {key}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._disk_bytes += size
+            due = self._disk_bytes > self.max_disk_bytes or time.time() - self._pruned_at >= PRUNE_INTERVAL
+        if due:
+            self.prune()
+
+    def prune(self):
+        """
+        Delete expired files, then the least recently used ones until the directory fits max_disk_bytes
+
+        Returns:
+            int: Number of files deleted; 0 as well when another thread is already pruning
+        """
+        if not self.cache_dir or not self._prune_lock.acquire(blocking=False):
+            return 0
+        try:
+            now = time.time()
+            kept = []
+            removed = 0
+            for item in os.scandir(self.cache_dir):
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                # Temp files left by a crashed write are dropped on the same schedule
+                if item.name.endswith((".json", ".tmp")) and now - stat.st_mtime >= self.ttl:
+                    removed += self._remove(item.path)
+                elif item.name.endswith(".json"):
+                    kept.append((stat.st_atime, stat.st_size, item.path))
+
+            total = sum(size for _, size, _ in kept)
+            for _, size, path in sorted(kept):
+                if total <= self.max_disk_bytes:
+                    break
+                removed += self._remove(path)
+                total -= size
+
+            with self._lock:
+                self._disk_bytes = total
+                self._pruned_at = now
+                self.stats["pruned"] += removed
+            if removed:
+                logger.info(f"Pruned {removed} LLM cache files, {total / 1024 / 1024:.1f} MB left")
+            return removed
+        finally:
+            self._prune_lock.release()
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+
+    def _fresh(self, entry):
+        return entry is not None and time.time() - entry["created_at"] < self.ttl
+
+    def get(self, agent, prompt):
+        """Return the cached response text, or None on a miss"""
+        key = agent_cache_key(agent, prompt)
+        with self._lock:
+            entry = self._memory.get(key)
+            if self._fresh(entry):
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry["text"]
+            self._memory.pop(key, None)
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if self._fresh(entry):
+                self._remember(key, entry)
+                self.stats["disk_hits"] += 1
+                return entry["text"]
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, agent, prompt, text):
+        key = agent_cache_key(agent, prompt)
+        entry = {"created_at": time.time(), "text": text}
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def hit_ratio(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = 0
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,211 @@
+import os
+import time
+import heapq
+import random
+import logging
+import itertools
+import contextvars
+from threading import Condition, Lock
+
+from core.metrics import COUNTER, registry
+from core.pipeline import DeadlineExceeded, check_deadline, remaining_time
+
+logger = logging.getLogger(__name__)
+
+# Lower value is served first
+INTERACTIVE = 0
+BATCH = 1
+
+# Priority of LLM calls made by the current request; jobs switch it to BATCH
+llm_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+class RateLimited(Exception):
+    """Raised when an LLM call is still throttled after all retries"""
+
+
+def submit_with_context(executor, fn, *args, **kwargs):
+    """Submit to an executor so the task sees the caller's context variables"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def is_rate_limit_error(error):
+    """
+    Whether an error, or one it was raised from, is the model API throttling us
+
+    Only exception types and status codes count: messages can mention 429
+    or quote a rate limit without the call having been throttled.
+    """
+    # Imported here since the Google SDK is only loaded once an agent has run
+    from google.api_core.exceptions import ResourceExhausted, TooManyRequests
+
+    while error is not None and not isinstance(error, DeadlineExceeded):
+        if isinstance(error, (TooManyRequests, ResourceExhausted, RateLimited)):
+            return True
+        if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+            return True
+        response = getattr(error, "response", None)
+        if getattr(response, "status_code", None) == 429:
+            return True
+        error = error.__cause__
+    return False
+
+
+def estimate_tokens(text):
+    # Roughly four characters per token for English prose
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate_per_minute; None means unlimited"""
+
+    def __init__(self, rate_per_minute, clock=time.monotonic):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = rate_per_minute
+        self.tokens = rate_per_minute
+        self.clock = clock
+        self.updated_at = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_minute / 60)
+        self.updated_at = now
+
+    def wait_time(self, amount):
+        """Seconds until amount tokens are available (amount is capped at capacity)"""
+        if not self.rate_per_minute:
+            return 0.0
+        self._refill()
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing * 60 / self.rate_per_minute)
+
+    def consume(self, amount):
+        if self.rate_per_minute:
+            self.tokens -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM calls.
+
+    Callers wait for a request token and an estimated number of model
+    tokens, interactive callers ahead of batch ones. A call that fails
+    with a rate-limit error is retried with jittered exponential backoff.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_retries=4, base_delay=1.0, max_delay=30.0):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._condition = Condition(Lock())
+        self._waiters = []
+        self._sequence = itertools.count()
+        self.stats = {
+            "calls": 0, "retries": 0, "throttled": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+            "tokens_in": 0, "tokens_out": 0,
+        }
+
+    def _acquire(self, priority, tokens):
+        ticket = (priority, next(self._sequence))
+        started = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    # Never queue for budget past the request deadline
+                    check_deadline()
+                    remaining = remaining_time()
+                    if self._waiters[0] == ticket:
+                        delay = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                        if delay == 0:
+                            self.requests.consume(1)
+                            self.tokens.consume(tokens)
+                            break
+                        self._condition.wait(timeout=delay if remaining is None else min(delay, remaining))
+                    else:
+                        self._condition.wait(timeout=remaining)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+        waited = time.monotonic() - started
+        with self._condition:
+            self.stats["wait_seconds_total"] += waited
+            self.stats["wait_seconds_max"] = max(self.stats["wait_seconds_max"], waited)
+        return waited
+
+    def record_usage(self, tokens_in, tokens_out):
+        """Count the model tokens of a finished call"""
+        with self._condition:
+            self.stats["tokens_in"] += tokens_in
+            self.stats["tokens_out"] += tokens_out
+
+    def backoff_delay(self, attempt):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def call(self, fn, estimated_tokens=1, priority=None):
+        """
+        Run fn once the rate budget allows it, retrying on rate-limit errors
+
+        Args:
+            fn (callable): Zero-argument function making the LLM request
+            estimated_tokens (int): Tokens charged against the per-minute budget
+            priority (int): INTERACTIVE or BATCH; defaults to the llm_priority context
+
+        Returns:
+            The return value of fn
+
+        Raises:
+            RateLimited: If every attempt was throttled
+        """
+        priority = llm_priority.get() if priority is None else priority
+        for attempt in range(self.max_retries + 1):
+            self._acquire(priority, estimated_tokens)
+            with self._condition:
+                self.stats["calls"] += 1
+            try:
+                return fn()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                with self._condition:
+                    self.stats["throttled"] += 1
+                if attempt == self.max_retries:
+                    raise RateLimited(f"Rate limited after {attempt + 1} attempts: {str(e)}") from e
+                delay = self.backoff_delay(attempt)
+                remaining = remaining_time()
+                if remaining is not None and delay >= remaining:
+                    raise DeadlineExceeded(f"Rate limited with no time left before the request deadline: {str(e)}") from e
+                logger.warning(f"LLM call throttled, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                with self._condition:
+                    self.stats["retries"] += 1
+                time.sleep(delay)
+
+
+def _env_rate(name, default):
+    value = int(os.getenv(name, str(default)))
+    return value or None
+
+
+llm_scheduler = LLMScheduler(
+    requests_per_minute=_env_rate("STOCKIFY_LLM_RPM", 15),
+    tokens_per_minute=_env_rate("STOCKIFY_LLM_TPM", 1_000_000),
+    max_retries=int(os.getenv("STOCKIFY_LLM_MAX_RETRIES", "4")),
+)
+
+
+def _collect_llm_metrics():
+    stats = dict(llm_scheduler.stats)
+    for direction in ("in", "out"):
+        yield ("stockify_llm_tokens_total", COUNTER, "Model tokens, as reported by the model or else estimated",
+               {"direction": direction}, stats[f"tokens_{direction}"])
+    for outcome in ("calls", "retries", "throttled"):
+        yield "stockify_llm_requests_total", COUNTER, "LLM call attempts by outcome", {"outcome": outcome}, stats[outcome]
+    yield "stockify_llm_wait_seconds_total", COUNTER, "Time spent queued for the LLM rate budget", {}, stats["wait_seconds_total"]
+
+
+registry.register_collector(_collect_llm_metrics)
@@ -0,0 +1,108 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Columns of compute_performance, before the optional Beta
+PERFORMANCE_COLUMNS = ["Period % Change", "CAGR %", "Volatility %", "Max Drawdown %", "Sharpe"]
+
+
+def close_matrix(data, symbols):
+    """
+    Normalize a yf.download result into a wide Close matrix (dates x symbols)
+
+    Args:
+        data (pd.DataFrame): Result of ``yf.download(symbols)`` with column grouping
+        symbols (list): Requested symbols, used when yfinance drops the ticker level
+
+    Returns:
+        pd.DataFrame: Close prices with one column per symbol
+    """
+    if data is None or data.empty:
+        return pd.DataFrame(columns=symbols)
+
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(symbols[0])
+    closes = closes.astype(float)
+    closes.index = pd.DatetimeIndex(closes.index).tz_localize(None)
+    return closes.sort_index()
+
+
+def _beta(returns, benchmark_returns):
+    """Beta of every column against the benchmark over the dates both have returns"""
+    r = returns.to_numpy()
+    b = np.broadcast_to(benchmark_returns.to_numpy()[:, None], r.shape)
+    mask = ~np.isnan(r) & ~np.isnan(b)
+    count = mask.sum(axis=0)
+
+    r = np.where(mask, r, np.nan)
+    b = np.where(mask, b, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r_dev = r - np.nanmean(r, axis=0)
+        b_dev = b - np.nanmean(b, axis=0)
+        covariance = np.nansum(r_dev * b_dev, axis=0) / (count - 1)
+        variance = np.nansum(b_dev * b_dev, axis=0) / (count - 1)
+        beta = covariance / variance
+    beta[count < 2] = np.nan
+    return pd.Series(beta, index=returns.columns)
+
+
+def compute_performance(closes, benchmark=None, risk_free_rate=0.0, periods_per_year=TRADING_DAYS_PER_YEAR):
+    """
+    Compute performance metrics for every column of a Close matrix in one pass
+
+    Args:
+        closes (pd.DataFrame): Close prices, dates x symbols, ascending dates
+        benchmark (str): Column to compute beta against; beta is omitted when None
+        risk_free_rate (float): Annual risk-free rate used by the Sharpe ratio
+        periods_per_year (int): Bars per year used to annualize
+
+    Returns:
+        pd.DataFrame: One row per symbol with period return, CAGR, volatility,
+        max drawdown (all in %), Sharpe and beta
+    """
+    closes = closes.dropna(axis=1, how="all")
+    valid = closes.notna()
+    has_history = valid.sum() > 1
+    closes = closes.loc[:, has_history]
+    valid = valid.loc[:, has_history]
+    if closes.empty:
+        # No symbol has two prices, e.g. every download failed
+        columns = PERFORMANCE_COLUMNS + (["Beta"] if benchmark is not None else [])
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="Symbol"), dtype=float)
+
+    first_price = closes.bfill().iloc[0]
+    last_price = closes.ffill().iloc[-1]
+    period_return = last_price / first_price - 1
+
+    # First and last dates with a price, per column
+    dates = closes.index.to_numpy()
+    first_date = pd.Series(dates[valid.to_numpy().argmax(axis=0)], index=closes.columns)
+    last_date = pd.Series(dates[len(dates) - 1 - valid.to_numpy()[::-1].argmax(axis=0)], index=closes.columns)
+    years = (last_date - first_date).dt.days / 365.25
+    cagr = (1 + period_return) ** (1 / years.where(years > 0)) - 1
+
+    returns = closes.pct_change(fill_method=None)
+    volatility = returns.std() * np.sqrt(periods_per_year)
+    sharpe = (returns.mean() * periods_per_year - risk_free_rate) / volatility
+
+    filled = closes.ffill()
+    max_drawdown = (filled / filled.cummax() - 1).min()
+
+    result = pd.DataFrame({
+        "Period % Change": period_return * 100,
+        "CAGR %": cagr * 100,
+        "Volatility %": volatility * 100,
+        "Max Drawdown %": max_drawdown * 100,
+        "Sharpe": sharpe,
+    })
+    if benchmark is not None and benchmark in returns.columns:
+        result["Beta"] = _beta(returns, returns[benchmark])
+
+    result.index.name = "Symbol"
+    return result.round(2)
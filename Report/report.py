@@ -1,15 +1,22 @@
 import os
-import yfinance as yf
-from agno.agent import Agent
-from agno.models.google import Gemini
 import time
-from google.api_core.exceptions import TooManyRequests
 import logging
 import pandas as pd
 import asyncio
-import concurrent.futures
-from threading import Lock
-from concurrent.futures import ThreadPoolExecutor
+import queue
+import contextvars
+from threading import Lock, Thread
+from types import SimpleNamespace
+
+from Report.llm_cache import LLMResponseCache, DEFAULT_LLM_CACHE_TTL
+from core.memo import SingleFlightCache
+from core.metrics import agent_run_duration, register_cache
+from core.market_data import get_provider
+from core.executors import pipeline_pool
+from core.pipeline import DONE, Deadline, DeadlineExceeded, Stage, check_deadline, run_pipeline
+from Report.llm_scheduler import RateLimited, estimate_tokens, llm_scheduler, submit_with_context
+from Report.performance import close_matrix, compute_performance
+from news.store import article_store
 
 
 # Set up logging
@@ -19,57 +26,136 @@ logger = logging.getLogger(__name__)
 # Set environment variable for Google API
 google_api_key = os.getenv("GOOGLE_API_KEY")
 
+# Benchmark used for beta in the market performance table
+BENCHMARK_SYMBOL = os.getenv("STOCKIFY_BENCHMARK", "SPY")
+
+# Seconds a whole report may take; stages still running then are abandoned and marked incomplete
+REPORT_DEADLINE = float(os.getenv("STOCKIFY_REPORT_DEADLINE", "180"))
+
+# Seconds a scraped article stays recent enough to stand in for a live news lookup
+REPORT_NEWS_MAX_AGE = float(os.getenv("STOCKIFY_REPORT_NEWS_MAX_AGE", "86400"))
+
 # Thread lock for shared resources
 data_lock = Lock()
 
-def compare_stocks(symbols):
+def report_progress(progress, stage, status):
+    """Forward a stage status change to an optional progress callback"""
+    if progress is None:
+        return
     try:
-        logger.info(f"Downloading stock data for: {symbols}")
-        data = yf.download(symbols, period="6mo", group_by="ticker")
-        result = []
-
-        for symbol in symbols:
-            try:
-                if len(symbols) == 1:
-                    # Single stock case
-                    close_prices = data['Close'].dropna()
-                else:
-                    # Multiple stocks case
-                    if symbol in data.columns.levels[0]:
-                        close_prices = data[symbol]['Close'].dropna()
-                    else:
-                        logger.warning(f"No data found for {symbol}")
-                        continue
-                
-                if not close_prices.empty and len(close_prices) > 1:
-                    initial = (close_prices[1] - close_prices[0]) / close_prices[0]
-                    total = close_prices.pct_change().sum()
-                    result.append({
-                        "Symbol": symbol,
-                        "Initial % Change": round(initial * 100, 2),  # Convert to percentage
-                        "6-Month % Change": round(total * 100, 2)     # Convert to percentage
-                    })
-                    logger.info(f"Data processed for {symbol}")
-                else:
-                    logger.warning(f"Insufficient data for {symbol}")
-            except Exception as e:
-                logger.error(f"Error processing {symbol}: {str(e)}")
-                continue
-        
-        return pd.DataFrame(result).set_index("Symbol") if result else pd.DataFrame()
+        progress(stage, status)
+    except Exception as e:
+        logger.warning(f"Progress callback failed for {stage}: {str(e)}")
+
+# Tokens reserved for each answer on top of the prompt when budgeting LLM calls
+RESPONSE_TOKEN_ESTIMATE = 1024
+
+# Identical prompts to the same agent reuse the previous answer while market data is fresh
+llm_cache = LLMResponseCache()
+register_cache("llm", lambda: llm_cache.stats, hits=("memory_hits", "disk_hits"), misses=("misses",))
+
+class LazyAgent:
+    """
+    Agent built on first use, so importing this module does not load the Gemini SDK.
+
+    Model id, description and instructions are available before the agent
+    exists, which is all the response cache needs to key a prompt.
+    """
+
+    def __init__(self, name, model_id, **options):
+        self.name = name
+        self.model = SimpleNamespace(id=model_id)
+        self.description = options.get("description")
+        self.instructions = options.get("instructions")
+        self._options = options
+        self._agent = None
+        self._lock = Lock()
+
+    def load(self):
+        with self._lock:
+            if self._agent is None:
+                from agno.agent import Agent
+                from agno.models.google import Gemini
+
+                self._agent = Agent(model=Gemini(id=self.model.id), **self._options)
+            return self._agent
+
+    def run(self, *args, **kwargs):
+        return self.load().run(*args, **kwargs)
+
+def _reported_usage(response):
+    """(input, output) tokens from an agent response's metrics, or None if the model reported none"""
+    metrics = getattr(response, "metrics", None) or {}
+    usage = []
+    for key in ("input_tokens", "output_tokens"):
+        value = metrics.get(key) or 0
+        # Agents aggregate per-message metrics into lists
+        usage.append(sum(value) if isinstance(value, list) else value)
+    return tuple(usage) if any(usage) else None
+
+def run_agent(agent, prompt, on_token=None):
+    """Run an agent and return its text, forwarding streamed chunks to on_token when given"""
+    check_deadline()
+    cached = llm_cache.get(agent, prompt)
+    if cached is not None:
+        if on_token is not None:
+            on_token(cached)
+        return cached
+
+    def call():
+        usage = None
+        with agent_run_duration.time(agent=getattr(agent, "name", None) or "agent"):
+            if on_token is None:
+                response = agent.run(prompt)
+                text = str(response.content)
+                usage = _reported_usage(response)
+            else:
+                chunks = []
+                for chunk in agent.run(prompt, stream=True):
+                    # Stop consuming a stream the request has already given up on
+                    check_deadline()
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        on_token(chunk.content)
+                text = "".join(chunks)
+        llm_scheduler.record_usage(*(usage or (estimate_tokens(prompt), estimate_tokens(text))))
+        return text
+
+    # All agents share one process-wide request/token budget with 429 backoff
+    text = llm_scheduler.call(call, estimated_tokens=estimate_tokens(prompt) + RESPONSE_TOKEN_ESTIMATE)
+
+    if text and text != "None":
+        llm_cache.set(agent, prompt, text)
+    return text
+
+def compare_stocks(symbols, benchmark=BENCHMARK_SYMBOL):
+    try:
+        tickers = list(dict.fromkeys(symbols + [benchmark]))
+        logger.info(f"Downloading stock data for: {tickers}")
+        data = get_provider().download(tickers, period="6mo", auto_adjust=True)
+        closes = close_matrix(data, tickers)
+
+        performance = compute_performance(closes, benchmark=benchmark)
+        missing = [symbol for symbol in symbols if symbol not in performance.index]
+        if missing:
+            logger.warning(f"Insufficient data for {missing}")
+
+        result = performance.reindex([symbol for symbol in symbols if symbol in performance.index])
+        return result.rename(columns={"Period % Change": "6-Month % Change"})
     except Exception as e:
         logger.error(f"Error fetching data: {str(e)}")
         return pd.DataFrame()
 
 # Market Analyst Agent
-market_analyst = Agent(
-    model=Gemini(id="models/gemini-2.0-flash-001"),
+market_analyst = LazyAgent(
+    "market_analyst",
+    "models/gemini-2.0-flash-001",
     description="Analyzes and compares stock performance over time.",
     show_tool_calls=True,
     markdown=True
 )
 
-def get_market_analysis(symbols):
+def get_market_analysis(symbols, on_token=None):
     try:
         logger.info(f"Starting market analysis for symbols: {symbols}")
         performance_data = compare_stocks(symbols)
@@ -84,7 +170,7 @@ def get_market_analysis(symbols):
 
         prompt = (
             "You are a professional equity analyst. Analyze the stock performance data below.\n\n"
-            f"Stock Performance Data (6-month period):\n{formatted_table}\n\n"
+            f"Stock Performance Data (6-month period, beta vs {BENCHMARK_SYMBOL}):\n{formatted_table}\n\n"
             "Tasks:\n"
             "1. Compare and rank these stocks from best to worst performing\n"
             "2. Use the specific percentage numbers in your analysis\n"
@@ -94,20 +180,35 @@ def get_market_analysis(symbols):
         )
 
         logger.info("Calling market analyst agent...")
-        analysis = market_analyst.run(prompt)
+        analysis = run_agent(market_analyst, prompt, on_token)
         logger.info("Market analysis completed")
-        return str(analysis.content)
+        return analysis
 
+    except (DeadlineExceeded, RateLimited):
+        # Let the pipeline mark the section as incomplete and the caller see the rate limit
+        raise
     except Exception as e:
         logger.error(f"Error in market analysis: {str(e)}")
         return f"Error in market analysis: {str(e)}"
 
+# Per-symbol results shared across reports; concurrent requests for a symbol share one computation.
+# A leader running out of its own request's time leaves the work to the requests still waiting.
+symbol_cache = SingleFlightCache(ttl=DEFAULT_LLM_CACHE_TTL, retry_on=(DeadlineExceeded,))
+register_cache("symbol", lambda: symbol_cache.stats, hits=("hits", "coalesced"), misses=("misses",))
+
 # Company Researcher Functions
 def get_company_info(symbol):
+    return symbol_cache.get_or_compute(
+        ("info", symbol),
+        lambda: fetch_company_info(symbol),
+        should_cache=lambda info: info["name"] != "N/A",
+    )
+
+def fetch_company_info(symbol):
     try:
         logger.info(f"Fetching company info for {symbol}")
-        stock = yf.Ticker(symbol)  # Create new Ticker instance for each symbol
-        info = stock.get_info()
+        # Lookups for several symbols at once are batched by the provider
+        info = get_provider().get_info(symbol)
         result = {
             "symbol": symbol,  # Store symbol for validation
             "name": info.get("longName", "N/A"),
@@ -128,10 +229,20 @@ def get_company_info(symbol):
         }
 
 def get_company_news(symbol):
+    # Scraped articles are indexed by symbol, so prefer recent ones over a new network call
+    indexed = article_store.by_symbols([symbol], limit=3, start=time.time() - REPORT_NEWS_MAX_AGE)
+    if indexed:
+        return [{"title": article["title"], "symbol": symbol} for article in indexed]
+    return symbol_cache.get_or_compute(
+        ("news", symbol),
+        lambda: fetch_company_news(symbol),
+        should_cache=bool,
+    )
+
+def fetch_company_news(symbol):
     try:
         logger.info(f"Fetching news for {symbol}")
-        stock = yf.Ticker(symbol)  # Create new Ticker instance
-        news = stock.news[:3]  # Limit to 3 news items
+        news = get_provider().get_news(symbol)[:3]  # Limit to 3 news items
         news_summary = [{"title": item.get("title", "N/A"), "symbol": symbol} for item in news]
         logger.debug(f"News for {symbol}: {news_summary}")
         return news_summary
@@ -141,13 +252,21 @@ def get_company_news(symbol):
 
 
 
-company_researcher = Agent(
-    model=Gemini(id="models/gemini-2.0-flash-001"),
+company_researcher = LazyAgent(
+    "company_researcher",
+    "models/gemini-2.0-flash-001",
     description="Fetches company profiles, financials, and latest news.",
     markdown=True
 )
 
 def get_company_analysis(symbol):
+    return symbol_cache.get_or_compute(
+        ("analysis", symbol),
+        lambda: analyze_company(symbol),
+        should_cache=lambda analysis: not analysis.startswith("Error"),
+    )
+
+def analyze_company(symbol):
     try:
         logger.info(f"Starting company analysis for {symbol}")
         info = get_company_info(symbol)
@@ -172,8 +291,7 @@ def get_company_analysis(symbol):
         )
         
         logger.debug(f"Prompt for {symbol}: {prompt[:200]}...")
-        response = company_researcher.run(prompt)
-        response_text = str(response.content)
+        response_text = run_agent(company_researcher, prompt)
         
         # Validate that the response mentions the correct symbol
         if symbol not in response_text and info["name"] not in response_text:
@@ -183,49 +301,69 @@ def get_company_analysis(symbol):
         logger.info(f"Company analysis completed for {symbol}")
         return response_text
     
+    except (DeadlineExceeded, RateLimited):
+        raise
     except Exception as e:
         logger.error(f"Error in company analysis for {symbol}: {str(e)}")
         return f"Error analyzing {symbol}: {str(e)}"
 
-def get_all_company_analyses(symbols):
+def _incomplete(label):
+    """Fallback marking a section whose pipeline stage did not finish"""
+    def fallback(status, error):
+        return f"Error: {label} incomplete ({status.replace('_', ' ')}: {error})"
+    return fallback
+
+def _progress_callbacks(progress):
+    """Pipeline on_start/on_done hooks forwarding stage changes to a progress callback"""
+    def on_start(stage):
+        report_progress(progress, stage, "running")
+
+    def on_done(stage, status, value):
+        if status == DONE and isinstance(value, str) and value.startswith("Error"):
+            status = "failed"
+        report_progress(progress, stage, status)
+
+    return on_start, on_done
+
+def company_stages(symbols):
+    return [
+        Stage(f"company:{symbol}", lambda inputs, symbol=symbol: get_company_analysis(symbol),
+              fallback=_incomplete(f"Analysis of {symbol}"))
+        for symbol in symbols
+    ]
+
+def collect_company_data(symbols, values):
+    """Company analyses keyed by symbol from pipeline values, rejecting duplicated answers"""
+    company_analyses = {symbol: values[f"company:{symbol}"] for symbol in symbols}
+    analyses = [company_analyses[s] for s in symbols if not company_analyses[s].startswith("Error")]
+    if len(analyses) > 1 and len(set(analyses)) < len(analyses):
+        logger.error("Duplicate analyses detected")
+        for symbol in symbols:
+            company_analyses[symbol] = f"Error: Duplicate analysis detected for {symbol}"
+    return company_analyses
+
+def get_all_company_analyses(symbols, progress=None, deadline=None):
     try:
         logger.info(f"Starting parallel company analyses for {symbols}")
-        company_analyses = {}
-        
-        with ThreadPoolExecutor(max_workers=min(len(symbols), 5)) as executor:
-            future_to_symbol = {executor.submit(get_company_analysis, symbol): symbol for symbol in symbols}
-            
-            for future in concurrent.futures.as_completed(future_to_symbol):
-                symbol = future_to_symbol[future]
-                try:
-                    analysis = future.result(timeout=60)
-                    company_analyses[symbol] = analysis
-                    logger.info(f"Company analysis completed for {symbol}")
-                except Exception as e:
-                    logger.error(f"Error in company analysis for {symbol}: {str(e)}")
-                    company_analyses[symbol] = f"Error analyzing {symbol}: {str(e)}"
-        
-        # Validate uniqueness of analyses
-        analyses = [company_analyses[s] for s in symbols if not company_analyses[s].startswith("Error")]
-        if len(analyses) > 1 and len(set(analyses)) < len(analyses):
-            logger.error("Duplicate analyses detected")
-            for symbol in symbols:
-                company_analyses[symbol] = f"Error: Duplicate analysis detected for {symbol}"
-        
-        return company_analyses
-    
+        on_start, on_done = _progress_callbacks(progress)
+        result = run_pipeline(
+            company_stages(symbols), pipeline_pool, deadline or Deadline(REPORT_DEADLINE), on_start, on_done
+        )
+        return collect_company_data(symbols, result.values)
+
     except Exception as e:
         logger.error(f"Error in parallel company analyses: {str(e)}")
         return {symbol: f"Error analyzing {symbol}: {str(e)}" for symbol in symbols}
 
 # Stock Strategist Agent
-stock_strategist = Agent(
-    model=Gemini(id="models/gemini-2.0-flash-001"),
+stock_strategist = LazyAgent(
+    "stock_strategist",
+    "models/gemini-2.0-flash-001",
     description="Provides investment insights and recommends top stocks.",
     markdown=True
 )
 
-def get_stock_recommendations(symbols, market_analysis=None, company_data=None):
+def get_stock_recommendations(symbols, market_analysis=None, company_data=None, on_token=None):
     try:
         logger.info(f"Starting stock recommendations for {symbols}")
         
@@ -255,73 +393,75 @@ def get_stock_recommendations(symbols, market_analysis=None, company_data=None):
         )
         
         logger.info("Calling stock strategist...")
-        recommendations = stock_strategist.run(prompt)
-        print(f"Recommendations for {symbols}:\n{recommendations.content}")
+        recommendations = run_agent(stock_strategist, prompt, on_token)
+        print(f"Recommendations for {symbols}:\n{recommendations}")
         logger.info("Stock recommendations completed")
-        return str(recommendations.content)
+        return recommendations
     
+    except (DeadlineExceeded, RateLimited):
+        raise
     except Exception as e:
         logger.error(f"Error in stock recommendations: {str(e)}")
         return f"Error generating recommendations: {str(e)}"
 
-# Parallel execution function
-def run_agents_in_parallel(symbols):
-    """Run market analysis, company research, and stock strategist in parallel"""
+def _section(emit, fn, *args):
+    """Run a section builder, streaming its tokens through emit when one is given"""
+    return fn(*args) if emit is None else _emit_section(emit, fn, *args)
+
+def analysis_stages(symbols, emit=None):
+    """
+    Market, company and strategist stages of the report pipeline
+
+    Market and company research start immediately; the strategist starts
+    as soon as all of them have finished. With emit, the market and
+    strategist sections stream their tokens through it.
+    """
+    company_names = [f"company:{symbol}" for symbol in symbols]
+    return [
+        Stage("market", lambda inputs: _section(emit, get_market_analysis, symbols), fallback=_incomplete("Market analysis")),
+        *company_stages(symbols),
+        Stage(
+            "strategist",
+            lambda inputs: _section(
+                emit, get_stock_recommendations, symbols, inputs["market"], collect_company_data(symbols, inputs)
+            ),
+            deps=["market"] + company_names,
+            fallback=_incomplete("Investment recommendations"),
+        ),
+    ]
+
+def run_agents_in_parallel(symbols, progress=None, deadline=None):
+    """Run market analysis, company research and stock strategist as a dependency graph within a deadline"""
     try:
         logger.info(f"Starting parallel execution for {symbols}")
-        
-        # Results dictionary to store outputs
-        results = {}
-        
-        # Use ThreadPoolExecutor to run the three main tasks in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit the three main tasks
-            market_future = executor.submit(get_market_analysis, symbols)
-            company_future = executor.submit(get_all_company_analyses, symbols)
-            
-            # Wait for market analysis and company data to complete
-            # before starting stock recommendations (since it depends on both)
-            market_analysis = market_future.result(timeout=120)  # 2 minutes timeout
-            company_data = company_future.result(timeout=180)    # 3 minutes timeout
-            
-            # Now run stock recommendations with the completed data
-            recommendations_future = executor.submit(
-                get_stock_recommendations, 
-                symbols, 
-                market_analysis, 
-                company_data
-            )
-            
-            # Collect final result
-            stock_recommendations = recommendations_future.result(timeout=120)  # 2 minutes timeout
-            
-            results = {
-                'market_analysis': market_analysis,
-                'company_data': company_data,
-                'stock_recommendations': stock_recommendations
-            }
-        
-        logger.info("Parallel execution completed successfully")
-        return results
-    
-    except concurrent.futures.TimeoutError:
-        logger.error("Timeout occurred during parallel execution")
+        on_start, on_done = _progress_callbacks(progress)
+        result = run_pipeline(
+            analysis_stages(symbols), pipeline_pool, deadline or Deadline(REPORT_DEADLINE), on_start, on_done
+        )
+        if not result.complete:
+            logger.warning(f"Parallel execution finished with incomplete stages: {result.errors}")
+        else:
+            logger.info("Parallel execution completed successfully")
         return {
-            'market_analysis': "Timeout error in market analysis",
-            'company_data': {symbol: f"Timeout error for {symbol}" for symbol in symbols},
-            'stock_recommendations': "Timeout error in stock recommendations"
+            'market_analysis': result.values["market"],
+            'company_data': collect_company_data(symbols, result.values),
+            'stock_recommendations': result.values["strategist"],
+            'incomplete': [stage for stage, status in result.status.items() if status != DONE],
         }
+
     except Exception as e:
         logger.error(f"Error in parallel execution: {str(e)}")
         return {
             'market_analysis': f"Error in market analysis: {str(e)}",
             'company_data': {symbol: f"Error analyzing {symbol}: {str(e)}" for symbol in symbols},
-            'stock_recommendations': f"Error in recommendations: {str(e)}"
+            'stock_recommendations': f"Error in recommendations: {str(e)}",
+            'incomplete': ['market'] + [f'company:{symbol}' for symbol in symbols] + ['strategist'],
         }
 
 # Team Lead Agent
-team_lead = Agent(
-    model=Gemini(id="gemini-2.0-flash-001"),
+team_lead = LazyAgent(
+    "team_lead",
+    "gemini-2.0-flash-001",
     description="Aggregates stock analysis, company research, and investment strategy.",
     instructions=[
         "Create a structured investment report with 4 sections",
@@ -331,18 +471,60 @@ team_lead = Agent(
     markdown=True
 )
 
-def get_final_investment_report(symbols):
+DISCLAIMER = "**Disclaimer:** This analysis is for informational purposes only and should not be considered as financial advice. Please consult with a qualified financial advisor before making investment decisions."
+
+def build_ranking_prompt(symbols, market_analysis, company_data, stock_recommendations):
+    # Modified prompt to generate bulleted list instead of table
+    return (
+        f"Based on the following complete analysis, create ONLY a bulleted list for the investment ranking.\n\n"
+        f"Market Analysis: {market_analysis[:500]}...\n\n"
+        f"Company Data: {str(list(company_data.values()))[:500]}...\n\n"
+        f"Recommendations: {stock_recommendations[:500]}...\n\n"
+        f"For each stock ({', '.join(symbols)}), provide one bullet point with:\n"
+        f"- Stock ticker\n"
+        f"- Investment score (1-10, where 1=Strong Buy, 10=Strong Sell)\n"
+        f"- Brief rationale (one sentence)\n\n"
+        f"Format as: - TICKER: Investment Score: SCORE; Rationale: RATIONALE\n"
+        f"Provide ONLY the bulleted list, no extra text or headers."
+    )
+
+def rank_stocks(symbols, inputs, on_token=None):
+    """Ask the team lead for the ranking bullets from the finished analysis stages"""
+    prompt = build_ranking_prompt(symbols, inputs["market"], collect_company_data(symbols, inputs), inputs["strategist"])
+    logger.info("Calling team lead for summary points...")
+    return run_agent(team_lead, prompt, on_token)
+
+def team_lead_stage(symbols, emit=None):
+    """Final ranking stage, started once every analysis stage has finished"""
+    deps = ["market"] + [f"company:{symbol}" for symbol in symbols] + ["strategist"]
+    return Stage(
+        "team_lead", lambda inputs: _section(emit, rank_stocks, symbols, inputs),
+        deps=deps, fallback=_incomplete("Investment ranking"),
+    )
+
+def get_final_investment_report(symbols, progress=None, deadline=None):
     try:
         logger.info(f"Starting final report generation for {symbols}")
-        
-        # Run all agents in parallel
-        parallel_results = run_agents_in_parallel(symbols)
-        
+        deadline = deadline or Deadline(REPORT_DEADLINE)
+
+        # Every stage starts as soon as its inputs are ready, all bounded by one deadline
+        on_start, on_done = _progress_callbacks(progress)
+        result = run_pipeline(
+            analysis_stages(symbols) + [team_lead_stage(symbols)], pipeline_pool, deadline, on_start, on_done
+        )
+        if not result.complete:
+            logger.warning(f"Report for {symbols} has incomplete sections: {result.errors}")
+        rate_limited = [e for e in result.exceptions.values() if isinstance(e, RateLimited)]
+        if rate_limited:
+            # A report missing sections for lack of quota is worth retrying later rather than returning
+            raise rate_limited[0]
+
         # Extract results
-        market_analysis = parallel_results['market_analysis']
-        company_data = parallel_results['company_data']
-        stock_recommendations = parallel_results['stock_recommendations']
-        
+        market_analysis = result.values["market"]
+        company_data = collect_company_data(symbols, result.values)
+        stock_recommendations = result.values["strategist"]
+        points_list = result.values["team_lead"]
+
         logger.info("All parallel analyses completed")
         
         # Format company analyses
@@ -367,33 +549,141 @@ def get_final_investment_report(symbols):
 Based on the comprehensive analysis above, here is the investment ranking:
 """
 
-        # Modified prompt to generate bulleted list instead of table
-        points_prompt = (
-            f"Based on the following complete analysis, create ONLY a bulleted list for the investment ranking.\n\n"
-            f"Market Analysis: {market_analysis[:500]}...\n\n"
-            f"Company Data: {str(list(company_data.values()))[:500]}...\n\n"
-            f"Recommendations: {stock_recommendations[:500]}...\n\n"
-            f"For each stock ({', '.join(symbols)}), provide one bullet point with:\n"
-            f"- Stock ticker\n"
-            f"- Investment score (1-10, where 1=Strong Buy, 10=Strong Sell)\n"
-            f"- Brief rationale (one sentence)\n\n"
-            f"Format as: - TICKER: Investment Score: SCORE; Rationale: RATIONALE\n"
-            f"Provide ONLY the bulleted list, no extra text or headers."
-        )
-
-        logger.info("Calling team lead for summary points...")
-        points_list = team_lead.run(points_prompt)
-        
         # Combine the complete report with the bulleted list
-        final_report = complete_report + "\n" + str(points_list.content) + "\n\n**Disclaimer:** This analysis is for informational purposes only and should not be considered as financial advice. Please consult with a qualified financial advisor before making investment decisions."
+        final_report = complete_report + "\n" + points_list + "\n\n" + DISCLAIMER
         
         logger.info("Final report generation completed")
         return final_report
     
+    except RateLimited:
+        report_progress(progress, "team_lead", "failed")
+        raise
     except Exception as e:
         logger.error(f"Error generating final report: {str(e)}")
+        report_progress(progress, "team_lead", "failed")
         return f"Error generating final investment report: {str(e)}"
 
+def _emit_section(emit, fn, *args):
+    """Run a section builder with token streaming, emitting its text if nothing was streamed"""
+    streamed = []
+
+    def on_token(token):
+        streamed.append(token)
+        emit(token)
+
+    text = fn(*args, on_token=on_token)
+    if text != "".join(streamed):
+        # Early returns and error messages never go through the agent stream
+        emit(("\n" if streamed else "") + text)
+    return text
+
+def _build_streamed_report(symbols, emit, progress=None, deadline=None):
+    try:
+        logger.info(f"Starting streamed report generation for {symbols}")
+        emit(f"# Stock Investment Report for {', '.join(symbols)}\n\n## Section 1: Market Performance Overview\n")
+
+        headers = {
+            "strategist": "\n## Section 3: Investment Recommendations\n",
+            "team_lead": "\n\n## Section 4: Investment Opportunities Summary\n\nBased on the comprehensive analysis above, here is the investment ranking:\n\n",
+        }
+        progress_start, progress_done = _progress_callbacks(progress)
+        started = set()
+        # Company sections finishing while the market section still streams wait here
+        pending_companies = []
+        market_emitted = False
+
+        def on_start(stage):
+            progress_start(stage)
+            started.add(stage)
+            if stage in headers:
+                emit(headers[stage])
+
+        def on_done(stage, status, value):
+            nonlocal market_emitted
+            progress_done(stage, status, value)
+            if stage in headers and stage not in started:
+                emit(headers[stage])
+            if stage.startswith("company:"):
+                pending_companies.append(f"**{stage.split(':', 1)[1]}**: {value}\n")
+            elif status != DONE:
+                # Streamed stages emit their own text; mark the ones that never finished
+                emit(("\n" if stage in started else "") + value)
+            if stage == "market":
+                emit("\n\n## Section 2: Company Fundamentals and Sector Overview\n")
+                market_emitted = True
+            if market_emitted:
+                for line in pending_companies:
+                    emit(line)
+                pending_companies.clear()
+
+        run_pipeline(
+            analysis_stages(symbols, emit) + [team_lead_stage(symbols, emit)],
+            pipeline_pool,
+            deadline or Deadline(REPORT_DEADLINE),
+            on_start,
+            on_done,
+        )
+
+        emit("\n\n" + DISCLAIMER)
+        logger.info("Streamed report generation completed")
+
+    except Exception as e:
+        logger.error(f"Error streaming final report: {str(e)}")
+        report_progress(progress, "team_lead", "failed")
+        emit(f"\n\nError generating final investment report: {str(e)}")
+
+def stream_investment_report(symbols, progress=None, executor=None):
+    """
+    Generate the investment report as markdown chunks, section by section
+
+    Section 1 and the recommendations stream LLM tokens as they arrive;
+    company sections are emitted as each analysis completes.
+
+    Args:
+        symbols (list): Stock symbols
+        progress (callable): Optional ``progress(stage, status)`` callback
+        executor: Optional executor running the producer; a thread is used when omitted
+
+    Returns:
+        generator: Markdown chunks; the producer is started before this returns.
+        Closing it early (the client disconnected) cancels the remaining stages.
+    """
+    chunks = queue.Queue()
+    deadline = Deadline(REPORT_DEADLINE)
+
+    def produce():
+        try:
+            _build_streamed_report(symbols, chunks.put, progress, deadline)
+        finally:
+            chunks.put(None)
+
+    if executor is not None:
+        submit_with_context(executor, produce)
+    else:
+        Thread(target=contextvars.copy_context().run, args=(produce,), daemon=True).start()
+
+    def drain():
+        finished = False
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    finished = True
+                    return
+                yield chunk
+        finally:
+            if not finished:
+                # Nobody will read the rest, so stop the stages still running
+                logger.info(f"Streamed report for {symbols} closed early, cancelling remaining stages")
+                deadline.cancel()
+
+    return drain()
+
+def warm_up():
+    """Build every agent ahead of the first report"""
+    for agent in (market_analyst, company_researcher, stock_strategist, team_lead):
+        agent.load()
+
 # Utility function to run analysis with timing
 def analyze_stocks_with_timing(symbols):
     """Wrapper function that includes timing information"""
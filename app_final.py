@@ -1,21 +1,81 @@
-from fastapi import FastAPI, HTTPException, Request
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from threading import Thread
+import os
+import hmac
+import asyncio
+import time
 import logging
 
-from Graphs.utils import getCandlestickChartData
-from Report.report import get_final_investment_report
-from news.news import YahooFinanceStockNewsScraper
-
-import pandas as pd
+# Charts, exports, reports and the scraper pull in pandas, yfinance, bs4 and the
+# Gemini SDK, so they are imported by the endpoints that use them
+from Report.jobs import DONE, FAILED, JobStore, ReportJobManager
+from Report.llm_scheduler import RateLimited
+from news.store import article_store
+from news.poller import NewsPoller
+from core.executors import PoolSaturated, llm_pool, market_data_pool, pipeline_pool, report_jobs_pool, scraping_pool
+from core.metrics import PROMETHEUS_CONTENT_TYPE, http_request_duration, register_cache, registry
+from core.profiler import ProfilingMiddleware, profiler
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Required in X-Admin-Token by the admin endpoints and profiling header; unset disables both
+ADMIN_TOKEN = os.getenv("STOCKIFY_ADMIN_TOKEN")
+
+def admin_token_valid(token):
+    return bool(ADMIN_TOKEN) and hmac.compare_digest((token or "").encode(), ADMIN_TOKEN.encode())
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set STOCKIFY_ADMIN_TOKEN.")
+    if not admin_token_valid(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+# Load the heavy modules, agents and scraper in the background once the worker is up
+WARMUP = os.getenv("STOCKIFY_WARMUP", "1") != "0"
+
+@lru_cache(maxsize=None)
+def get_scraper():
+    """Shared news scraper, built on first use"""
+    from news.news import YahooFinanceStockNewsScraper
+    scraper = YahooFinanceStockNewsScraper()
+    register_cache("news_pages", lambda: scraper.page_cache.stats, hits=("hits", "coalesced"), misses=("misses",))
+    register_cache("news_parsed", lambda: scraper._parsed_pages.stats, hits=("hits", "coalesced"), misses=("misses",))
+    return scraper
+
+def warm_up():
+    """Import everything the endpoints import lazily and build the agents and scraper"""
+    start = time.perf_counter()
+    try:
+        import Graphs.utils, Graphs.serializers, core.export  # noqa: F401
+        from Report.report import warm_up as warm_up_agents
+        warm_up_agents()
+        get_scraper()
+        logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        logger.error(f"Warm-up failed: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Claim report jobs whose worker died, and keep our own job leases alive
+    job_manager.start()
+    news_poller.start()
+    if WARMUP:
+        Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
+    news_poller.stop()
+    job_manager.stop()
+
 # FastAPI app instance
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -26,8 +86,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Scraper instance
-scraper = YahooFinanceStockNewsScraper()
+# Sampling profiles of requests sent with X-Stockify-Profile: 1, or picked by the admin flag
+app.add_middleware(
+    ProfilingMiddleware,
+    profiler=profiler,
+    is_authorized=lambda headers: admin_token_valid(headers.get(b"x-admin-token", b"").decode("latin-1")),
+)
+
+# Latency per route template, so /reports/{job_id} is one series however many jobs exist
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Streaming responses are timed to their first byte
+        route = request.scope.get("route")
+        http_request_duration.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=status,
+        )
+
+# Saturated worker pools are reported as 503 so clients back off instead of piling up
+@app.exception_handler(PoolSaturated)
+async def pool_saturated_handler(request: Request, exc: PoolSaturated):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+# Articles scraped in the background, served by /update-news without scraping inline
+news_poller = NewsPoller(get_scraper, article_store)
+
+# Report jobs are persisted so results survive a worker restart
+job_manager = ReportJobManager(JobStore(), report_jobs_pool)
 
 # ----------- Pydantic Models -----------
 
@@ -36,21 +130,57 @@ class SymbolsRequest(BaseModel):
 
 class StockRequest(BaseModel):
     stock: str
+    start: Optional[date] = None
+    end: Optional[date] = None
+    interval: Literal["1d", "1wk", "1mo"] = "1d"
+    columns: Optional[List[str]] = None
+
+class IndicatorRequest(BaseModel):
+    stock: str
+    start: Optional[date] = None
+    end: Optional[date] = None
+    interval: Literal["1d", "1wk", "1mo"] = "1d"
+    indicators: Optional[List[str]] = None
+
+class StockRange(BaseModel):
+    stock: str
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+class BatchStockRequest(BaseModel):
+    stocks: List[StockRange]
+    interval: Literal["1d", "1wk", "1mo"] = "1d"
+    columns: Optional[List[str]] = None
+
+class StockExportRequest(BaseModel):
+    stocks: List[str]
+    start: Optional[date] = None
+    end: Optional[date] = None
+    interval: Literal["1d", "1wk", "1mo"] = "1d"
+    columns: Optional[List[str]] = None
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson"
+
+class ProfilingSettings(BaseModel):
+    enabled: Optional[bool] = None
+    hz: Optional[int] = None
+    fraction: Optional[float] = None
 
 class NewsRequest(BaseModel):
     max_articles: Optional[int] = 10
+    include_bodies: bool = False
+    since: Optional[int] = None
+    symbols: Optional[List[str]] = None
 
 # ----------- Endpoints -----------
 
 @app.post("/generate_report")
 async def generate_report(payload: SymbolsRequest):
+    from Report.report import get_final_investment_report
     try:
-        symbols = [s.strip().upper() for s in payload.symbols if isinstance(s, str) and s.strip()]
-        if not symbols:
-            raise HTTPException(status_code=400, detail="Provide a non-empty list of valid stock symbols.")
+        symbols = normalize_symbols(payload.symbols)
         
         logger.info(f"Generating report for symbols: {symbols}")
-        report = get_final_investment_report(symbols)
+        report = await llm_pool.run(get_final_investment_report, symbols)
         
         return {
             "status": "success",
@@ -58,44 +188,381 @@ async def generate_report(payload: SymbolsRequest):
             "report": report
         }
 
+    except (HTTPException, PoolSaturated):
+        raise
+    except RateLimited as e:
+        logger.warning(f"Report rate limited: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         logger.error(f"Error generating report: {str(e)}")
-        status_code = 429 if "Rate limited" in str(e) else 500
-        raise HTTPException(status_code=status_code, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def normalize_symbols(symbols):
+    symbols = [s.strip().upper() for s in symbols if isinstance(s, str) and s.strip()]
+    if not symbols:
+        raise HTTPException(status_code=400, detail="Provide a non-empty list of valid stock symbols.")
+    return symbols
+
+
+def sse_events(chunks):
+    """Frame markdown chunks as Server-Sent Events, ending with a done event"""
+    try:
+        for chunk in chunks:
+            data = "".join(f"data: {line}\n" for line in chunk.split("\n"))
+            yield f"event: chunk\n{data}\n"
+        yield "event: done\ndata: \n\n"
+    finally:
+        # Closed early when the client disconnects; pass that on so the report stops
+        chunks.close()
+
+
+@app.get("/generate_report/stream")
+async def stream_report(symbols: str):
+    from Report.report import stream_investment_report
+    symbols = normalize_symbols(symbols.split(","))
+    logger.info(f"Streaming report for symbols: {symbols}")
+    chunks = stream_investment_report(symbols, executor=llm_pool)
+    return StreamingResponse(
+        sse_events(chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/reports", status_code=202)
+async def submit_report_job(payload: SymbolsRequest):
+    symbols = normalize_symbols(payload.symbols)
+    logger.info(f"Queueing report job for symbols: {symbols}")
+    # The job row is written to SQLite, so off the event loop like every other store call
+    job_id = await pipeline_pool.run(job_manager.submit, symbols)
+    return {"job_id": job_id, "status": "queued", "symbols": symbols}
+
+
+@app.get("/reports/{job_id}")
+async def get_report_job(job_id: str):
+    job = await pipeline_pool.run(job_manager.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown report job {job_id}")
+    # Lease bookkeeping (owner, heartbeat_at) stays internal
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "progress": job["stages"],
+        "result": job["result"],
+        "error": job["error"],
+    }
+
+
+@app.get("/reports/{job_id}/result")
+async def get_report_job_result(job_id: str):
+    job = await pipeline_pool.run(job_manager.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown report job {job_id}")
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != DONE:
+        raise HTTPException(status_code=409, detail=f"Report job {job_id} is still {job['status']}")
+    return {
+        "status": "success",
+        "symbols": job["symbols"],
+        "report": job["result"]
+    }
 
 
 @app.post("/data")
-async def get_stock_data(payload: StockRequest):
+async def get_stock_data(payload: StockRequest, request: Request):
+    from Graphs.utils import getCandlestickChartData
+    from Graphs.serializers import RECORDS_JSON, SERIALIZERS, negotiate_media_type
     ticker = payload.stock.strip().upper()
     if not ticker:
         raise HTTPException(status_code=400, detail="Stock ticker cannot be empty.")
 
     try:
-        historical_data = getCandlestickChartData(ticker)
+        historical_data = await market_data_pool.run(
+            getCandlestickChartData,
+            ticker,
+            start=payload.start,
+            end=payload.end,
+            interval=payload.interval,
+            columns=payload.columns,
+        )
         if historical_data.empty:
             raise HTTPException(status_code=404, detail=f"No data found for {ticker}")
 
+        # Columnar JSON, Arrow and Parquet are opt-in through the Accept header
+        media_type = negotiate_media_type(request.headers.get("accept"))
+        if media_type != RECORDS_JSON:
+            return Response(content=SERIALIZERS[media_type](historical_data), media_type=media_type)
+
         historical_data = historical_data.reset_index().to_dict(orient="records")
         return historical_data
 
+    except (HTTPException, PoolSaturated):
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching data for {ticker}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching data for {ticker}: {str(e)}")
 
 
+@app.post("/indicators")
+async def get_indicators(payload: IndicatorRequest, request: Request):
+    from Graphs.utils import getIndicatorData
+    from Graphs.serializers import RECORDS_JSON, SERIALIZERS, negotiate_media_type
+    ticker = payload.stock.strip().upper()
+    if not ticker:
+        raise HTTPException(status_code=400, detail="Stock ticker cannot be empty.")
+
+    try:
+        indicator_data = await market_data_pool.run(
+            getIndicatorData,
+            ticker,
+            start=payload.start,
+            end=payload.end,
+            interval=payload.interval,
+            indicators=payload.indicators,
+        )
+        if indicator_data.empty:
+            raise HTTPException(status_code=404, detail=f"No data found for {ticker}")
+
+        media_type = negotiate_media_type(request.headers.get("accept"))
+        if media_type != RECORDS_JSON:
+            return Response(content=SERIALIZERS[media_type](indicator_data), media_type=media_type)
+
+        # Warm-up rows have no value yet; JSON has no NaN, so send null
+        indicator_data = indicator_data.astype(object).where(indicator_data.notna(), None)
+        return indicator_data.reset_index().to_dict(orient="records")
+
+    except (HTTPException, PoolSaturated):
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing indicators for {ticker}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error computing indicators for {ticker}: {str(e)}")
+
+
+@app.post("/data/batch")
+async def get_stock_data_batch(payload: BatchStockRequest):
+    from Graphs.utils import getCandlestickChartBatch
+    from Graphs.serializers import COLUMNAR_JSON, batch_to_columnar_json
+    ranges = [(item.stock.strip().upper(), item.start, item.end) for item in payload.stocks]
+    tickers = [ticker for ticker, _, _ in ranges]
+    if not tickers or not all(tickers):
+        raise HTTPException(status_code=400, detail="Provide a non-empty list of stock tickers.")
+    if len(set(tickers)) != len(tickers):
+        raise HTTPException(status_code=400, detail="Each ticker may only appear once per batch.")
+
+    try:
+        # Uncached tickers share one grouped download instead of one request each
+        frames = await market_data_pool.run(
+            getCandlestickChartBatch, ranges, interval=payload.interval, columns=payload.columns
+        )
+        return Response(content=batch_to_columnar_json(frames), media_type=COLUMNAR_JSON)
+
+    except PoolSaturated:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching batch data for {tickers}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching batch data: {str(e)}")
+
+
+async def export_response(chunks, export_format, filename, pool):
+    """
+    Stream encoded chunks as a downloadable export, producing each one on pool
+
+    The first chunk is produced before the response starts, so a saturated
+    pool is still answered with a 503. Later chunks wait for a free slot
+    instead, since the headers are sent by then. Failures after that point
+    are logged.
+    """
+    from core.export import EXPORT_MEDIA_TYPES
+    first = await pool.run(next, chunks, None)
+
+    async def pooled():
+        chunk = first
+        try:
+            while chunk is not None:
+                yield chunk
+                while True:
+                    try:
+                        chunk = await pool.run(next, chunks, None)
+                        break
+                    except PoolSaturated:
+                        await asyncio.sleep(0.05)
+        except Exception as e:
+            logger.error(f"Export {filename} aborted: {str(e)}")
+        finally:
+            try:
+                chunks.close()
+            except ValueError:
+                # Still running on the pool after a disconnect; it is dropped once that chunk is done
+                pass
+
+    return StreamingResponse(
+        pooled(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+
+@app.post("/data/export")
+async def export_stock_data(payload: StockExportRequest):
+    from Graphs.utils import iter_ohlcv_frames, validate_columns
+    from Graphs.cache import OHLCV_COLUMNS
+    from core.export import iter_csv, iter_frame_records, iter_ndjson, iter_parquet
+    tickers = normalize_symbols(payload.stocks)
+    try:
+        validate_columns(payload.columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Tickers are loaded and encoded one at a time, so memory stays flat however many are requested
+    frames = iter_ohlcv_frames(
+        tickers, start=payload.start, end=payload.end, interval=payload.interval, columns=payload.columns
+    )
+    if payload.format == "parquet":
+        import pyarrow as pa
+        # One Parquet row group per ticker; the schema is fixed so an export with no data still has its columns
+        schema = pa.schema(
+            [("Ticker", pa.string()), ("Date", pa.timestamp("ns"))]
+            + [(column, pa.float64()) for column in (payload.columns or OHLCV_COLUMNS)]
+        )
+        chunks = iter_parquet(frames, schema=schema)
+    elif payload.format == "csv":
+        fieldnames = ["Ticker", "Date"] + [c for c in (payload.columns or OHLCV_COLUMNS)]
+        chunks = iter_csv(iter_frame_records(frames), fieldnames)
+    else:
+        chunks = iter_ndjson(iter_frame_records(frames))
+    logger.info(f"Exporting {payload.format} data for {tickers}")
+    # Each chunk loads its ticker's bars, so it is produced on the market data pool
+    return await export_response(chunks, payload.format, "ohlcv", market_data_pool)
+
+
+@app.get("/news/export")
+async def export_news(format: Literal["ndjson", "csv", "parquet"] = "ndjson", since: int = 0):
+    from news.news import NEWS_CSV_FIELDS
+    from core.export import batched, iter_csv, iter_ndjson, iter_parquet
+    articles = article_store.iter_since(since)
+    if format == "parquet":
+        import pandas as pd
+        import pyarrow as pa
+        # Fixed schema so every row group matches whichever optional fields a batch has
+        types = {"id": pa.int64(), "is_stock_related": pa.bool_(), "symbols": pa.list_(pa.string())}
+        names = ["id"] + NEWS_CSV_FIELDS + ["body", "symbols"]
+        schema = pa.schema([(name, types.get(name, pa.string())) for name in names])
+        frames = (pd.DataFrame(batch, columns=schema.names) for batch in batched(articles, 500))
+        chunks = iter_parquet(frames, schema=schema)
+    elif format == "csv":
+        chunks = iter_csv(articles, ["id"] + NEWS_CSV_FIELDS)
+    else:
+        chunks = iter_ndjson(articles)
+    return await export_response(chunks, format, "news", scraping_pool)
+
+
 @app.post("/update-news")
 async def update_news(payload: NewsRequest):
     try:
         max_articles = payload.max_articles or 10
-        articles = scraper.get_stock_news_articles(max_articles=max_articles, recent_only=True)
+        if payload.symbols:
+            # Served from the symbol index built while scraping
+            articles = await scraping_pool.run(article_store.by_symbols, payload.symbols, limit=max_articles)
+        elif payload.since is not None:
+            # Delta for clients that already hold everything up to their cursor
+            articles = await scraping_pool.run(article_store.since, payload.since, limit=max_articles)
+        else:
+            articles = await scraping_pool.run(article_store.latest, max_articles)
+            if not articles:
+                # Nothing polled yet, scrape inline once and seed the store
+                await scraping_pool.run(news_poller.poll_once)
+                articles = await scraping_pool.run(article_store.latest, max_articles)
+        if payload.include_bodies:
+            scraper = get_scraper()
+            articles = await scraping_pool.run(scraper.add_article_contents, articles)
+            # Keep fetched bodies so they become searchable, and index the symbols they mention
+            await scraping_pool.run(article_store.update_contents, articles, extract_symbols=scraper.ticker_extractor.extract)
+        cursor = max([article["id"] for article in articles], default=payload.since or 0)
         return {
             "status": "success",
             "count": len(articles),
+            "cursor": cursor,
             "articles": articles
         }
+    except PoolSaturated:
+        raise
     except Exception as e:
         logger.error(f"Error updating news: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/news/search")
+async def search_news(
+    q: str, start: Optional[date] = None, end: Optional[date] = None, limit: int = Query(20, ge=1, le=100)
+):
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Search query cannot be empty.")
+    try:
+        start_ts = datetime.combine(start, datetime.min.time()).timestamp() if start else None
+        # End date is inclusive, so stop at the following midnight
+        end_ts = (datetime.combine(end, datetime.min.time()) + timedelta(days=1)).timestamp() if end else None
+        results = await scraping_pool.run(article_store.search, q, start=start_ts, end=end_ts, limit=limit)
+        return {
+            "status": "success",
+            "count": len(results),
+            "articles": results
+        }
+    except PoolSaturated:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching news: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/metrics")
+async def metrics():
+    # Prometheus text format; modules not imported yet report nothing
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def get_profiling_settings():
+    return profiler.configure()
+
+
+@app.post("/admin/profiling", dependencies=[Depends(require_admin)])
+async def set_profiling_settings(payload: ProfilingSettings):
+    if payload.hz is not None and not 1 <= payload.hz <= 1000:
+        raise HTTPException(status_code=400, detail="hz must be between 1 and 1000.")
+    if payload.fraction is not None and not 0 < payload.fraction <= 1:
+        raise HTTPException(status_code=400, detail="fraction must be greater than 0 and at most 1.")
+    settings = profiler.configure(enabled=payload.enabled, hz=payload.hz, fraction=payload.fraction)
+    logger.info(f"Profiling settings changed: {settings}")
+    return settings
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    return {"profiles": profiler.profiles()}
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str, format: Literal["speedscope", "collapsed"] = "speedscope"):
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile {profile_id}")
+    if format == "collapsed":
+        # Feed to flamegraph.pl or paste into speedscope
+        return Response(content=profile.collapsed(), media_type="text/plain")
+    return JSONResponse(
+        content=profile.speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'},
+    )
+
+
 @app.get("/health")
 async def health_check():
     try:
@@ -0,0 +1,67 @@
+"""
+Compare /data response formats for a full-history ticker.
+
+Usage:
+    python -m benchmarks.bench_data_formats            # synthetic 45-year history
+    python -m benchmarks.bench_data_formats AAPL       # real history via the OHLCV cache
+"""
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from Graphs.serializers import to_arrow_ipc, to_columnar_json, to_parquet
+
+
+def synthetic_history(years=45):
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252, name="Date")
+    rng = np.random.default_rng(0)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+    return pd.DataFrame({
+        "Adj Close": close * 0.97,
+        "Close": close,
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Open": close * 1.001,
+        "Volume": rng.integers(1_000_000, 50_000_000, len(index)),
+    }, index=index).sort_index(ascending=False)
+
+
+def records_json(df):
+    # What FastAPI does today for a list of row dicts
+    return json.dumps(jsonable_encoder(df.reset_index().to_dict(orient="records"))).encode()
+
+
+def timed(fn, df, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return len(payload), best
+
+
+def main():
+    if len(sys.argv) > 1:
+        from Graphs.utils import getCandlestickChartData
+        df = getCandlestickChartData(sys.argv[1])
+    else:
+        df = synthetic_history()
+
+    print(f"{len(df)} bars")
+    print(f"{'format':<16}{'bytes':>12}{'encode ms':>12}")
+    for name, fn in [
+        ("records json", records_json),
+        ("columnar json", to_columnar_json),
+        ("arrow ipc", to_arrow_ipc),
+        ("parquet", to_parquet),
+    ]:
+        size, seconds = timed(fn, df)
+        print(f"{name:<16}{size:>12,}{seconds * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Import time of the API module, as measured by ``python -X importtime``.
+
+Runs the import in a fresh interpreter, then prints the total and the
+slowest top-level imports by cumulative time. With --max-ms it exits
+non-zero when the total exceeds the budget, so it can guard startup in CI.
+
+Usage:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --module app_final --top 15 --max-ms 800
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only be imported once an endpoint or the warm-up needs them
+DEFERRED_MODULES = ["pandas", "yfinance", "bs4", "agno.agent", "google.generativeai"]
+
+
+def measure(module):
+    """
+    Import a module in a fresh interpreter
+
+    Returns:
+        list: (cumulative_us, self_us, depth, name) for every imported module, in import order
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app_final")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail when the import takes longer")
+    args = parser.parse_args()
+
+    rows = measure(args.module)
+    total_ms = next(cumulative for cumulative, _, _, name in rows if name == args.module) / 1000
+    imported = {name for _, _, _, name in rows}
+
+    print(f"import {args.module}: {total_ms:.1f} ms")
+    print(f"\n{'cumulative ms':>14}{'self ms':>10}  module")
+    # Direct imports of the measured module and of the interpreter start-up
+    top_level = [row for row in rows if row[2] <= 1 and row[3] != args.module]
+    for cumulative, self_us, _, name in sorted(top_level, reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+
+    loaded = [name for name in DEFERRED_MODULES if name in imported]
+    print(f"\ndeferred modules imported eagerly: {', '.join(loaded) if loaded else 'none'}")
+
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"FAIL: {total_ms:.1f} ms exceeds the {args.max_ms:.1f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
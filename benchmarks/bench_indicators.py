@@ -0,0 +1,73 @@
+"""
+Time the indicator engine on 30 years of daily bars.
+
+Compares a full per-ticker computation, one wide computation across all
+tickers, and the incremental path that only computes bars appended since
+the stored state. Also reports the largest difference between
+incremental and full results.
+
+Usage:
+    python -m benchmarks.bench_indicators [tickers] [years]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from Graphs.indicators import compute_indicators
+
+
+def synthetic_bars(n_tickers, years):
+    index = pd.bdate_range(end="2025-01-01", periods=years * 252, name="Date")
+    rng = np.random.default_rng(0)
+    bars = {}
+    for i in range(n_tickers):
+        close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(index))))
+        bars[f"T{i:03d}"] = pd.DataFrame({
+            "Close": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Volume": rng.integers(1_000_000, 50_000_000, len(index)).astype(float),
+        }, index=index)
+    return bars
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    bars = synthetic_bars(n_tickers, years)
+    new_bars = 5
+    print(f"{n_tickers} tickers x {years} years ({len(next(iter(bars.values())))} bars each)")
+
+    full, full_ms = timed(lambda: {t: compute_indicators(df) for t, df in bars.items()})
+    print(f"{'full, per ticker':<28}{full_ms:>10.1f} ms")
+
+    wide = pd.concat(bars, axis=1).swaplevel(axis=1)
+    _, wide_ms = timed(lambda: compute_indicators(wide))
+    print(f"{'full, all tickers at once':<28}{wide_ms:>10.1f} ms")
+
+    # State as of new_bars + 1 bars ago, as the store would hold before the latest download
+    states = {t: compute_indicators(df.iloc[:-new_bars])[1] for t, df in bars.items()}
+
+    def incremental():
+        return {
+            t: compute_indicators(df.iloc[df.index.searchsorted(states[t]["anchor"], side="right"):], states[t])[0]
+            for t, df in bars.items()
+        }
+
+    tails, incremental_ms = timed(incremental)
+    print(f"{f'incremental, {new_bars} new bars':<28}{incremental_ms:>10.1f} ms")
+
+    error = max((tails[t] - full[t][0].iloc[-len(tails[t]):]).abs().max().max() for t in bars)
+    print(f"max |incremental - full| = {error:.2e}")
+
+
+if __name__ == "__main__":
+    main()
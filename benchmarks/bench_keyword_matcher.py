@@ -0,0 +1,58 @@
+"""
+Compare the compiled keyword matcher with the original substring loop.
+
+Usage:
+    python -m benchmarks.bench_keyword_matcher [n_headlines]
+"""
+import random
+import sys
+import time
+
+from news.news import YahooFinanceStockNewsScraper
+
+WORDS = [
+    "company", "reports", "download", "turmoil", "Goldman", "quarter", "sees", "growth",
+    "shares", "fall", "after", "earnings", "miss", "consumer", "demand", "weakens", "new",
+    "CEO", "plans", "expansion", "Europe", "Asia", "factory", "workers", "strike", "deal",
+]
+
+
+def headlines(n, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) for _ in range(n)]
+
+
+def legacy_is_stock_related(keywords, text):
+    text = text.lower()
+    for keyword in keywords:
+        if keyword in text:
+            return True
+    return False
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    scraper = YahooFinanceStockNewsScraper()
+    corpus = headlines(n)
+
+    start = time.perf_counter()
+    legacy_hits = sum(legacy_is_stock_related(scraper.stock_keywords, h) for h in corpus)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled_hits = sum(scraper.stock_matcher.search(h) for h in corpus)
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for h in corpus:
+        scraper.stock_matcher.matches(h)
+    all_matches = time.perf_counter() - start
+
+    print(f"{n:,} headlines")
+    print(f"{'substring loop':<20}{n / legacy:>14,.0f}/s  hits={legacy_hits:,}")
+    print(f"{'compiled search':<20}{n / compiled:>14,.0f}/s  hits={compiled_hits:,}")
+    print(f"{'compiled matches':<20}{n / all_matches:>14,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
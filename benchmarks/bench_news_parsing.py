@@ -0,0 +1,89 @@
+"""
+Compare news page parse + extract time and peak Python memory per backend.
+
+Uses the saved Yahoo Finance topic page under benchmarks/fixtures unless
+other saved pages are given; --synthetic adds a generated page with a
+larger stream. tracemalloc only sees Python allocations, so the C-level
+trees built by lxml and selectolax are under-reported.
+
+Usage:
+    python -m benchmarks.bench_news_parsing [--synthetic] [saved_page.html ...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from news.parsing import LINK_SELECTOR, STORY_ITEM_SELECTOR, available_backends, parse_story_items
+
+SAVED_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "yahoo_topic_stock_market_news.html")
+
+STORY_TEMPLATE = """
+<li class="stream-item story-item yf-1usaaz9">
+  <section class="container sz-small">
+    <a class="subtle-link fin-size-small thumb" href="/news/story-{i}.html"><img src="https://s.yimg.com/img/{i}.jpg"></a>
+    <div class="content">
+      <a class="subtle-link fin-size-small titles noUnderline" href="/news/story-{i}.html">
+        <h3 class="clamp yf-1y7058a">Stocks rally as earnings beat estimates for company {i}</h3>
+        <p class="clamp yf-1y7058a">Shares of the company rose after quarterly revenue topped analyst forecasts. {filler}</p>
+      </a>
+      <div class="footer"><div class="publishing yf-1weyqlp">Reuters<i>&bull;</i>{i} minutes ago</div></div>
+    </div>
+  </section>
+</li>
+"""
+
+
+def synthetic_page(n_items=200):
+    # Yahoo pages carry a lot of markup outside the stream; pad with unrelated nodes
+    chrome = "<div class='nav'>" + "<span class='x'>menu</span>" * 5000 + "</div>"
+    script = "<script>" + "var x = 1;" * 20000 + "</script>"
+    stories = "".join(STORY_TEMPLATE.format(i=i, filler="lorem ipsum " * 20) for i in range(n_items))
+    return f"<html><head>{script}</head><body>{chrome}<ul>{stories}</ul>{chrome}</body></html>".encode()
+
+
+def legacy_extract(html):
+    # The original path: full html.parser tree and per-item select_one calls
+    soup = BeautifulSoup(html, "html.parser")
+    items = []
+    for item in soup.select(STORY_ITEM_SELECTOR):
+        link = item.select_one(LINK_SELECTOR)
+        if link and link.get("href"):
+            title = link.select_one("h3.clamp")
+            items.append(title.get_text(strip=True) if title else None)
+    return items
+
+
+def measure(fn, html, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(html)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(result), best, peak
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--synthetic"]
+    pages = [open(path, "rb").read() for path in args or [SAVED_PAGE]]
+    if "--synthetic" in sys.argv[1:]:
+        pages.append(synthetic_page())
+    candidates = [("legacy html.parser", legacy_extract)]
+    candidates += [(backend, lambda html, b=backend: parse_story_items(html, b)) for backend in available_backends()]
+
+    for html in pages:
+        print(f"page of {len(html):,} bytes")
+        print(f"{'backend':<20}{'items':>7}{'ms':>10}{'peak KiB':>12}")
+        for name, fn in candidates:
+            items, seconds, peak = measure(fn, html)
+            print(f"{name:<20}{items:>7}{seconds * 1000:>10.1f}{peak / 1024:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Peak memory of the streaming exports against building the whole payload first.
+
+Each export runs in its own subprocess, since peak RSS only ever grows
+within a process. Streaming rows should stay flat as the dataset grows;
+the materialized baseline should grow with it.
+
+Usage:
+    python -m benchmarks.bench_streaming_export                 # 200k articles, 200 tickers
+    python -m benchmarks.bench_streaming_export 500000 400
+"""
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+MODES = ["news-materialized", "news-ndjson", "news-csv", "ohlcv-materialized", "ohlcv-ndjson", "ohlcv-parquet"]
+
+
+def seed_news(path, count):
+    from news.store import ArticleStore
+
+    store = ArticleStore(path)
+    for offset in range(0, count, 5000):
+        store.add([
+            {
+                "title": f"Synthetic headline number {i}",
+                "url": f"https://example.com/news/{i}",
+                "summary": "Shares moved after the quarterly results beat analyst estimates. " * 3,
+                "is_stock_related": True,
+                "symbols": ["AAPL"],
+            }
+            for i in range(offset, min(offset + 5000, count))
+        ])
+
+
+def synthetic_frames(tickers, years=30):
+    index = pd.bdate_range("1995-01-02", periods=years * 252, name="Date")
+    rng = np.random.default_rng(0)
+    for n in range(tickers):
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+        frame = pd.DataFrame({"Close": close, "Volume": rng.integers(1_000_000, 50_000_000, len(index))}, index=index)
+        frame = frame.reset_index()
+        frame.insert(0, "Ticker", f"T{n:04d}")
+        yield frame
+
+
+def run_mode(mode, db_path, tickers):
+    from core.export import iter_csv, iter_frame_records, iter_ndjson, iter_parquet
+    from news.news import NEWS_CSV_FIELDS
+    from news.store import ArticleStore
+
+    store = ArticleStore(db_path)
+    start = time.perf_counter()
+    written = 0
+    with open(os.devnull, "wb") as sink:
+        if mode == "news-materialized":
+            payload = json.dumps(store.since(0, limit=-1)).encode()
+            written = sink.write(payload)
+        elif mode == "news-ndjson":
+            for chunk in iter_ndjson(store.iter_since(0)):
+                written += sink.write(chunk)
+        elif mode == "news-csv":
+            for chunk in iter_csv(store.iter_since(0), ["id"] + NEWS_CSV_FIELDS):
+                written += sink.write(chunk)
+        elif mode == "ohlcv-materialized":
+            frame = pd.concat(list(synthetic_frames(tickers)))
+            written = sink.write(frame.to_json(orient="records").encode())
+        elif mode == "ohlcv-ndjson":
+            for chunk in iter_ndjson(iter_frame_records(synthetic_frames(tickers))):
+                written += sink.write(chunk)
+        elif mode == "ohlcv-parquet":
+            for chunk in iter_parquet(synthetic_frames(tickers)):
+                written += sink.write(chunk)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<20}{written / 1e6:>12.1f}{elapsed:>10.2f}{peak_mb:>14.1f}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        return
+
+    articles = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "news.sqlite3")
+        seed_news(db_path, articles)
+        print(f"{articles} articles, {tickers} tickers x 30 years")
+        print(f"{'mode':<20}{'MB written':>12}{'seconds':>10}{'peak RSS MB':>14}")
+        for mode in MODES:
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_streaming_export", "--mode", mode, db_path, str(tickers)],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure /health latency while report generation is running.
+
+Report.report.get_final_investment_report is replaced by a fake that
+sleeps, so the run needs no API key. The endpoint imports it from
+Report.report on each call, so that is where it is patched. With the report offloaded to the LLM pool the
+/health percentiles should match the idle baseline.
+
+Usage:
+    python -m benchmarks.load_health [concurrent_reports] [report_seconds]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+import app_final
+from Report import report
+
+
+def fake_report(symbols, seconds):
+    time.sleep(seconds)
+    return f"Report for {', '.join(symbols)}"
+
+
+async def sample_health(client, duration):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/health")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+def summarize(label, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:<16} n={len(latencies):<5} p50={statistics.median(latencies):.2f}ms "
+          f"p99={p99:.2f}ms max={latencies[-1]:.2f}ms")
+
+
+async def main(concurrent_reports, report_seconds):
+    report.get_final_investment_report = lambda symbols: fake_report(symbols, report_seconds)
+    transport = httpx.ASGITransport(app=app_final.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+        summarize("idle", await sample_health(client, report_seconds / 2))
+
+        reports = [
+            asyncio.create_task(client.post("/generate_report", json={"symbols": ["AAPL"]}))
+            for _ in range(concurrent_reports)
+        ]
+        summarize("under load", await sample_health(client, report_seconds / 2))
+        statuses = [r.status_code for r in await asyncio.gather(*reports)]
+        print(f"report statuses: {statuses}")
+
+
+if __name__ == "__main__":
+    reports = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    asyncio.run(main(reports, seconds))
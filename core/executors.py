@@ -0,0 +1,127 @@
+import os
+import asyncio
+import logging
+from threading import BoundedSemaphore, Lock
+from concurrent.futures import ThreadPoolExecutor
+
+from core.metrics import GAUGE, registry
+from core.profiler import current_profile
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturated(Exception):
+    """Raised when a pool already has max_workers running and max_queue waiting"""
+
+    def __init__(self, pool_name):
+        super().__init__(f"{pool_name} pool is saturated, try again later")
+        self.pool_name = pool_name
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard limit on queued work.
+
+    ThreadPoolExecutor queues without bound, so a slow provider lets work
+    pile up until every request times out. Here a submit beyond
+    max_workers + max_queue fails fast with PoolSaturated, which the API
+    turns into a 503.
+    """
+
+    def __init__(self, name, max_workers, max_queue):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = BoundedSemaphore(max_workers + max_queue)
+        self._pending = 0
+        self._pending_lock = Lock()
+
+    @property
+    def pending(self):
+        """Number of submitted tasks that have not finished yet"""
+        return self._pending
+
+    @property
+    def queue_depth(self):
+        """Number of submitted tasks still waiting for a worker thread"""
+        return max(self._pending - self.max_workers, 0)
+
+    def _release(self, _future):
+        with self._pending_lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            logger.warning(f"{self.name} pool saturated ({self._pending} pending)")
+            raise PoolSaturated(self.name)
+        with self._pending_lock:
+            self._pending += 1
+        profile = current_profile.get()
+        if profile is not None:
+            # Sample the worker thread for the profiled request while it runs this task
+            fn, args = profile.track, (fn,) + args
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking callable on this pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, str(default)))
+
+
+# One pool per subsystem so a slow LLM never starves chart data or news
+market_data_pool = BoundedExecutor(
+    "market-data",
+    max_workers=_env_int("STOCKIFY_MARKET_DATA_WORKERS", 8),
+    max_queue=_env_int("STOCKIFY_MARKET_DATA_QUEUE", 64),
+)
+scraping_pool = BoundedExecutor(
+    "scraping",
+    max_workers=_env_int("STOCKIFY_SCRAPING_WORKERS", 4),
+    max_queue=_env_int("STOCKIFY_SCRAPING_QUEUE", 16),
+)
+llm_pool = BoundedExecutor(
+    "llm",
+    max_workers=_env_int("STOCKIFY_LLM_WORKERS", 2),
+    max_queue=_env_int("STOCKIFY_LLM_QUEUE", 4),
+)
+
+# Background report jobs run here, so queued jobs never take llm pool slots from interactive reports
+report_jobs_pool = BoundedExecutor(
+    "report-jobs",
+    max_workers=_env_int("STOCKIFY_REPORT_JOB_WORKERS", 1),
+    max_queue=_env_int("STOCKIFY_REPORT_JOB_QUEUE", 32),
+)
+
+# Report pipeline stages and report job store calls; abandoned stages may hold a thread until their call returns
+pipeline_pool = BoundedExecutor(
+    "pipeline",
+    max_workers=_env_int("STOCKIFY_PIPELINE_WORKERS", 16),
+    max_queue=_env_int("STOCKIFY_PIPELINE_QUEUE", 64),
+)
+
+POOLS = [market_data_pool, scraping_pool, llm_pool, report_jobs_pool, pipeline_pool]
+
+
+def _collect_pool_metrics():
+    for pool in POOLS:
+        labels = {"pool": pool.name}
+        yield "stockify_pool_queue_depth", GAUGE, "Tasks waiting for a worker thread", labels, pool.queue_depth
+        yield "stockify_pool_pending", GAUGE, "Tasks submitted and not yet finished", labels, pool.pending
+        yield "stockify_pool_max_workers", GAUGE, "Worker threads per pool", labels, pool.max_workers
+
+
+registry.register_collector(_collect_pool_metrics)
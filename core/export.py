@@ -0,0 +1,120 @@
+import io
+import csv
+import itertools
+
+import orjson
+import pandas as pd
+
+# Bytes buffered before a CSV chunk is handed to the response
+CSV_CHUNK_SIZE = 64 * 1024
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def batched(iterable, size):
+    """Yield lists of up to size items from iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_frame_records(frames, batch_size=1000):
+    """Turn a stream of DataFrames into dict rows, converting batch_size rows at a time"""
+    for frame in frames:
+        for offset in range(0, len(frame), batch_size):
+            yield from frame.iloc[offset:offset + batch_size].to_dict(orient="records")
+
+
+def _default(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_ndjson(rows):
+    """Encode dict rows as newline-delimited JSON, one chunk per row"""
+    for row in rows:
+        yield orjson.dumps(row, default=_default, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+
+
+def iter_csv(rows, fieldnames):
+    """Encode dict rows as CSV in chunks of roughly CSV_CHUNK_SIZE bytes"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CSV_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_parquet(frames, schema=None):
+    """
+    Encode DataFrames as one Parquet file, one row group per frame
+
+    Args:
+        frames (iterable): DataFrames sharing the same columns
+        schema (pyarrow.Schema): Column types; inferred from the first frame when omitted
+
+    Yields:
+        bytes: File chunks, emitted after every row group. Without any frames
+        the file holds no rows but still carries the schema, empty if none was given.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, schema or table.schema)
+            writer.write_table(table.cast(writer.schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+        if writer is None:
+            # Still a readable file for clients when nothing matched
+            writer = pq.ParquetWriter(sink, schema or pa.schema([]))
+    finally:
+        if writer is not None:
+            writer.close()
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
@@ -0,0 +1,156 @@
+import os
+import logging
+from abc import ABC, abstractmethod
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+
+from core.memo import MicroBatcher, SingleFlightCache
+from core.metrics import market_data_duration, register_cache
+
+logger = logging.getLogger(__name__)
+
+# get_info lookups arriving within this many milliseconds are resolved together
+INFO_BATCH_WINDOW_MS = int(os.getenv("STOCKIFY_INFO_BATCH_WINDOW_MS", "50"))
+INFO_BATCH_SIZE = int(os.getenv("STOCKIFY_INFO_BATCH_SIZE", "50"))
+
+# Profile lookups run at once within a batch
+INFO_FETCH_CONCURRENCY = int(os.getenv("STOCKIFY_INFO_FETCH_CONCURRENCY", "8"))
+
+
+def _never_cache(_value):
+    return False
+
+
+class MarketDataProvider(ABC):
+    """
+    Interface to an upstream market-data source.
+
+    Subclasses implement ``_download``, ``_fetch_infos`` and ``_fetch_news``;
+    the public methods add request coalescing on top. Identical requests
+    already in flight share one upstream call, and get_info lookups
+    arriving within a short window are resolved as one batch. Results are
+    shared between coalesced callers and must not be mutated.
+    """
+
+    def __init__(self, batch_window=INFO_BATCH_WINDOW_MS / 1000, batch_size=INFO_BATCH_SIZE):
+        # Nothing is kept once a call finishes; caching is left to the callers
+        self._in_flight = SingleFlightCache(ttl=0)
+        self._info_batcher = MicroBatcher(self._timed_fetch_infos, window=batch_window, max_batch=batch_size)
+
+    @property
+    def stats(self):
+        return {**self._in_flight.stats, **{f"info_{key}": value for key, value in self._info_batcher.stats.items()}}
+
+    def download(self, tickers, **options):
+        """
+        Daily bars for one or more tickers
+
+        Args:
+            tickers (str | list): Ticker or tickers
+            **options: yf.download keyword arguments such as start, period,
+                auto_adjust, actions, group_by and multi_level_index
+
+        Returns:
+            pd.DataFrame: Bars in yf.download layout
+        """
+        key = ("download", tickers if isinstance(tickers, str) else tuple(tickers), tuple(sorted(options.items())))
+        return self._in_flight.get_or_compute(key, lambda: self._timed_download(tickers, **options), should_cache=_never_cache)
+
+    def get_info(self, symbol):
+        """Company profile dict as returned by ``Ticker.get_info``"""
+        return self._in_flight.get_or_compute(
+            ("info", symbol), lambda: self._info_batcher.submit(symbol).result(), should_cache=_never_cache
+        )
+
+    def get_news(self, symbol):
+        """Recent news items for a symbol as returned by ``Ticker.news``"""
+        return self._in_flight.get_or_compute(("news", symbol), lambda: self._timed_fetch_news(symbol), should_cache=_never_cache)
+
+    def _timed_download(self, tickers, **options):
+        with market_data_duration.time(call="download"):
+            return self._download(tickers, **options)
+
+    def _timed_fetch_infos(self, symbols):
+        with market_data_duration.time(call="info"):
+            return self._fetch_infos(symbols)
+
+    def _timed_fetch_news(self, symbol):
+        with market_data_duration.time(call="news"):
+            return self._fetch_news(symbol)
+
+    @abstractmethod
+    def _download(self, tickers, **options):
+        """Return bars in yf.download layout"""
+
+    @abstractmethod
+    def _fetch_infos(self, symbols):
+        """Return ``{symbol: info dict or Exception}`` for a batch of symbols"""
+
+    @abstractmethod
+    def _fetch_news(self, symbol):
+        """Return news items as given by ``Ticker.news``"""
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance through yfinance, sharing one pooled HTTP session across every call"""
+
+    def __init__(self, concurrency=INFO_FETCH_CONCURRENCY, **kwargs):
+        super().__init__(**kwargs)
+        self.concurrency = concurrency
+        self._session = None
+        self._session_lock = Lock()
+
+    @property
+    def session(self):
+        # Created on first use so importing the module never opens connections
+        with self._session_lock:
+            if self._session is None:
+                from curl_cffi import requests as curl_requests
+
+                self._session = curl_requests.Session(impersonate="chrome")
+            return self._session
+
+    def _download(self, tickers, **options):
+        import yfinance as yf
+
+        options.setdefault("progress", False)
+        return yf.download(tickers, session=self.session, **options)
+
+    def _fetch_infos(self, symbols):
+        import yfinance as yf
+
+        tickers = yf.Tickers(" ".join(symbols), session=self.session)
+
+        def fetch(symbol):
+            try:
+                return tickers.tickers[symbol.upper()].get_info()
+            except Exception as e:
+                return e
+
+        logger.info(f"Fetching company profiles for {symbols}")
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(symbols))) as executor:
+            return dict(zip(symbols, executor.map(fetch, symbols)))
+
+    def _fetch_news(self, symbol):
+        import yfinance as yf
+
+        return yf.Ticker(symbol, session=self.session).news
+
+
+_provider = YFinanceProvider()
+
+
+def get_provider():
+    """The market-data provider used by charts, comparisons and company research"""
+    return _provider
+
+
+def set_provider(provider):
+    """Swap the shared provider, e.g. for a local fake in tests; returns the previous one"""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
+
+
+# Identical calls already in flight count as hits
+register_cache("market_data", lambda: get_provider().stats, hits=("coalesced",), misses=("misses",))
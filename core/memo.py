@@ -0,0 +1,172 @@
+import time
+import logging
+from threading import Lock, Timer
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightCache:
+    """
+    TTL-bounded result store with single-flight computation.
+
+    The first caller for a key runs the computation; concurrent callers
+    for the same key wait on its result instead of starting their own.
+    Results are kept for ttl seconds when should_cache accepts them.
+
+    Errors of the types in retry_on, and BaseExceptions such as
+    KeyboardInterrupt, belong to the leader's own request rather than to
+    the key, so waiting callers retry instead of raising them.
+    """
+
+    def __init__(self, ttl, max_entries=1024, retry_on=()):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.retry_on = tuple(retry_on)
+        self._values = {}
+        self._in_flight = {}
+        self._lock = Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "retried": 0}
+
+    def _leader_only(self, error):
+        return isinstance(error, self.retry_on) or not isinstance(error, Exception)
+
+    def _evict_expired(self, now):
+        expired = [key for key, (expires_at, _) in self._values.items() if expires_at <= now]
+        for key in expired:
+            del self._values[key]
+        # Drop the oldest entries if still over capacity
+        while len(self._values) > self.max_entries:
+            oldest = min(self._values, key=lambda k: self._values[k][0])
+            del self._values[oldest]
+
+    def get_or_compute(self, key, compute, should_cache=None):
+        """
+        Return the stored value for key, computing it at most once at a time
+
+        Args:
+            key: Hashable cache key
+            compute (callable): Zero-argument function producing the value
+            should_cache (callable): Optional predicate; rejected values are returned but not stored
+
+        Returns:
+            The cached or freshly computed value
+        """
+        while True:
+            now = time.time()
+            with self._lock:
+                cached = self._values.get(key)
+                if cached is not None and cached[0] > now:
+                    self.stats["hits"] += 1
+                    return cached[1]
+
+                future = self._in_flight.get(key)
+                if future is None:
+                    self.stats["misses"] += 1
+                    future = Future()
+                    self._in_flight[key] = future
+                    break
+                self.stats["coalesced"] += 1
+
+            try:
+                return future.result()
+            except BaseException as e:
+                if not self._leader_only(e):
+                    raise
+            # The leader gave up for its own reasons; wait on or become the next leader
+            with self._lock:
+                self.stats["retried"] += 1
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            if should_cache is None or should_cache(value):
+                self._values[key] = (time.time() + self.ttl, value)
+                self._evict_expired(time.time())
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._values.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class MicroBatcher:
+    """
+    Collects keys submitted within a short window and resolves them in one call.
+
+    The first submit opens a window of window seconds; every distinct key
+    submitted before it closes, or until max_batch keys are waiting, is
+    passed to fetch_many together. Duplicate keys in a window share one
+    Future.
+    """
+
+    def __init__(self, fetch_many, window=0.05, max_batch=50):
+        """
+        Args:
+            fetch_many (callable): ``fetch_many(keys) -> {key: value or Exception}``
+            window (float): Seconds to wait for more keys after the first
+            max_batch (int): Flush as soon as this many distinct keys are waiting
+        """
+        self.fetch_many = fetch_many
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}
+        self._timer = None
+        self._lock = Lock()
+        self.stats = {"batches": 0, "keys": 0, "submitted": 0}
+
+    def submit(self, key):
+        """Queue a key and return a Future for its value"""
+        flush_now = False
+        with self._lock:
+            self.stats["submitted"] += 1
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = Future()
+                if len(self._pending) >= self.max_batch:
+                    flush_now = True
+                elif self._timer is None:
+                    self._timer = Timer(self.window, self._flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if flush_now:
+            self._flush()
+        return future
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if batch:
+                self.stats["batches"] += 1
+                self.stats["keys"] += len(batch)
+        if not batch:
+            return
+
+        try:
+            results = self.fetch_many(list(batch))
+        except BaseException as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            value = results.get(key, LookupError(f"No result returned for {key}"))
+            if isinstance(value, BaseException):
+                future.set_exception(value)
+            else:
+                future.set_result(value)
@@ -0,0 +1,241 @@
+import math
+import time
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a cached lookup up to a full report
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric kinds
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {list(self.labelnames)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Return (name, labels, value) tuples, labels as (name, value) pairs"""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic total per label set"""
+
+    kind = COUNTER
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [(self.name, list(zip(self.labelnames, key)), value) for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed upper-bound buckets per label set"""
+
+    kind = HISTOGRAM
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # One slot per bucket plus one for +Inf, then sum
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of a with block, including when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        samples = []
+        for key, values in sorted(series.items()):
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), values[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", labels + [("le", _format_value(float(bound)))], cumulative))
+            samples.append((f"{self.name}_sum", labels, values[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Metrics of the whole process, rendered in the Prometheus text format.
+
+    Histograms and counters are updated where the work happens. Values that
+    already live elsewhere (pool queues, cache stats) are read by collectors
+    at scrape time, so modules that were never imported report nothing.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with a different shape")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collect):
+        """
+        Add a callable read on every scrape
+
+        Args:
+            collect (callable): Returns (name, kind, documentation, labels, value)
+                tuples, with labels as a dict
+        """
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self):
+        """
+        Current value of every metric
+
+        Returns:
+            str: Prometheus text exposition format 0.0.4
+        """
+        families = {}
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for metric in metrics:
+            families[metric.name] = (metric.kind, metric.documentation, metric.samples())
+        for collect in collectors:
+            try:
+                collected = list(collect())
+            except Exception as e:
+                logger.warning(f"Metrics collector {getattr(collect, '__name__', collect)} failed: {str(e)}")
+                continue
+            for name, kind, documentation, labels, value in collected:
+                family = families.setdefault(name, (kind, documentation, []))
+                family[2].append((name, sorted(labels.items()), value))
+
+        lines = []
+        for name, (kind, documentation, samples) in families.items():
+            lines.append(f"# HELP {name} {_escape(documentation)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def register_cache(cache, stats, hits, misses):
+    """
+    Export a cache's stats dict as request counters and a hit ratio
+
+    Args:
+        cache (str): Cache label value
+        stats (callable): Returns the cache's current stats dict
+        hits (tuple): Stats keys counted as hits
+        misses (tuple): Stats keys counted as misses
+    """
+    def collect():
+        current = stats()
+        samples = [
+            ("stockify_cache_requests_total", COUNTER, "Cache lookups by outcome",
+             {"cache": cache, "result": key}, current.get(key, 0))
+            for key in hits + misses
+        ]
+        hit_count = sum(current.get(key, 0) for key in hits)
+        total = hit_count + sum(current.get(key, 0) for key in misses)
+        samples.append(("stockify_cache_hit_ratio", GAUGE, "Share of cache lookups served without recomputing",
+                        {"cache": cache}, hit_count / total if total else 0.0))
+        return samples
+
+    collect.__name__ = f"cache_{cache}"
+    registry.register_collector(collect)
+
+
+# Shared latency histograms, observed by the modules doing the work
+http_request_duration = registry.histogram(
+    "stockify_http_request_duration_seconds", "Time to produce a response, per route", ["method", "route", "status"]
+)
+market_data_duration = registry.histogram(
+    "stockify_market_data_duration_seconds", "Upstream market-data calls, a get_info batch counting once", ["call"]
+)
+scraper_duration = registry.histogram(
+    "stockify_scraper_duration_seconds", "News page fetches and parses", ["stage", "page"]
+)
+agent_run_duration = registry.histogram(
+    "stockify_agent_run_duration_seconds", "LLM agent runs, excluding time queued for rate limits", ["agent"]
+)
+pipeline_stage_duration = registry.histogram(
+    "stockify_report_stage_duration_seconds", "Report pipeline stages from submit to finish", ["stage", "status"]
+)
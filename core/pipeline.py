@@ -0,0 +1,204 @@
+import time
+import logging
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, InvalidStateError, wait
+
+from core.metrics import pipeline_stage_duration
+
+logger = logging.getLogger(__name__)
+
+# Stage outcomes
+DONE = "done"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+SKIPPED = "skipped"
+
+# Deadline of the request the current thread is working for, if any
+current_deadline = contextvars.ContextVar("current_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised by cooperative checks once the request deadline has passed"""
+
+
+class Deadline:
+    """
+    Absolute point in time by which a whole request must finish.
+
+    ``cancel()`` ends it early, e.g. when the client has gone away; every
+    cooperative check then fails as if the time had run out.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        # Completed on cancel, so waits on running work can include it
+        self.cancellation = Future()
+
+    def cancel(self):
+        try:
+            self.cancellation.set_result(True)
+        except InvalidStateError:
+            pass
+
+    @property
+    def cancelled(self):
+        return self.cancellation.done()
+
+    def remaining(self):
+        return 0.0 if self.cancelled else max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.cancelled or time.monotonic() >= self.expires_at
+
+    def reason(self):
+        return "request cancelled" if self.cancelled else f"deadline of {self.seconds}s exceeded"
+
+
+def check_deadline():
+    """Raise DeadlineExceeded if the current request's deadline has passed or it was cancelled"""
+    deadline = current_deadline.get()
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceeded(f"Request {deadline.reason()}")
+
+
+def remaining_time():
+    """Seconds left before the current request's deadline, or None without one"""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+class Stage:
+    """
+    One node of a pipeline.
+
+    ``fn(inputs)`` receives a dict of its dependencies' values. When the
+    stage fails, times out or is skipped, ``fallback(status, error)``
+    provides the value passed downstream instead.
+    """
+
+    def __init__(self, name, fn, deps=(), fallback=None):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.fallback = fallback
+
+    def placeholder(self, status, error):
+        return self.fallback(status, error) if self.fallback else None
+
+
+class PipelineResult:
+    def __init__(self):
+        self.values = {}
+        self.status = {}
+        self.errors = {}
+        # Exceptions raised by failed stages, for callers that map some of them to responses
+        self.exceptions = {}
+
+    @property
+    def complete(self):
+        return all(status == DONE for status in self.status.values())
+
+
+def run_pipeline(stages, executor, deadline, on_start=None, on_done=None):
+    """
+    Run a DAG of stages, each starting as soon as all of its dependencies finish
+
+    Stages run on executor with the caller's context variables and the
+    deadline set as current_deadline. When the deadline passes, queued
+    stages are cancelled, running ones are abandoned rather than joined,
+    and stages not yet started are skipped, so this returns within the
+    deadline however long a stage hangs.
+
+    Args:
+        stages (list): Stage objects with unique names
+        executor: Object with ``submit(fn, *args)`` returning a Future
+        deadline (Deadline): Request-wide deadline
+        on_start (callable): Optional ``on_start(name)``, called before a stage is submitted
+        on_done (callable): Optional ``on_done(name, status, value)``, called in completion order
+
+    Returns:
+        PipelineResult: Value, status and error of every stage
+    """
+    result = PipelineResult()
+    waiting = list(stages)
+    running = {}
+    started = {}
+
+    def finish(stage, status, value=None, error=None):
+        if stage.name in started:
+            # Per-symbol stages such as company:AAPL share one series
+            pipeline_stage_duration.observe(
+                time.monotonic() - started[stage.name], stage=stage.name.split(":")[0], status=status
+            )
+        if status != DONE:
+            value = stage.placeholder(status, error)
+            result.errors[stage.name] = error
+            if status != SKIPPED:
+                logger.warning(f"Pipeline stage {stage.name} {status}: {error}")
+        result.values[stage.name] = value
+        result.status[stage.name] = status
+        if on_done is not None:
+            on_done(stage.name, status, value)
+
+    def run_stage(stage, inputs):
+        current_deadline.set(deadline)
+        return stage.fn(inputs)
+
+    def start_ready():
+        # Repeat, since a stage finishing at submit time can unblock others
+        while True:
+            ready = [stage for stage in waiting if all(dep in result.status for dep in stage.deps)]
+            if not ready:
+                return
+            for stage in ready:
+                waiting.remove(stage)
+                if deadline.expired:
+                    finish(stage, SKIPPED, error=f"{deadline.reason()} before start")
+                    continue
+                if on_start is not None:
+                    on_start(stage.name)
+                inputs = {dep: result.values[dep] for dep in stage.deps}
+                started[stage.name] = time.monotonic()
+                try:
+                    future = executor.submit(contextvars.copy_context().run, run_stage, stage, inputs)
+                except Exception as e:
+                    finish(stage, FAILED, error=str(e))
+                    continue
+                running[future] = stage
+
+    while waiting or running:
+        start_ready()
+
+        if not running:
+            if waiting:
+                raise ValueError(f"Pipeline stages with unknown or cyclic dependencies: {[s.name for s in waiting]}")
+            break
+
+        done, _ = wait(
+            list(running) + [deadline.cancellation], timeout=deadline.remaining(), return_when=FIRST_COMPLETED
+        )
+        done.discard(deadline.cancellation)
+        if not done:
+            # Deadline reached or cancelled: give up on everything still outstanding
+            for future, stage in running.items():
+                future.cancel()
+                finish(stage, TIMED_OUT, error=deadline.reason())
+            for stage in waiting:
+                finish(stage, SKIPPED, error=f"{deadline.reason()} before start")
+            break
+
+        for future in done:
+            stage = running.pop(future)
+            try:
+                value = future.result()
+            except DeadlineExceeded as e:
+                finish(stage, TIMED_OUT, error=str(e))
+            except Exception as e:
+                result.exceptions[stage.name] = e
+                finish(stage, FAILED, error=str(e))
+            else:
+                finish(stage, DONE, value)
+
+    return result
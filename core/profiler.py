@@ -0,0 +1,272 @@
+import os
+import sys
+import time
+import uuid
+import random
+import logging
+import threading
+import contextvars
+from collections import Counter, OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Stack samples per second taken from every thread working for a profiled request
+PROFILE_HZ = int(os.getenv("STOCKIFY_PROFILE_HZ", "100"))
+
+# Finished profiles kept in memory for the admin endpoints
+PROFILE_KEEP = int(os.getenv("STOCKIFY_PROFILE_KEEP", "20"))
+
+# Deepest stack recorded per sample
+MAX_STACK_DEPTH = 128
+
+# Profile of the request the current thread is working for, if any
+current_profile = contextvars.ContextVar("current_profile", default=None)
+
+
+def _frame_name(code):
+    filename = code.co_filename
+    if filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _stack(frame):
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        stack.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class Profile:
+    """
+    Stack samples of the threads working for one request.
+
+    Threads join by running work through ``track`` and leave when it
+    returns, so pool threads are only sampled while they serve this request.
+    """
+
+    def __init__(self, label, hz):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.hz = hz
+        self.started_at = time.time()
+        self.finished_at = None
+        self.samples = Counter()
+        self._threads = Counter()
+        self._lock = threading.Lock()
+
+    def track(self, fn, *args, **kwargs):
+        """Run fn, sampling the calling thread for this profile meanwhile"""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] += 1
+        # Work this thread hands on to other pools is tracked too
+        token = current_profile.set(self)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            current_profile.reset(token)
+            with self._lock:
+                self._threads[ident] -= 1
+                if not self._threads[ident]:
+                    del self._threads[ident]
+
+    def sample(self, frames, names):
+        with self._lock:
+            threads = list(self._threads)
+        for ident in threads:
+            frame = frames.get(ident)
+            if frame is not None:
+                self.samples[(names.get(ident, str(ident)),) + tuple(_stack(frame))] += 1
+
+    @property
+    def duration(self):
+        return (self.finished_at or time.time()) - self.started_at
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "label": self.label,
+            "hz": self.hz,
+            "started_at": self.started_at,
+            "duration": round(self.duration, 3),
+            "samples": sum(self.samples.values()),
+            "finished": self.finished_at is not None,
+        }
+
+    def collapsed(self):
+        """Folded stacks, one ``thread;outer;...;inner count`` line each, as read by flamegraph.pl"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(self.samples.items()))
+
+    def speedscope(self):
+        """
+        Sampled profile in the speedscope file format
+
+        Returns:
+            dict: JSON-serializable document with thread names as root frames
+        """
+        frame_ids = {}
+        frames = []
+        samples = []
+        weights = []
+        for stack, count in sorted(self.samples.items()):
+            indices = []
+            for name in stack:
+                if name not in frame_ids:
+                    frame_ids[name] = len(frames)
+                    frames.append({"name": name})
+                indices.append(frame_ids[name])
+            samples.append(indices)
+            weights.append(count / self.hz)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.label,
+            "exporter": "stockify",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.label,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+class Profiler:
+    """
+    Opt-in sampling profiler for individual requests.
+
+    Nothing runs while no request is profiled: the sampler thread exists
+    only while at least one profile is active, and pools only wrap work
+    when the submitting context carries a profile.
+    """
+
+    def __init__(self, hz=PROFILE_HZ, keep=PROFILE_KEEP):
+        self.hz = hz
+        self.keep = keep
+        # Admin flag: profile this share of all requests without a header
+        self.enabled = False
+        self.fraction = 1.0
+        self._active = []
+        self._finished = OrderedDict()
+        self._lock = threading.Lock()
+        self._sampler = None
+
+    def configure(self, enabled=None, hz=None, fraction=None):
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if hz is not None:
+                self.hz = hz
+            if fraction is not None:
+                self.fraction = fraction
+            return {"enabled": self.enabled, "hz": self.hz, "fraction": self.fraction}
+
+    def should_profile(self):
+        """Whether the admin flag selects the current request"""
+        return self.enabled and random.random() < self.fraction
+
+    def start(self, label):
+        """
+        Begin profiling the current context
+
+        Args:
+            label (str): Shown in listings and as the speedscope profile name
+
+        Returns:
+            tuple: (Profile, context token for ``stop``)
+        """
+        profile = Profile(label, self.hz)
+        with self._lock:
+            self._active.append(profile)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._sampler.start()
+        return profile, current_profile.set(profile)
+
+    def stop(self, profile, token=None):
+        if token is not None:
+            current_profile.reset(token)
+        with self._lock:
+            if profile not in self._active:
+                return
+            self._active.remove(profile)
+            profile.finished_at = time.time()
+            self._finished[profile.id] = profile
+            while len(self._finished) > self.keep:
+                self._finished.popitem(last=False)
+        logger.info(f"Profiled {profile.label}: {sum(profile.samples.values())} samples in {profile.duration:.2f}s")
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._finished.get(profile_id) or next((p for p in self._active if p.id == profile_id), None)
+
+    def profiles(self):
+        with self._lock:
+            return [profile.summary() for profile in list(self._active) + list(reversed(self._finished.values()))]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._sampler = None
+                    return
+                interval = 1 / self.hz
+            frames = sys._current_frames()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for profile in active:
+                profile.sample(frames, names)
+            del frames
+            time.sleep(interval)
+
+
+profiler = Profiler()
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests that ask for it or that the admin flag selects.
+
+    A request opts in with ``X-Stockify-Profile: 1`` plus whatever
+    ``is_authorized(headers)`` checks. Its profile id is returned in
+    ``X-Stockify-Profile-Id``, and sampling lasts until the body, streamed
+    or not, has been sent. Other requests pass straight through.
+    """
+
+    def __init__(self, app, profiler, is_authorized, unsampled_prefixes=("/admin", "/metrics")):
+        self.app = app
+        self.profiler = profiler
+        self.is_authorized = is_authorized
+        # Never picked by the admin flag, so polling them does not crowd out real profiles
+        self.unsampled_prefixes = unsampled_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (
+            self.profiler.enabled or any(name == b"x-stockify-profile" for name, _ in scope["headers"])
+        ):
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        requested = headers.get(b"x-stockify-profile") == b"1" and self.is_authorized(headers)
+        sampled = not scope["path"].startswith(self.unsampled_prefixes) and self.profiler.should_profile()
+        if not (requested or sampled):
+            return await self.app(scope, receive, send)
+
+        profile, token = self.profiler.start(f"{scope['method']} {scope['path']}")
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-stockify-profile-id", profile.id.encode())]}
+            await send(message)
+
+        try:
+            # The event loop is shared by every request and is not sampled; work
+            # handed to the bounded pools is, through the context set above
+            await self.app(scope, receive, send_with_id)
+        finally:
+            self.profiler.stop(profile, token)
@@ -0,0 +1,83 @@
+import random
+import asyncio
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import httpx
+
+from core.metrics import scraper_duration
+
+# Status codes worth retrying; anything else is returned as a failure immediately
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class AsyncPageFetcher:
+    """
+    Bounded concurrent page downloader on a shared httpx.AsyncClient.
+
+    A global semaphore caps requests in flight and a per-host semaphore
+    keeps any single site from receiving more than per_host at once.
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    jittered exponential backoff.
+    """
+
+    def __init__(self, headers=None, concurrency=8, per_host=4, timeout=10.0, retries=2, backoff=0.5):
+        self.headers = headers or {}
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    async def _fetch(self, client, url, slots, host_slots):
+        host = urlparse(url).netloc
+        for attempt in range(self.retries + 1):
+            async with host_slots[host], slots:
+                try:
+                    with scraper_duration.time(stage="fetch", page="article"):
+                        response = await client.get(url)
+                    if response.status_code not in RETRYABLE_STATUS:
+                        response.raise_for_status()
+                        return url, response.content
+                    error = f"HTTP {response.status_code}"
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    error = repr(e)
+                except httpx.HTTPStatusError as e:
+                    print(f"Error fetching article {url}: {e}")
+                    return url, None
+
+            if attempt < self.retries:
+                # Sleep outside the semaphores so waiting retries don't hold slots
+                delay = self.backoff * (2 ** attempt)
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+
+        print(f"Error fetching article {url}: {error}")
+        return url, None
+
+    async def fetch_all(self, urls):
+        """
+        Download every URL, yielding (url, content) as each finishes
+
+        Args:
+            urls (list): Page URLs; duplicates are fetched once
+
+        Yields:
+            tuple: (url, response bytes or None on failure)
+        """
+        slots = asyncio.Semaphore(self.concurrency)
+        host_slots = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+
+        async with httpx.AsyncClient(
+            headers=self.headers, timeout=self.timeout, limits=limits, follow_redirects=True
+        ) as client:
+            tasks = [
+                asyncio.create_task(self._fetch(client, url, slots, host_slots))
+                for url in dict.fromkeys(urls)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
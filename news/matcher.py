@@ -0,0 +1,65 @@
+import re
+
+
+def _trie_pattern(keywords):
+    """Build a regex alternation factored by common prefixes, e.g. stock(?:s)?"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A keyword ending here makes the longer continuations optional
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Whole-word matcher for a fixed keyword list, case-insensitive by default.
+
+    All keywords are compiled once into a single prefix-factored
+    alternation, so the regex engine dispatches on the first character
+    instead of trying every keyword at every offset. Lookarounds are used
+    instead of \\b so keywords such as 's&p 500' or 'sell-off' still
+    match on their own while 'dow' no longer matches inside 'download'.
+    With ``plurals`` an 's' or 'es' ending is accepted too, so 'analyst'
+    matches 'analysts'; matches still report the listed keyword.
+    """
+
+    def __init__(self, keywords, ignore_case=True, plurals=False):
+        self.ignore_case = ignore_case
+        self.keywords = list(dict.fromkeys(k.lower() if ignore_case else k for k in keywords))
+        suffix = "(?:s|es)?" if plurals else ""
+        self.pattern = re.compile(rf"(?<![A-Za-z0-9])(?P<keyword>{_trie_pattern(self.keywords)}){suffix}(?![A-Za-z0-9])")
+
+    def _prepare(self, text):
+        return text.lower() if self.ignore_case else text
+
+    def finditer(self, text):
+        """
+        Yield every keyword occurrence in text
+
+        Args:
+            text (str): Text to scan
+
+        Yields:
+            tuple: (keyword, start, end) for each non-overlapping match
+        """
+        for match in self.pattern.finditer(self._prepare(text)):
+            yield match.group("keyword"), match.start(), match.end()
+
+    def matches(self, text):
+        """Return all (keyword, start, end) occurrences in text"""
+        return list(self.finditer(text))
+
+    def search(self, text):
+        """Return True if any keyword occurs in text"""
+        return self.pattern.search(self._prepare(text)) is not None
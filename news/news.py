@@ -1,14 +1,40 @@
 import requests
-from bs4 import BeautifulSoup
 import json
 import time
 from datetime import datetime, timedelta
 import csv
+import itertools
 from urllib.parse import urljoin, urlparse
 import re
+import asyncio
+import hashlib
+import os
+
+from news.matcher import KeywordMatcher
+from news.parsing import default_backend, make_soup, parse_story_items
+from news.fetcher import AsyncPageFetcher
+from news.tickers import TickerExtractor
+from core.memo import SingleFlightCache
+from core.metrics import scraper_duration
+
+# Seconds a fetched topic page is served without asking Yahoo again
+NEWS_PAGE_TTL = int(os.getenv("STOCKIFY_NEWS_PAGE_TTL", "30"))
+
+# Parsed story item lists kept by page content hash
+PARSED_PAGE_CACHE_SIZE = 8
+PARSED_PAGE_TTL = 3600
+
+# Matches any 2-5 letter run in the upper-cased title, kept from the original ticker heuristic
+TICKER_PATTERN = re.compile(r'\b[A-Z]{2,5}\b')
+
+# Columns written by save_to_csv and the CSV news export
+NEWS_CSV_FIELDS = ['title', 'url', 'summary', 'published_time', 'source', 'image_url',
+                   'is_stock_related', 'scraped_at']
 
 class YahooFinanceStockNewsScraper:
-    def __init__(self):
+    def __init__(self, parser_backend=None):
+        # selectolax or lxml when installed, html.parser otherwise
+        self.parser_backend = parser_backend or default_backend()
         self.base_url = "https://finance.yahoo.com/topic/stock-market-news/"
         self.news_url = "https://finance.yahoo.com/topic/stock-market-news/"
         self.session = requests.Session()
@@ -43,6 +69,76 @@ class YahooFinanceStockNewsScraper:
             'minutes ago', 'hours ago', 'this morning', 'afternoon', 'evening'
         ]
 
+        # Indicators that push an article up in get_breaking_stock_news
+        self.breaking_indicators = ['breaking', 'just', 'alert', 'flash', 'live',
+                                    'minutes ago', 'hours ago', 'now', 'today']
+
+        # Ticker/company-name dictionary used to tag articles with symbols
+        self.ticker_extractor = TickerExtractor()
+
+        # Topic page cache shared by every caller of this scraper; a burst of
+        # requests within the TTL costs one upstream fetch
+        self.page_cache = SingleFlightCache(ttl=NEWS_PAGE_TTL)
+        self._validators = {}
+        self._parsed_pages = SingleFlightCache(ttl=PARSED_PAGE_TTL, max_entries=PARSED_PAGE_CACHE_SIZE)
+
+        # Compiled once so each article is scanned in a single regex pass
+        self.stock_matcher = KeywordMatcher(self.stock_keywords, plurals=True)
+        self.breaking_matcher = KeywordMatcher(self.breaking_indicators, plurals=True)
+
+    def stock_keyword_matches(self, title, summary=""):
+        """
+        Find stock-related keywords in an article's title and summary
+
+        Args:
+            title (str): Article title
+            summary (str): Article summary
+
+        Returns:
+            list: (keyword, start, end) tuples with offsets into "title summary"
+        """
+        return self.stock_matcher.matches(title + " " + summary)
+
+    def _revalidate_page(self, url):
+        # Conditional GET: a 304 reuses the body we already have
+        etag, last_modified, content = self._validators.get(url, (None, None, None))
+        headers = {}
+        if content is not None:
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        with scraper_duration.time(stage="fetch", page="topic"):
+            response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and content is not None:
+            return content
+        response.raise_for_status()
+
+        self._validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'), response.content)
+        return response.content
+
+    def fetch_page(self, url):
+        """
+        Get a page body through the shared TTL cache and ETag/Last-Modified revalidation
+        
+        Args:
+            url (str): Page URL
+            
+        Returns:
+            bytes: Page content
+        """
+        return self.page_cache.get_or_compute(('page', url), lambda: self._revalidate_page(url))
+
+    def parse_story_items_cached(self, content):
+        """Parse a topic page once per distinct content hash"""
+        key = hashlib.sha256(content).hexdigest()
+        return self._parsed_pages.get_or_compute(key, lambda: self._parse_story_items(content))
+
+    def _parse_story_items(self, content):
+        with scraper_duration.time(stage="parse", page="topic"):
+            return parse_story_items(content, self.parser_backend)
+
     def is_stock_related(self, title, summary=""):
         """
         Check if an article is stock-related based on title and summary
@@ -54,16 +150,12 @@ class YahooFinanceStockNewsScraper:
         Returns:
             bool: True if article is stock-related
         """
-        text_to_check = (title + " " + summary).lower()
-        
         # Check for stock-related keywords
-        for keyword in self.stock_keywords:
-            if keyword in text_to_check:
-                return True
+        if self.stock_matcher.search(title + " " + summary):
+            return True
         
         # Check for ticker symbols (e.g., AAPL, MSFT, TSLA)
-        ticker_pattern = r'\b[A-Z]{2,5}\b'
-        if re.search(ticker_pattern, title.upper()):
+        if TICKER_PATTERN.search(title.upper()):
             return True
             
         return False
@@ -82,14 +174,12 @@ class YahooFinanceStockNewsScraper:
             list: List of dictionaries containing stock article information
         """
         try:
-            response = self.session.get(self.news_url)
-            response.raise_for_status()
+            content = self.fetch_page(self.news_url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
             articles = []
             
             # Find article containers using the current Yahoo Finance structure
-            story_items = soup.select('li.stream-item.story-item')
+            story_items = self.parse_story_items_cached(content)
             
             found_links = set()
             
@@ -97,14 +187,7 @@ class YahooFinanceStockNewsScraper:
                 if len(articles) >= max_articles:
                     break
                 
-                # Find the main article link
-                link_elem = item.select_one('a.subtle-link.fin-size-small.titles')
-                if not link_elem:
-                    continue
-                
-                href = link_elem.get('href')
-                if not href:
-                    continue
+                href = item['href']
                 
                 # Convert relative URLs to absolute
                 if href.startswith('/'):
@@ -123,37 +206,25 @@ class YahooFinanceStockNewsScraper:
                 if 'finance.yahoo.com' not in full_url:
                     continue
                 
-                # Get title from h3 element
-                title_elem = link_elem.select_one('h3.clamp')
-                if not title_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
+                # Title comes from the h3 element inside the link
+                title = item['title']
                 if not title:
                     continue
                 
-                # Get summary from p element within the same link
-                summary = ""
-                summary_elem = link_elem.select_one('p.clamp')
-                if summary_elem:
-                    summary = summary_elem.get_text(strip=True)
-                
-                # Look for publication time in the container
-                published_time = ""
-                time_elem = item.select_one('time')
-                if time_elem:
-                    published_time = time_elem.get_text(strip=True)
+                summary = item['summary']
                 
                 # Filter for stock-related articles
-                if not self.is_stock_related(title, summary):
+                # Scanned once; the matches are kept on the article, and a ticker-like word
+                # is all is_stock_related would add when there are none
+                keyword_matches = self.stock_keyword_matches(title, summary)
+                if not keyword_matches and not TICKER_PATTERN.search(title.upper()):
                     continue
                 # Look for publication source and time from the publishing container
                 source = ""
                 published_time = ""
 
-                publishing_elem = item.select_one('div.publishing')
-                if publishing_elem:
-                    publishing_text = publishing_elem.get_text(strip=True)
+                publishing_text = item['publishing']
+                if publishing_text is not None:
                     # Split by bullet (•) to get source and time
                     if '•' in publishing_text:
                         parts = publishing_text.split('•')
@@ -173,6 +244,8 @@ class YahooFinanceStockNewsScraper:
     'source': source,
     'scraped_at': datetime.now().isoformat(),
     'is_stock_related': True,
+    'matched_keywords': sorted({keyword for keyword, _, _ in keyword_matches}),
+    'symbols': self.ticker_extractor.extract(title, summary),
 }
 
                 
@@ -184,8 +257,7 @@ class YahooFinanceStockNewsScraper:
                     "https://s.yimg.com/ny/api/res/1.2/yXq8y4VNkrtt.fdJW1cocw--/YXBwaWQ9aGlnaGxhbmRlcjt3PTk2MDtoPTU0MA--/https://media.zenfs.com/en/the_daily_upside_435/f5f7c2f0ae577e29c80d57e26a95f4a6"
                 ]
 
-                img_elem = item.select_one('img')
-                img_src = img_elem.get('src') if img_elem and img_elem.get('src') else None
+                img_src = item['image'] or None
 
                 if not img_src:
                     import random
@@ -200,6 +272,7 @@ class YahooFinanceStockNewsScraper:
             # Fallback: try alternative selectors if no articles found
             if not articles:
                 print("Trying fallback selectors...")
+                soup = make_soup(content)
                 fallback_selectors = [
                     'h3 a[href*="finance.yahoo.com"]',
                     'a[href*="/news/"]',
@@ -247,7 +320,9 @@ class YahooFinanceStockNewsScraper:
                             'summary': '',
                             'published_time': '',
                             'scraped_at': datetime.now().isoformat(),
-                            'is_stock_related': True,                        }
+                            'is_stock_related': True,
+                            'symbols': self.ticker_extractor.extract(title),
+                        }
                         
                         articles.append(article_data)
                     
@@ -274,78 +349,12 @@ class YahooFinanceStockNewsScraper:
             dict: Article content including title, body, author, etc.
         """
         try:
-            response = self.session.get(article_url)
+            with scraper_duration.time(stage="fetch", page="article"):
+                response = self.session.get(article_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract article details
-            article_content = {
-                'url': article_url,
-                'scraped_at': datetime.now().isoformat()
-            }
-            
-            # Title
-            title_selectors = [
-                'h1[data-test-locator="headline"]',
-                'h1.caas-title-wrapper',
-                'h1',
-                '.caas-title-wrapper h1'
-            ]
-            
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    article_content['title'] = title_elem.get_text(strip=True)
-                    break
-            
-            # Article body
-            body_selectors = [
-                '.caas-body',
-                '[data-test-locator="ArticleBody"]',
-                '.article-body',
-                '.caas-content-wrapper'
-            ]
-            
-            for selector in body_selectors:
-                body_elem = soup.select_one(selector)
-                if body_elem:
-                    # Get all paragraph text
-                    paragraphs = body_elem.find_all('p')
-                    article_content['body'] = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    break
-            
-            # Author
-            author_selectors = [
-                '[data-test-locator="AuthorName"]',
-                '.caas-author-byline',
-                '.author-name'
-            ]
-            
-            for selector in author_selectors:
-                author_elem = soup.select_one(selector)
-                if author_elem:
-                    article_content['author'] = author_elem.get_text(strip=True)
-                    break
-            
-            # Publication date
-            date_selectors = [
-                'time[datetime]',
-                '[data-test-locator="PublishDate"]',
-                '.caas-attr-time-style'
-            ]
-            
-            for selector in date_selectors:
-                date_elem = soup.select_one(selector)
-                if date_elem:
-                    datetime_attr = date_elem.get('datetime')
-                    if datetime_attr:
-                        article_content['published_date'] = datetime_attr
-                    else:
-                        article_content['published_date'] = date_elem.get_text(strip=True)
-                    break
-            
-            return article_content
+            with scraper_duration.time(stage="parse", page="article"):
+                return self.parse_article_content(response.content, article_url)
             
         except requests.exceptions.RequestException as e:
             print(f"Error fetching article {article_url}: {e}")
@@ -354,35 +363,191 @@ class YahooFinanceStockNewsScraper:
             print(f"Error parsing article {article_url}: {e}")
             return None
 
+    def parse_article_content(self, html, article_url):
+        """
+        Extract title, body, author and publication date from an article page
+        
+        Args:
+            html (bytes | str): Article page content
+            article_url (str): URL of the article
+            
+        Returns:
+            dict: Article content including title, body, author, etc.
+        """
+        soup = make_soup(html)
+
+        # Extract article details
+        article_content = {
+            'url': article_url,
+            'scraped_at': datetime.now().isoformat()
+        }
+
+        # Title
+        title_selectors = [
+            'h1[data-test-locator="headline"]',
+            'h1.caas-title-wrapper',
+            'h1',
+            '.caas-title-wrapper h1'
+        ]
+
+        for selector in title_selectors:
+            title_elem = soup.select_one(selector)
+            if title_elem:
+                article_content['title'] = title_elem.get_text(strip=True)
+                break
+
+        # Article body
+        body_selectors = [
+            '.caas-body',
+            '[data-test-locator="ArticleBody"]',
+            '.article-body',
+            '.caas-content-wrapper'
+        ]
+
+        for selector in body_selectors:
+            body_elem = soup.select_one(selector)
+            if body_elem:
+                # Get all paragraph text
+                paragraphs = body_elem.find_all('p')
+                article_content['body'] = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+                break
+
+        # Author
+        author_selectors = [
+            '[data-test-locator="AuthorName"]',
+            '.caas-author-byline',
+            '.author-name'
+        ]
+
+        for selector in author_selectors:
+            author_elem = soup.select_one(selector)
+            if author_elem:
+                article_content['author'] = author_elem.get_text(strip=True)
+                break
+
+        # Publication date
+        date_selectors = [
+            'time[datetime]',
+            '[data-test-locator="PublishDate"]',
+            '.caas-attr-time-style'
+        ]
+
+        for selector in date_selectors:
+            date_elem = soup.select_one(selector)
+            if date_elem:
+                datetime_attr = date_elem.get('datetime')
+                if datetime_attr:
+                    article_content['published_date'] = datetime_attr
+                else:
+                    article_content['published_date'] = date_elem.get_text(strip=True)
+                break
+
+        return article_content
+
+    async def iter_article_contents(self, urls, concurrency=8, per_host=4, timeout=10.0, retries=2):
+        """
+        Fetch and parse many articles concurrently, yielding each as it completes
+        
+        Args:
+            urls (list): Article URLs
+            concurrency (int): Maximum requests in flight overall
+            per_host (int): Maximum requests in flight per host
+            timeout (float): Per-request timeout in seconds
+            retries (int): Retries for timeouts, connection errors, 429 and 5xx
+            
+        Yields:
+            tuple: (url, article content dict or None on failure)
+        """
+        fetcher = AsyncPageFetcher(
+            headers=dict(self.session.headers),
+            concurrency=concurrency,
+            per_host=per_host,
+            timeout=timeout,
+            retries=retries,
+        )
+        async for url, html in fetcher.fetch_all(urls):
+            if html is None:
+                yield url, None
+                continue
+            try:
+                with scraper_duration.time(stage="parse", page="article"):
+                    article = self.parse_article_content(html, url)
+                yield url, article
+            except Exception as e:
+                print(f"Error parsing article {url}: {e}")
+                yield url, None
+
+    def get_article_contents(self, urls, concurrency=8, **kwargs):
+        """
+        Fetch and parse many articles concurrently from synchronous code
+        
+        Args:
+            urls (list): Article URLs
+            concurrency (int): Maximum requests in flight overall
+            
+        Returns:
+            dict: Article content (or None on failure) keyed by URL
+        """
+        async def collect():
+            return {url: content async for url, content in self.iter_article_contents(urls, concurrency, **kwargs)}
+
+        return asyncio.run(collect())
+
+    def add_article_contents(self, articles, concurrency=8):
+        """
+        Attach body, author and publication date to scraped articles in place
+        
+        Args:
+            articles (list): Articles from get_stock_news_articles
+            concurrency (int): Maximum article requests in flight
+            
+        Returns:
+            list: The same articles
+        """
+        contents = self.get_article_contents([article['url'] for article in articles], concurrency)
+        for article in articles:
+            content = contents.get(article['url'])
+            if content:
+                for key in ('body', 'author', 'published_date'):
+                    if key in content:
+                        article[key] = content[key]
+        return articles
+
     def save_to_json(self, articles, filename='yahoo_finance_stock_news.json'):
-        """Save articles to JSON file"""
+        """Save articles to JSON file, writing one article at a time so any iterable can be streamed"""
         try:
+            count = 0
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, indent=2, ensure_ascii=False)
-            print(f"Saved {len(articles)} articles to {filename}")
+                f.write('[')
+                for article in articles:
+                    encoded = json.dumps(article, indent=2, ensure_ascii=False)
+                    f.write((',\n  ' if count else '\n  ') + encoded.replace('\n', '\n  '))
+                    count += 1
+                f.write('\n]' if count else ']')
+            print(f"Saved {count} articles to {filename}")
         except Exception as e:
             print(f"Error saving to JSON: {e}")
 
     def save_to_csv(self, articles, filename='yahoo_finance_stock_news.csv'):
-        """Save articles to CSV file"""
+        """Save articles to CSV file, writing one row at a time so any iterable can be streamed"""
         try:
-            if not articles:
+            articles = iter(articles)
+            first = next(articles, None)
+            if first is None:
                 print("No articles to save")
                 return
-            
-            fieldnames = ['title', 'url', 'summary', 'published_time', 'source', 'image_url',
-              'is_stock_related', 'scraped_at']
 
+            count = 0
             with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                # Only write fields that exist in NEWS_CSV_FIELDS
+                writer = csv.DictWriter(f, fieldnames=NEWS_CSV_FIELDS, extrasaction='ignore', restval='')
                 writer.writeheader()
-                
-                for article in articles:
-                    # Only write fields that exist in fieldnames
-                    row = {key: article.get(key, '') for key in fieldnames}
-                    writer.writerow(row)
-            
-            print(f"Saved {len(articles)} stock articles to {filename}")
+
+                for article in itertools.chain([first], articles):
+                    writer.writerow(article)
+                    count += 1
+
+            print(f"Saved {count} stock articles to {filename}")
         except Exception as e:
             print(f"Error saving to CSV: {e}")
 
@@ -402,17 +567,9 @@ class YahooFinanceStockNewsScraper:
         # Sort by recency indicators and limit results
         breaking_news = []
         for article in articles:
-            title_lower = article['title'].lower()
-            summary_lower = article.get('summary', '').lower()
-            
             # Prioritize articles with strong breaking news indicators
-            breaking_indicators = ['breaking', 'just', 'alert', 'flash', 'live', 
-                                 'minutes ago', 'hours ago', 'now', 'today']
-            
-            priority_score = 0
-            for indicator in breaking_indicators:
-                if indicator in title_lower or indicator in summary_lower:
-                    priority_score += 1
+            text = article['title'] + " " + article.get('summary', '')
+            priority_score = len({keyword for keyword, _, _ in self.breaking_matcher.finditer(text)})
             
             article['priority_score'] = priority_score
             breaking_news.append(article)
@@ -0,0 +1,125 @@
+import os
+import re
+import importlib.util
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Parser backends in order of preference; the first installed one is the default
+BACKENDS = ["selectolax", "lxml", "html.parser"]
+
+STORY_ITEM_SELECTOR = "li.stream-item.story-item"
+LINK_SELECTOR = "a.subtle-link.fin-size-small.titles"
+TITLE_SELECTOR = "h3.clamp"
+SUMMARY_SELECTOR = "p.clamp"
+PUBLISHING_SELECTOR = "div.publishing"
+
+# Compiled once instead of re-parsing the CSS for every story item
+_STORY_ITEM = soupsieve.compile(STORY_ITEM_SELECTOR)
+_LINK = soupsieve.compile(LINK_SELECTOR)
+_TITLE = soupsieve.compile(TITLE_SELECTOR)
+_SUMMARY = soupsieve.compile(SUMMARY_SELECTOR)
+_PUBLISHING = soupsieve.compile(PUBLISHING_SELECTOR)
+_IMG = soupsieve.compile("img")
+
+
+# Only li.stream-item subtrees are built into the BeautifulSoup tree; the class
+# attribute is still an unsplit string while parsing, hence the regex
+STORY_ITEM_STRAINER = SoupStrainer("li", class_=re.compile(r"(?:^|\s)stream-item(?:\s|$)"))
+
+
+def available_backends():
+    """Return the installed parser backends, preferred first"""
+    installed = []
+    for backend in BACKENDS:
+        if backend == "html.parser" or importlib.util.find_spec(backend) is not None:
+            installed.append(backend)
+    return installed
+
+
+def default_backend():
+    """Backend from STOCKIFY_HTML_PARSER, else the fastest installed one"""
+    configured = os.getenv("STOCKIFY_HTML_PARSER")
+    if configured:
+        if configured not in available_backends():
+            raise ValueError(f"HTML parser backend '{configured}' is not installed")
+        return configured
+    return available_backends()[0]
+
+
+def _story_item(href, title, summary, publishing, image):
+    return {
+        "href": href,
+        "title": title,
+        "summary": summary,
+        "publishing": publishing,
+        "image": image,
+    }
+
+
+def _parse_story_items_bs4(html, parser):
+    soup = BeautifulSoup(html, parser, parse_only=STORY_ITEM_STRAINER)
+    items = []
+    for item in _STORY_ITEM.select(soup):
+        link_elem = _LINK.select_one(item)
+        if not link_elem or not link_elem.get("href"):
+            continue
+        title_elem = _TITLE.select_one(link_elem)
+        summary_elem = _SUMMARY.select_one(link_elem)
+        publishing_elem = _PUBLISHING.select_one(item)
+        img_elem = _IMG.select_one(item)
+        items.append(_story_item(
+            link_elem.get("href"),
+            title_elem.get_text(strip=True) if title_elem else None,
+            summary_elem.get_text(strip=True) if summary_elem else "",
+            publishing_elem.get_text(strip=True) if publishing_elem else None,
+            img_elem.get("src") if img_elem else None,
+        ))
+    return items
+
+
+def _parse_story_items_selectolax(html):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    items = []
+    for item in tree.css(STORY_ITEM_SELECTOR):
+        link_elem = item.css_first(LINK_SELECTOR)
+        if link_elem is None or not link_elem.attributes.get("href"):
+            continue
+        title_elem = link_elem.css_first(TITLE_SELECTOR)
+        summary_elem = link_elem.css_first(SUMMARY_SELECTOR)
+        publishing_elem = item.css_first(PUBLISHING_SELECTOR)
+        img_elem = item.css_first("img")
+        items.append(_story_item(
+            link_elem.attributes.get("href"),
+            title_elem.text(strip=True) if title_elem is not None else None,
+            summary_elem.text(strip=True) if summary_elem is not None else "",
+            publishing_elem.text(strip=True) if publishing_elem is not None else None,
+            img_elem.attributes.get("src") if img_elem is not None else None,
+        ))
+    return items
+
+
+def parse_story_items(html, backend=None):
+    """
+    Extract the raw fields of every story item on a Yahoo Finance topic page
+
+    Args:
+        html (bytes | str): Page content
+        backend (str): One of BACKENDS; defaults to default_backend()
+
+    Returns:
+        list: Dicts with href, title (None when missing), summary,
+        publishing text (None when missing) and image src
+    """
+    backend = backend or default_backend()
+    if backend == "selectolax":
+        return _parse_story_items_selectolax(html)
+    return _parse_story_items_bs4(html, backend)
+
+
+def make_soup(html):
+    """Full BeautifulSoup tree, built with lxml when it is installed"""
+    parser = "lxml" if "lxml" in available_backends() else "html.parser"
+    return BeautifulSoup(html, parser)
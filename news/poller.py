@@ -0,0 +1,65 @@
+import os
+import logging
+from threading import Event, Thread
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background scrapes; 0 disables the poller
+NEWS_POLL_INTERVAL = int(os.getenv("STOCKIFY_NEWS_POLL_INTERVAL", "300"))
+NEWS_POLL_MAX_ARTICLES = int(os.getenv("STOCKIFY_NEWS_POLL_MAX_ARTICLES", "50"))
+
+
+class NewsPoller:
+    """
+    Scrapes the news page on a schedule and appends new articles to an ArticleStore.
+
+    ``scraper`` is a scraper or a zero-argument callable returning one, so
+    building the scraper can wait until the first poll.
+    """
+
+    def __init__(self, scraper, store, interval=NEWS_POLL_INTERVAL, max_articles=NEWS_POLL_MAX_ARTICLES):
+        self._scraper = scraper
+        self.store = store
+        self.interval = interval
+        self.max_articles = max_articles
+        self._stop = Event()
+        self._thread = None
+
+    @property
+    def scraper(self):
+        if callable(self._scraper):
+            self._scraper = self._scraper()
+        return self._scraper
+
+    def poll_once(self):
+        """
+        Scrape once and store unseen articles
+
+        Returns:
+            list: Articles added by this poll
+        """
+        articles = self.scraper.get_stock_news_articles(max_articles=self.max_articles, recent_only=True)
+        # The page lists newest first; store oldest first so ids follow publication order
+        added = self.store.add(list(reversed(articles)))
+        logger.info(f"News poll stored {len(added)} new of {len(articles)} scraped articles")
+        return added
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"News poll failed: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="news-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
@@ -0,0 +1,272 @@
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+from threading import Lock
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_NEWS_DB = os.getenv("STOCKIFY_NEWS_DB", os.path.join(".cache", "news.sqlite3"))
+
+
+def canonical_url(url):
+    """Lower-case scheme and host, drop query string, fragment and trailing slash"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, "", ""))
+
+
+def title_hash(title):
+    """Hash of a title with case, punctuation and spacing normalized away"""
+    normalized = " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """
+    Append-only SQLite store of scraped articles.
+
+    Articles are deduplicated across scrapes by canonical URL and by title
+    hash. Row ids only grow, so the largest id a client has seen works as
+    a cursor for fetching newer articles.
+    """
+
+    def __init__(self, path=DEFAULT_NEWS_DB):
+        self.path = path
+        self._lock = Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url_key TEXT NOT NULL UNIQUE,
+                    title_hash TEXT NOT NULL UNIQUE,
+                    data TEXT NOT NULL,
+                    inserted_at REAL NOT NULL
+                )
+                """
+            )
+            # Inverted index from ticker symbol to the articles mentioning it
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS article_symbols (
+                    symbol TEXT NOT NULL,
+                    article_id INTEGER NOT NULL REFERENCES articles(id),
+                    PRIMARY KEY (symbol, article_id)
+                ) WITHOUT ROWID
+                """
+            )
+            # Full-text index over title, summary and body; rowid is the article id
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts
+                USING fts5(title, summary, body, tokenize='porter unicode61')
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS articles_inserted_at ON articles(inserted_at)")
+            # Index articles stored before the full-text table existed
+            conn.execute(
+                """
+                INSERT INTO articles_fts (rowid, title, summary, body)
+                SELECT id, json_extract(data, '$.title'), COALESCE(json_extract(data, '$.summary'), ''),
+                       COALESCE(json_extract(data, '$.body'), '')
+                FROM articles WHERE id > (SELECT COALESCE(MAX(rowid), 0) FROM articles_fts)
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _row_to_article(row):
+        article_id, data = row
+        article = json.loads(data)
+        article["id"] = article_id
+        return article
+
+    def add(self, articles):
+        """
+        Append articles not seen before
+
+        Args:
+            articles (list): Article dicts with at least url and title
+
+        Returns:
+            list: The newly stored articles, with their ids
+        """
+        added = []
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            for article in articles:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO articles (url_key, title_hash, data, inserted_at) VALUES (?, ?, ?, ?)",
+                    (canonical_url(article["url"]), title_hash(article["title"]), json.dumps(article), now),
+                )
+                if cursor.rowcount:
+                    article_id = cursor.lastrowid
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO article_symbols (symbol, article_id) VALUES (?, ?)",
+                        [(symbol, article_id) for symbol in article.get("symbols", [])],
+                    )
+                    conn.execute(
+                        "INSERT INTO articles_fts (rowid, title, summary, body) VALUES (?, ?, ?, ?)",
+                        (article_id, article["title"], article.get("summary", ""), article.get("body", "")),
+                    )
+                    added.append(dict(article, id=article_id))
+        return added
+
+    def update_contents(self, articles, extract_symbols=None):
+        """
+        Persist fetched bodies, authors and dates of stored articles and reindex them
+
+        Args:
+            articles (list): Stored articles, with ids, carrying fetched bodies
+            extract_symbols (callable): ``extract_symbols(title, summary, body) -> list``; when
+                given, each article is re-tagged in place and its symbol index rows are
+                replaced in the same transaction as its body
+        """
+        with self._lock, self._connect() as conn:
+            for article in articles:
+                if "id" not in article or not article.get("body"):
+                    continue
+                if extract_symbols is not None:
+                    article["symbols"] = extract_symbols(article["title"], article.get("summary", ""), article["body"])
+                    conn.execute("DELETE FROM article_symbols WHERE article_id = ?", (article["id"],))
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO article_symbols (symbol, article_id) VALUES (?, ?)",
+                        [(symbol, article["id"]) for symbol in article["symbols"]],
+                    )
+                data = {key: value for key, value in article.items() if key != "id"}
+                conn.execute("UPDATE articles SET data = ? WHERE id = ?", (json.dumps(data), article["id"]))
+                conn.execute("UPDATE articles_fts SET body = ? WHERE rowid = ?", (article["body"], article["id"]))
+
+    def search(self, query, start=None, end=None, limit=20):
+        """
+        Full-text search ranked by BM25, titles weighted above summaries and bodies
+
+        Args:
+            query (str): Free text; every word must match after Porter stemming
+            start (float): Only articles stored at or after this epoch time
+            end (float): Only articles stored before this epoch time
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Articles with a ``score`` field, best match first
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        # Quote each word so user input can never be parsed as FTS5 syntax
+        match = " ".join(f'"{word}"' for word in words)
+
+        sql = (
+            "SELECT a.id, a.data, bm25(articles_fts, 10.0, 3.0, 1.0) AS score "
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+            "WHERE articles_fts MATCH ?"
+        )
+        params = [match]
+        if start is not None:
+            sql += " AND a.inserted_at >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND a.inserted_at < ?"
+            params.append(end)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        results = []
+        for article_id, data, score in rows:
+            article = self._row_to_article((article_id, data))
+            article["score"] = round(-score, 4)
+            results.append(article)
+        return results
+
+    def latest(self, limit=10):
+        """Most recently stored articles, newest first"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, data FROM articles ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [self._row_to_article(row) for row in rows]
+
+    def since(self, cursor, limit=100):
+        """Articles stored after the given cursor id, oldest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, data FROM articles WHERE id > ? ORDER BY id LIMIT ?", (cursor, limit)
+            ).fetchall()
+        return [self._row_to_article(row) for row in rows]
+
+    def iter_since(self, cursor=0, batch_size=500):
+        """
+        Yield every article stored after the cursor id, oldest first
+
+        Rows are read in keyset-paginated batches on short-lived connections,
+        so memory stays bounded by batch_size however large the store grows.
+
+        Args:
+            cursor (int): Only articles with a larger id
+            batch_size (int): Rows fetched per query
+
+        Yields:
+            dict: Articles with their ids
+        """
+        while True:
+            batch = self.since(cursor, limit=batch_size)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            cursor = batch[-1]["id"]
+
+    def get_many(self, article_ids):
+        """Articles by id, in the order given"""
+        if not article_ids:
+            return []
+        placeholders = ",".join("?" * len(article_ids))
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT id, data FROM articles WHERE id IN ({placeholders})", list(article_ids)).fetchall()
+        by_id = {row[0]: self._row_to_article(row) for row in rows}
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+
+    def by_symbols(self, symbols, limit=10, start=None):
+        """
+        Newest articles mentioning any of the given symbols, via the symbol index
+
+        Args:
+            symbols (list): Ticker symbols
+            limit (int): Maximum number of articles
+            start (float): Only articles stored at or after this epoch time
+
+        Returns:
+            list: Articles, newest first
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        if not symbols:
+            return []
+        placeholders = ",".join("?" * len(symbols))
+        sql = (
+            "SELECT DISTINCT a.id, a.data FROM article_symbols s JOIN articles a ON a.id = s.article_id "
+            f"WHERE s.symbol IN ({placeholders})"
+        )
+        params = list(symbols)
+        if start is not None:
+            sql += " AND a.inserted_at >= ?"
+            params.append(start)
+        sql += " ORDER BY a.id DESC LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_article(row) for row in rows]
+
+    def max_id(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+
+
+# Shared by the API, the background poller and the report pipeline
+article_store = ArticleStore()
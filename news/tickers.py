@@ -0,0 +1,66 @@
+import os
+import csv
+import re
+
+from news.matcher import KeywordMatcher
+
+DEFAULT_TICKERS_FILE = os.getenv(
+    "STOCKIFY_TICKERS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tickers.csv")
+)
+
+# Explicit ticker mentions: $AAPL, (AAPL), (NASDAQ: AAPL), (NYSE:BRK-B)
+EXPLICIT_TICKER_PATTERN = re.compile(r"\$([A-Z]{1,5}(?:[.-][A-Z])?)\b|\((?:[A-Za-z]+:\s*)?([A-Z]{1,5}(?:[.-][A-Z])?)\)")
+
+# Bare upper-case words only count as tickers when at least this long and not common words
+BARE_TICKER_PATTERN = re.compile(r"\b[A-Z]{3,5}\b")
+BARE_TICKER_STOPLIST = {"CEO", "CFO", "IPO", "ETF", "USA", "GDP", "CPI", "FED", "SEC", "NOW", "ALL", "LOW", "ARM", "NIO"}
+
+
+class TickerExtractor:
+    """
+    Finds the symbols an article mentions using a ticker/company-name dictionary.
+
+    Company names and aliases are matched case-sensitively as whole words
+    ('Apple' but not 'apple pie'). Tickers count when written explicitly
+    ($AAPL, (NASDAQ: AAPL)) or, for unambiguous symbols of three letters
+    or more, as a bare upper-case word.
+    """
+
+    def __init__(self, tickers_file=DEFAULT_TICKERS_FILE):
+        self.names = {}
+        self.alias_to_symbol = {}
+        with open(tickers_file, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                symbol = row["symbol"].strip().upper()
+                self.names[symbol] = row["name"].strip()
+                for alias in [row["name"]] + row.get("aliases", "").split("|"):
+                    alias = alias.strip()
+                    if alias:
+                        self.alias_to_symbol.setdefault(alias, symbol)
+        self.alias_matcher = KeywordMatcher(self.alias_to_symbol, ignore_case=False)
+
+    def extract(self, *texts):
+        """
+        Return the sorted symbols mentioned in any of the given texts
+
+        Args:
+            texts (str): Title, summary, body, ...
+
+        Returns:
+            list: Known ticker symbols
+        """
+        symbols = set()
+        for text in texts:
+            if not text:
+                continue
+            for alias, _, _ in self.alias_matcher.finditer(text):
+                symbols.add(self.alias_to_symbol[alias])
+            for match in EXPLICIT_TICKER_PATTERN.finditer(text):
+                symbol = (match.group(1) or match.group(2)).replace(".", "-")
+                if symbol in self.names:
+                    symbols.add(symbol)
+            for match in BARE_TICKER_PATTERN.finditer(text):
+                symbol = match.group(0)
+                if symbol in self.names and symbol not in BARE_TICKER_STOPLIST:
+                    symbols.add(symbol)
+        return sorted(symbols)
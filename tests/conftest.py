@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Module-level stores open their files at import, so point them at a scratch directory first
+_CACHE_ROOT = tempfile.mkdtemp(prefix="stockify-tests-")
+os.environ.setdefault("STOCKIFY_CACHE_DIR", os.path.join(_CACHE_ROOT, "ohlcv"))
+os.environ.setdefault("STOCKIFY_INDICATOR_DIR", os.path.join(_CACHE_ROOT, "indicators"))
+os.environ.setdefault("STOCKIFY_LLM_CACHE_DIR", os.path.join(_CACHE_ROOT, "llm"))
+os.environ.setdefault("STOCKIFY_NEWS_DB", os.path.join(_CACHE_ROOT, "news.sqlite3"))
+os.environ.setdefault("STOCKIFY_JOBS_DB", os.path.join(_CACHE_ROOT, "report_jobs.sqlite3"))
+os.environ.setdefault("STOCKIFY_NEWS_POLL_INTERVAL", "0")
+os.environ.setdefault("STOCKIFY_WARMUP", "0")
+
+
+@pytest.fixture
+def provider():
+    """Swap in a recording fake market-data provider for one test"""
+    from core.market_data import set_provider
+    from tests.fakes import FakeProvider
+
+    fake = FakeProvider()
+    previous = set_provider(fake)
+    yield fake
+    set_provider(previous)
+
+
+@pytest.fixture
+def client():
+    """TestClient for the API with the lifespan (job resume, poller) running"""
+    from fastapi.testclient import TestClient
+
+    import app_final
+
+    with TestClient(app_final.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def agents(monkeypatch, provider):
+    """Replace the Gemini agents with FakeAgents, start from empty response caches and lift the rate budget"""
+    from core.memo import SingleFlightCache
+    from Report import report
+    from Report.llm_cache import LLMResponseCache
+    from Report.llm_scheduler import TokenBucket, llm_scheduler
+    from tests.fakes import FakeAgent
+
+    fakes = {}
+    for name in ("market_analyst", "company_researcher", "stock_strategist", "team_lead"):
+        fakes[name] = FakeAgent(name)
+        monkeypatch.setattr(getattr(report, name), "_agent", fakes[name])
+    monkeypatch.setattr(report, "llm_cache", LLMResponseCache(cache_dir=None))
+    # Fake calls should not wait on the real per-minute budget
+    monkeypatch.setattr(llm_scheduler, "requests", TokenBucket(None))
+    monkeypatch.setattr(llm_scheduler, "tokens", TokenBucket(None))
+    monkeypatch.setattr(report, "symbol_cache", SingleFlightCache(ttl=report.DEFAULT_LLM_CACHE_TTL, retry_on=report.symbol_cache.retry_on))
+    return fakes
@@ -0,0 +1,65 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from core.market_data import MarketDataProvider
+
+
+def synthetic_bars(periods=30, end="2025-01-03", base=100.0):
+    index = pd.bdate_range(end=end, periods=periods, name="Date")
+    close = base + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        "Adj Close": close,
+        "Close": close,
+        "High": close + 1,
+        "Low": close - 1,
+        "Open": close,
+        "Volume": np.full(periods, 1_000_000.0),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    }, index=index)
+
+
+class FakeProvider(MarketDataProvider):
+    """Provider answering from synthetic bars and recording every upstream call"""
+
+    def __init__(self, batch_window=0.001, **kwargs):
+        super().__init__(batch_window=batch_window, **kwargs)
+        self.downloads = []
+
+    def _download(self, tickers, **options):
+        self.downloads.append((tickers, options))
+        if isinstance(tickers, str):
+            return synthetic_bars()
+        frames = {ticker: synthetic_bars(base=100.0 + i) for i, ticker in enumerate(tickers)}
+        if options.get("group_by") == "ticker":
+            return pd.concat(frames, axis=1)
+        return pd.concat(frames, axis=1).swaplevel(axis=1)
+
+    def _fetch_infos(self, symbols):
+        return {symbol: {"longName": f"{symbol} Corp", "sector": "Technology"} for symbol in symbols}
+
+    def _fetch_news(self, symbol):
+        return [{"title": f"{symbol} live headline"}]
+
+
+class FakeAgent:
+    """Agent stand-in that records prompts and answers, or raises error, after an optional delay"""
+
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.prompts = []
+
+    def run(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        text = f"{self.name} analysis of {len(prompt)} characters"
+        if stream:
+            return iter([SimpleNamespace(content=text)])
+        return SimpleNamespace(content=text, metrics=None)
@@ -0,0 +1,112 @@
+import io
+import threading
+
+import pytest
+import pyarrow.parquet as pq
+
+
+def test_generate_report_uses_the_report_module_function(client, monkeypatch):
+    # The endpoint imports the pipeline lazily, so the patch point is Report.report
+    monkeypatch.setattr("Report.report.get_final_investment_report", lambda symbols: f"Report for {symbols}")
+
+    response = client.post("/generate_report", json={"symbols": ["aapl"]})
+
+    assert response.status_code == 200
+    assert response.json()["report"] == "Report for ['AAPL']"
+
+
+def test_generate_report_rejects_empty_symbols(client):
+    response = client.post("/generate_report", json={"symbols": [" "]})
+
+    assert response.status_code == 400
+
+
+def test_health(client):
+    assert client.get("/health").json() == {"status": "healthy"}
+
+
+def test_closing_the_sse_stream_closes_the_report_stream():
+    import app_final
+
+    closed = []
+
+    def chunks():
+        try:
+            yield "# Report"
+            yield "more"
+        finally:
+            closed.append(True)
+
+    events = app_final.sse_events(chunks())
+    assert next(events).startswith("event: chunk")
+    events.close()
+
+    assert closed == [True]
+
+
+def test_parquet_export_without_bars_still_has_columns(client, provider):
+    response = client.post(
+        "/data/export", json={"stocks": ["AAPL"], "start": "2030-01-01", "columns": ["Close"], "format": "parquet"}
+    )
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert response.status_code == 200
+    assert table.num_rows == 0
+    assert table.schema.names == ["Ticker", "Date", "Close"]
+
+
+def test_rate_limited_report_returns_429(client, agents, monkeypatch):
+    from google.api_core.exceptions import ResourceExhausted
+
+    from Report.llm_scheduler import llm_scheduler
+
+    monkeypatch.setattr(llm_scheduler, "max_retries", 0)
+    agents["market_analyst"].error = ResourceExhausted("Quota exceeded for generate_content")
+
+    response = client.post("/generate_report", json={"symbols": ["AAPL"]})
+
+    assert response.status_code == 429
+    assert "Rate limited after 1 attempts" in response.json()["detail"]
+
+
+def test_other_report_failures_are_not_429(client, monkeypatch):
+    def fail(symbols):
+        raise RuntimeError("Rate limited by nothing in particular")
+
+    monkeypatch.setattr("Report.report.get_final_investment_report", fail)
+
+    assert client.post("/generate_report", json={"symbols": ["AAPL"]}).status_code == 500
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    """Replace an app pool with a one-slot pool that is busy until the test ends"""
+    import app_final
+    from core.executors import BoundedExecutor
+
+    release = threading.Event()
+
+    def saturate(name):
+        pool = BoundedExecutor(name, max_workers=1, max_queue=0)
+        pool.submit(release.wait, 5)
+        monkeypatch.setattr(app_final, name, pool)
+
+    yield saturate
+    release.set()
+
+
+@pytest.mark.parametrize("pool, method, path, body", [
+    ("scraping_pool", "get", "/news/search?q=stocks", None),
+    ("scraping_pool", "post", "/update-news", {"since": 0}),
+    ("scraping_pool", "get", "/news/export", None),
+    ("pipeline_pool", "post", "/reports", {"symbols": ["AAPL"]}),
+    ("pipeline_pool", "get", "/reports/unknown", None),
+    ("market_data_pool", "post", "/data/export", {"stocks": ["AAPL"]}),
+])
+def test_blocking_store_and_export_calls_report_saturated_pools(client, saturated, pool, method, path, body):
+    saturated(pool)
+
+    response = client.request(method, path, json=body)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
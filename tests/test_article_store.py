@@ -0,0 +1,71 @@
+import time
+import sqlite3
+
+import pytest
+
+from news.store import ArticleStore
+from news.tickers import TickerExtractor
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArticleStore(str(tmp_path / "news.sqlite3"))
+
+
+def article(title, symbols=(), **fields):
+    return dict({"title": title, "url": f"https://finance.yahoo.com/news/{title.replace(' ', '-')}", "summary": ""},
+                symbols=list(symbols), **fields)
+
+
+def age(store, article_id, seconds):
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("UPDATE articles SET inserted_at = ? WHERE id = ?", (time.time() - seconds, article_id))
+
+
+def test_by_symbols_skips_articles_older_than_start(store):
+    old, new = store.add([article("Apple old news", ["AAPL"]), article("Apple new news", ["AAPL"])])
+    age(store, old["id"], 3 * 86400)
+
+    assert [a["id"] for a in store.by_symbols(["AAPL"])] == [new["id"], old["id"]]
+    assert [a["id"] for a in store.by_symbols(["AAPL"], start=time.time() - 86400)] == [new["id"]]
+
+
+def test_update_contents_reindexes_symbols_found_in_bodies(store):
+    (stored,) = store.add([article("Chipmakers rally on earnings", ["XYZ"])])
+    stored["body"] = "Shares of Nvidia (NASDAQ: NVDA) rose after the results."
+
+    store.update_contents([stored], extract_symbols=TickerExtractor().extract)
+
+    assert stored["symbols"] == ["NVDA"]
+    assert [a["id"] for a in store.by_symbols(["NVDA"])] == [stored["id"]]
+    assert store.by_symbols(["XYZ"]) == []
+    assert store.get_many([stored["id"]])[0]["symbols"] == ["NVDA"]
+
+
+def test_update_contents_keeps_symbols_without_extractor(store):
+    (stored,) = store.add([article("Apple earnings", ["AAPL"])])
+    stored["body"] = "Microsoft (NASDAQ: MSFT) also reported."
+
+    store.update_contents([stored])
+
+    assert [a["id"] for a in store.by_symbols(["AAPL"])] == [stored["id"]]
+    assert store.by_symbols(["MSFT"]) == []
+
+
+def test_company_news_prefers_recent_indexed_articles(monkeypatch, provider, store):
+    from Report import report
+
+    monkeypatch.setattr(report, "article_store", store)
+    store.add([article("Apple unveils new chips", ["AAPL"])])
+
+    assert report.get_company_news("AAPL") == [{"title": "Apple unveils new chips", "symbol": "AAPL"}]
+
+
+def test_company_news_fetches_live_when_indexed_articles_are_stale(monkeypatch, agents, store):
+    from Report import report
+
+    monkeypatch.setattr(report, "article_store", store)
+    (stale,) = store.add([article("Apple unveils new chips", ["AAPL"])])
+    age(store, stale["id"], report.REPORT_NEWS_MAX_AGE + 60)
+
+    assert report.get_company_news("AAPL") == [{"title": "AAPL live headline", "symbol": "AAPL"}]
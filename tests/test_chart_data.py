@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def weekly_bars(client, provider):
+    """Weekly Open and Volume for AAPL over two full weeks of the fake history"""
+    return client.post("/data", json={
+        "stock": "AAPL", "start": "2024-12-09", "end": "2024-12-20", "interval": "1wk", "columns": ["Open", "Volume"],
+    })
+
+
+def test_weekly_bars_without_close_are_resampled(weekly_bars):
+    assert weekly_bars.status_code == 200
+    rows = weekly_bars.json()
+    assert [row["Date"][:10] for row in rows] == ["2024-12-20", "2024-12-13"]
+    assert all(set(row) == {"Date", "Open", "Volume"} for row in rows)
+    # Five daily bars of 1M shares each
+    assert [row["Volume"] for row in rows] == [5_000_000.0, 5_000_000.0]
+    # Each week opens at its Monday bar, five bars after the previous one
+    assert rows[0]["Open"] - rows[1]["Open"] == 5
+
+
+def test_monthly_bars_with_requested_columns_only(client, provider):
+    response = client.post("/data", json={"stock": "AAPL", "interval": "1mo", "columns": ["High", "Low"]})
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert [row["Date"][:10] for row in rows] == ["2025-01-31", "2024-12-31", "2024-11-30"]
+    assert all(row["High"] - row["Low"] >= 2 for row in rows)
+
+
+def test_daily_bars_respect_start_and_end(client, provider):
+    response = client.post("/data", json={
+        "stock": "AAPL", "start": "2024-12-30", "end": "2025-01-02", "columns": ["Close"],
+    })
+
+    assert response.status_code == 200
+    assert [row["Date"][:10] for row in response.json()] == ["2025-01-02", "2025-01-01", "2024-12-31", "2024-12-30"]
+
+
+def test_batch_weekly_bars_without_close(client, provider):
+    response = client.post("/data/batch", json={
+        "stocks": [{"stock": "AAPL", "start": "2024-12-09"}, {"stock": "MSFT", "end": "2024-12-20"}],
+        "interval": "1wk",
+        "columns": ["High"],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "Close" not in json.dumps(body)
+    assert "High" in json.dumps(body)
+
+
+def test_export_weekly_bars_without_close(client, provider):
+    response = client.post("/data/export", json={
+        "stocks": ["AAPL"], "start": "2024-12-09", "end": "2024-12-20", "interval": "1wk", "columns": ["Volume"],
+    })
+
+    rows = [json.loads(line) for line in response.content.splitlines()]
+    assert response.status_code == 200
+    assert [row["Volume"] for row in rows] == [5_000_000.0, 5_000_000.0]
+    assert all(set(row) == {"Ticker", "Date", "Volume"} for row in rows)
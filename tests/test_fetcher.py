@@ -0,0 +1,144 @@
+import time
+import asyncio
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from news.fetcher import AsyncPageFetcher
+
+
+class PageServer(ThreadingHTTPServer):
+    """Local site whose paths choose the response, recording requests and peak concurrency per host"""
+
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), PageHandler)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.in_flight = Counter()
+        self.peak = Counter()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        host = self.headers["Host"].split(":")[0]
+        with server.lock:
+            server.requests[self.path] += 1
+            attempt = server.requests[self.path]
+            server.in_flight[host] += 1
+            server.in_flight["all"] += 1
+            server.peak[host] = max(server.peak[host], server.in_flight[host])
+            server.peak["all"] = max(server.peak["all"], server.in_flight["all"])
+        try:
+            kind = self.path.split("/")[1]
+            if kind == "slow":
+                time.sleep(0.1)
+                self.reply(200, self.path)
+            elif kind == "hang":
+                time.sleep(1.0)
+                self.reply(200, "too late")
+            elif kind == "status":
+                self.reply(int(self.path.split("/")[2]), "error")
+            elif kind == "flaky":
+                self.reply(503 if attempt == 1 else 200, "recovered")
+            else:
+                self.reply(404, "unknown")
+        finally:
+            with server.lock:
+                server.in_flight[host] -= 1
+                server.in_flight["all"] -= 1
+
+    def reply(self, status, body):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    page_server = PageServer()
+    thread = threading.Thread(target=page_server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield page_server
+    page_server.shutdown()
+    page_server.server_close()
+
+
+def fetch(fetcher, urls):
+    async def collect():
+        return {url: content async for url, content in fetcher.fetch_all(urls)}
+
+    return asyncio.run(collect())
+
+
+def test_requests_in_flight_never_exceed_the_concurrency_cap(server):
+    urls = [f"http://127.0.0.1:{server.port}/slow/{i}" for i in range(12)]
+
+    results = fetch(AsyncPageFetcher(concurrency=3, per_host=10), urls)
+
+    assert results == {url: url.split(str(server.port))[1].encode() for url in urls}
+    assert server.peak["all"] == 3
+
+
+def test_requests_in_flight_per_host_are_capped(server):
+    urls = [f"http://{host}:{server.port}/slow/{i}" for host in ("127.0.0.1", "localhost") for i in range(6)]
+
+    results = fetch(AsyncPageFetcher(concurrency=8, per_host=2), urls)
+
+    assert all(results.values())
+    assert server.peak["127.0.0.1"] == 2
+    assert server.peak["localhost"] == 2
+
+
+def test_duplicate_urls_are_fetched_once(server):
+    url = f"http://127.0.0.1:{server.port}/slow/1"
+
+    assert list(fetch(AsyncPageFetcher(), [url, url, url])) == [url]
+    assert server.requests["/slow/1"] == 1
+
+
+def test_timeouts_are_retried_then_reported_as_failures(server):
+    url = f"http://127.0.0.1:{server.port}/hang/1"
+    started = time.monotonic()
+
+    results = fetch(AsyncPageFetcher(timeout=0.2, retries=1, backoff=0.01), [url])
+
+    assert results == {url: None}
+    assert server.requests["/hang/1"] == 2
+    # Both attempts were cut off by the timeout rather than waiting for the slow response
+    assert time.monotonic() - started < 1.0
+
+
+def test_client_errors_fail_without_retrying(server):
+    url = f"http://127.0.0.1:{server.port}/status/404"
+
+    assert fetch(AsyncPageFetcher(retries=2, backoff=0.01), [url]) == {url: None}
+    assert server.requests["/status/404"] == 1
+
+
+def test_server_errors_are_retried_until_they_succeed_or_run_out(server):
+    flaky = f"http://127.0.0.1:{server.port}/flaky/1"
+    down = f"http://127.0.0.1:{server.port}/status/503"
+
+    results = fetch(AsyncPageFetcher(retries=2, backoff=0.01), [flaky, down])
+
+    assert results == {flaky: b"recovered", down: None}
+    assert server.requests["/flaky/1"] == 2
+    assert server.requests["/status/503"] == 3
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Graphs.indicators import INDICATOR_COLUMNS, IndicatorStore, compute_indicators
+
+
+def random_bars(periods=320, seed=7):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=periods, name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, periods)))
+    return pd.DataFrame({
+        "Close": close,
+        "High": close * (1 + rng.uniform(0, 0.02, periods)),
+        "Low": close * (1 - rng.uniform(0, 0.02, periods)),
+        "Volume": rng.integers(1_000_000, 5_000_000, periods).astype(float),
+    }, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return IndicatorStore(cache_dir=str(tmp_path))
+
+
+def assert_matches_full_computation(frame, bars):
+    expected, _ = compute_indicators(bars)
+    assert list(frame.columns) == INDICATOR_COLUMNS
+    pd.testing.assert_frame_equal(frame, expected, check_exact=False, rtol=1e-9, atol=1e-9)
+
+
+def test_appended_bars_are_computed_incrementally(store):
+    bars = random_bars()
+    store.get("AAPL", bars.iloc[:300])
+
+    frame = store.get("AAPL", bars)
+
+    assert store.stats == {"full": 1, "incremental": 1}
+    assert_matches_full_computation(frame, bars)
+
+
+def test_revised_last_bar_is_recomputed_incrementally(store):
+    bars = random_bars()
+    store.get("AAPL", bars)
+    revised = bars.copy()
+    revised.iloc[-1, revised.columns.get_loc("Close")] *= 1.05
+    revised.iloc[-1, revised.columns.get_loc("Volume")] += 250_000
+
+    frame = store.get("AAPL", revised)
+
+    assert store.stats == {"full": 1, "incremental": 1}
+    assert_matches_full_computation(frame, revised)
+
+
+def test_rewritten_history_forces_a_full_recompute(store):
+    bars = random_bars()
+    store.get("AAPL", bars.iloc[:300])
+    # A 2:1 split adjusts every past price
+    split = bars.copy()
+    split[["Close", "High", "Low"]] /= 2
+
+    frame = store.get("AAPL", split)
+
+    assert store.stats == {"full": 2, "incremental": 0}
+    assert_matches_full_computation(frame, split)
+
+
+def test_stored_indicators_survive_a_new_store(store):
+    bars = random_bars()
+    store.get("AAPL", bars.iloc[:300])
+
+    reopened = IndicatorStore(cache_dir=store.cache_dir)
+    frame = reopened.get("AAPL", bars)
+
+    assert reopened.stats == {"full": 0, "incremental": 1}
+    assert_matches_full_computation(frame, bars)
@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Report.jobs import DONE, QUEUED, RUNNING, JobStore, ReportJobManager
+
+
+class InlinePool:
+    """Runs submitted work synchronously and counts submissions"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+        fn(*args)
+
+
+def fake_report(symbols, progress=None):
+    return f"Report for {', '.join(symbols)}"
+
+
+def test_job_runs_to_done_under_its_owner(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    manager = ReportJobManager(store, InlinePool(), report_fn=fake_report, worker_id="w1")
+
+    job = store.get(manager.submit(["AAPL"]))
+
+    assert job["status"] == DONE
+    assert job["owner"] == "w1"
+    assert job["result"] == "Report for AAPL"
+
+
+def test_live_jobs_of_another_worker_are_not_resumed(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create(["AAPL"], owner="w1")
+    store.update(job_id, status=RUNNING)
+    pool = InlinePool()
+
+    resumed = ReportJobManager(store, pool, report_fn=fake_report, worker_id="w2", lease=60).resume_unfinished()
+
+    assert resumed == 0
+    assert store.get(job_id)["status"] == RUNNING
+
+
+def test_stale_job_is_claimed_by_exactly_one_worker(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path)
+    job_id = store.create(["AAPL"], owner="dead-worker")
+    store.update(job_id, status=RUNNING)
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time() - 120, job_id))
+
+    # Every worker boots at once and races for the orphaned job
+    barrier = threading.Barrier(8)
+
+    def boot(worker):
+        barrier.wait()
+        return JobStore(path).claim_stale(f"w{worker}", lease=60)
+
+    with ThreadPoolExecutor(8) as executor:
+        claims = [claim for claimed in executor.map(boot, range(8)) for claim in claimed]
+
+    assert len(claims) == 1
+    job = store.get(job_id)
+    assert job["owner"] == claims[0]["owner"]
+    assert job["status"] == QUEUED
+
+
+def test_worker_that_lost_its_lease_cannot_overwrite_the_job(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create(["AAPL"], owner="w1")
+    store.release(job_id, "w1")
+    assert store.claim_stale("w2")
+
+    assert not store.update(job_id, status=DONE, result="stale", owner="w1")
+    assert store.get(job_id)["status"] == QUEUED
+
+
+def test_heartbeat_renews_own_leases(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create(["AAPL"], owner="w1")
+    before = store.get(job_id)["heartbeat_at"]
+    time.sleep(0.01)
+
+    store.heartbeat("w1")
+
+    assert store.get(job_id)["heartbeat_at"] > before
+
+
+def test_jobs_do_not_use_the_interactive_llm_pool():
+    import app_final
+    from core.executors import llm_pool
+
+    assert app_final.job_manager.pool is not llm_pool
+
+
+def test_status_endpoint_hides_lease_fields(client):
+    import app_final
+
+    store = app_final.job_manager.store
+    job_id = store.create(["AAPL"], owner="w1")
+    store.update(job_id, status=DONE, result="Report for AAPL")
+
+    job = client.get(f"/reports/{job_id}").json()
+
+    assert job == {
+        "job_id": job_id,
+        "status": DONE,
+        "progress": store.get(job_id)["stages"],
+        "result": "Report for AAPL",
+        "error": None,
+    }
+    assert client.get("/reports/missing").status_code == 404
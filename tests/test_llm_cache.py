@@ -0,0 +1,62 @@
+import os
+import time
+from types import SimpleNamespace
+
+from Report.llm_cache import LLMResponseCache, agent_cache_key
+
+AGENT = SimpleNamespace(model=SimpleNamespace(id="fake-model"), description="Test agent", instructions=None)
+
+
+def files(cache):
+    return sorted(name for name in os.listdir(cache.cache_dir))
+
+
+def backdate(cache, prompt, seconds, read_seconds=None):
+    path = cache._path(agent_cache_key(AGENT, prompt))
+    now = time.time()
+    os.utime(path, (now - (read_seconds if read_seconds is not None else seconds), now - seconds))
+
+
+def test_expired_files_are_deleted_at_startup(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl=60)
+    cache.set(AGENT, "old prompt", "old answer")
+    cache.set(AGENT, "new prompt", "new answer")
+    backdate(cache, "old prompt", 120)
+    (tmp_path / "crashed.tmp").write_text("{")
+    os.utime(tmp_path / "crashed.tmp", (time.time() - 120, time.time() - 120))
+
+    reopened = LLMResponseCache(cache_dir=str(tmp_path), ttl=60)
+
+    assert files(reopened) == [f"{agent_cache_key(AGENT, 'new prompt')}.json"]
+    assert reopened.get(AGENT, "new prompt") == "new answer"
+    assert reopened.stats["pruned"] == 2
+
+
+def test_writes_over_the_size_cap_evict_the_least_recently_read(tmp_path):
+    answer = "x" * 1000
+    cache = LLMResponseCache(cache_dir=str(tmp_path), max_entries=0, max_disk_bytes=2500)
+    cache.set(AGENT, "first", answer)
+    cache.set(AGENT, "second", answer)
+    # Written first but read last, so "second" is the least recently used
+    backdate(cache, "first", 30, read_seconds=1)
+    backdate(cache, "second", 20)
+
+    cache.set(AGENT, "third", answer)
+
+    assert cache.get(AGENT, "second") is None
+    assert cache.get(AGENT, "first") == answer
+    assert cache.get(AGENT, "third") == answer
+    assert len(files(cache)) == 2
+
+
+def test_disk_hits_refresh_recency_but_not_expiry(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), max_entries=0)
+    cache.set(AGENT, "prompt", "answer")
+    backdate(cache, "prompt", 50)
+    path = cache._path(agent_cache_key(AGENT, "prompt"))
+    written_at = os.stat(path).st_mtime
+
+    assert cache.get(AGENT, "prompt") == "answer"
+
+    assert os.stat(path).st_mtime == written_at
+    assert os.stat(path).st_atime > written_at + 40
@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+
+import pytest
+from google.api_core.exceptions import ResourceExhausted
+
+from core.pipeline import Deadline, DeadlineExceeded, current_deadline
+from Report import llm_scheduler as scheduler_module
+from Report.llm_scheduler import LLMScheduler, RateLimited, TokenBucket, is_rate_limit_error
+
+
+class ThrottlingClient:
+    """Model client answering with the given errors first, then "ok", counting calls"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def generate(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class StatusError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting"""
+    recorded = []
+    monkeypatch.setattr(scheduler_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_rate_limits_are_recognised_by_type_and_status_code():
+    response_error = RuntimeError("HTTP error")
+    response_error.response = SimpleNamespace(status_code=429)
+    wrapped = RuntimeError("agent run failed")
+    wrapped.__cause__ = ResourceExhausted("quota")
+
+    assert is_rate_limit_error(ResourceExhausted("quota"))
+    assert is_rate_limit_error(StatusError("slow down", 429))
+    assert is_rate_limit_error(response_error)
+    assert is_rate_limit_error(wrapped)
+
+
+def test_messages_mentioning_429_are_not_rate_limits():
+    assert not is_rate_limit_error(ValueError("Invoice 4291 rejected"))
+    assert not is_rate_limit_error(StatusError("Rate limited upstream 429", 500))
+    assert not is_rate_limit_error(DeadlineExceeded("Rate limited with no time left before the request deadline"))
+
+
+def test_throttled_calls_back_off_exponentially_then_succeed(sleeps):
+    scheduler = LLMScheduler(requests_per_minute=None, tokens_per_minute=None, max_retries=4, base_delay=1.0)
+    client = ThrottlingClient(ResourceExhausted("quota"), ResourceExhausted("quota"), StatusError("slow down", 429))
+
+    assert scheduler.call(client.generate) == "ok"
+
+    assert client.calls == 4
+    assert scheduler.stats["throttled"] == 3 and scheduler.stats["retries"] == 3
+    for attempt, delay in enumerate(sleeps):
+        assert 2 ** attempt / 2 <= delay <= 2 ** attempt
+
+
+def test_other_errors_are_not_retried(sleeps):
+    scheduler = LLMScheduler(requests_per_minute=None, tokens_per_minute=None)
+    client = ThrottlingClient(ValueError("HTTP 429 in an unrelated payload"))
+
+    with pytest.raises(ValueError):
+        scheduler.call(client.generate)
+
+    assert client.calls == 1
+    assert sleeps == []
+
+
+def test_calls_still_throttled_after_every_retry_raise(sleeps):
+    scheduler = LLMScheduler(requests_per_minute=None, tokens_per_minute=None, max_retries=2)
+    client = ThrottlingClient(*[ResourceExhausted("quota")] * 3)
+
+    with pytest.raises(RateLimited):
+        scheduler.call(client.generate)
+
+    assert client.calls == 3
+    assert len(sleeps) == 2
+
+
+def test_backoff_longer_than_the_deadline_gives_up(sleeps):
+    scheduler = LLMScheduler(requests_per_minute=None, tokens_per_minute=None, base_delay=10.0)
+    client = ThrottlingClient(ResourceExhausted("quota"))
+
+    token = current_deadline.set(Deadline(1.0))
+    try:
+        with pytest.raises(DeadlineExceeded):
+            scheduler.call(client.generate)
+    finally:
+        current_deadline.reset(token)
+
+    assert sleeps == []
+
+
+def test_token_bucket_refills_at_its_rate():
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])
+
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    now[0] += 0.5
+    assert bucket.wait_time(1) == pytest.approx(0.5)
+    now[0] += 120
+    assert bucket.wait_time(60) == 0.0
+    # Requests larger than the bucket only wait for a full bucket
+    assert bucket.wait_time(1000) == 0.0
+
+
+def test_scheduler_waits_for_the_request_budget():
+    scheduler = LLMScheduler(requests_per_minute=600, tokens_per_minute=None)
+    scheduler.requests.tokens = 0
+
+    assert scheduler.call(lambda: "ok") == "ok"
+
+    # 600 per minute refills one request every 0.1s
+    assert 0.05 <= scheduler.stats["wait_seconds_max"] < 1.0
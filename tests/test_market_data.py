@@ -0,0 +1,132 @@
+import time
+import threading
+
+import pytest
+
+from core.market_data import MarketDataProvider
+from core.memo import MicroBatcher
+from tests.fakes import FakeProvider, synthetic_bars
+
+
+class GatedProvider(FakeProvider):
+    """FakeProvider whose upstream calls wait for the test to open the gate"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.gate = threading.Event()
+        self.info_batches = []
+        self.failing = {}
+
+    def _download(self, tickers, **options):
+        self.gate.wait(5)
+        return super()._download(tickers, **options)
+
+    def _fetch_infos(self, symbols):
+        self.info_batches.append(sorted(symbols))
+        if "BOOM" in symbols:
+            raise ConnectionError("upstream down")
+        infos = super()._fetch_infos(symbols)
+        infos.update({symbol: error for symbol, error in self.failing.items() if symbol in infos})
+        return infos
+
+
+def run_concurrently(fn, args_list):
+    results = [None] * len(args_list)
+
+    def call(i, args):
+        try:
+            results[i] = fn(*args)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i, args)) for i, args in enumerate(args_list)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_provider_interface_is_abstract():
+    class Incomplete(MarketDataProvider):
+        def _download(self, tickers, **options):
+            return synthetic_bars()
+
+    with pytest.raises(TypeError):
+        MarketDataProvider()
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_identical_downloads_in_flight_share_one_call():
+    provider = GatedProvider()
+    threads, results = run_concurrently(provider.download, [("AAPL",)] * 5 + [("MSFT",)])
+    while provider.stats["coalesced"] < 4:
+        time.sleep(0.001)
+
+    provider.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(tickers for tickers, _ in provider.downloads) == ["AAPL", "MSFT"]
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] is not results[0]
+
+
+def test_finished_downloads_are_not_reused():
+    provider = GatedProvider()
+    provider.gate.set()
+
+    provider.download("AAPL", period="max")
+    provider.download("AAPL", period="max")
+
+    assert len(provider.downloads) == 2
+
+
+def test_info_lookups_within_the_window_are_batched():
+    provider = GatedProvider(batch_window=0.05)
+    threads, results = run_concurrently(provider.get_info, [("AAPL",), ("MSFT",), ("NVDA",), ("AAPL",)])
+    for thread in threads:
+        thread.join(5)
+
+    assert provider.info_batches == [["AAPL", "MSFT", "NVDA"]]
+    assert [info["longName"] for info in results] == ["AAPL Corp", "MSFT Corp", "NVDA Corp", "AAPL Corp"]
+
+
+def test_full_batches_are_flushed_without_waiting():
+    provider = GatedProvider(batch_window=5, batch_size=2)
+    threads, results = run_concurrently(provider.get_info, [("AAPL",), ("MSFT",)])
+    for thread in threads:
+        thread.join(1)
+
+    assert provider.info_batches == [["AAPL", "MSFT"]]
+    assert all(isinstance(result, dict) for result in results)
+
+
+def test_per_symbol_errors_only_fail_their_callers():
+    provider = GatedProvider(batch_window=0.05)
+    provider.failing["MSFT"] = LookupError("No profile for MSFT")
+    threads, results = run_concurrently(provider.get_info, [("AAPL",), ("MSFT",)])
+    for thread in threads:
+        thread.join(5)
+
+    assert results[0]["longName"] == "AAPL Corp"
+    assert isinstance(results[1], LookupError)
+
+
+def test_a_failed_batch_fails_every_caller():
+    provider = GatedProvider(batch_window=0.05)
+    threads, results = run_concurrently(provider.get_info, [("AAPL",), ("BOOM",)])
+    for thread in threads:
+        thread.join(5)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_batcher_reports_keys_missing_from_the_result():
+    batcher = MicroBatcher(lambda keys: {"AAPL": 1}, window=0.01)
+
+    found, missing = batcher.submit("AAPL"), batcher.submit("MSFT")
+
+    assert found.result(1) == 1
+    with pytest.raises(LookupError):
+        missing.result(1)
+    assert batcher.stats == {"batches": 1, "keys": 2, "submitted": 2}
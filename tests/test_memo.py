@@ -0,0 +1,77 @@
+import time
+import threading
+
+import pytest
+
+from core.memo import SingleFlightCache
+from core.pipeline import DeadlineExceeded
+
+
+def run_leader_and_follower(cache, leader_compute):
+    """Start a leader on key "k", then a follower for the same key while the leader is computing"""
+    started = threading.Event()
+    release = threading.Event()
+    results = {}
+
+    def leader():
+        def compute():
+            started.set()
+            release.wait(5)
+            return leader_compute()
+        try:
+            results["leader"] = cache.get_or_compute("k", compute)
+        except Exception as e:
+            results["leader"] = e
+
+    def follower():
+        try:
+            results["follower"] = cache.get_or_compute("k", lambda: "follower value")
+        except Exception as e:
+            results["follower"] = e
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    assert started.wait(5)
+    follower_thread = threading.Thread(target=follower)
+    follower_thread.start()
+    while cache.stats["coalesced"] == 0:
+        time.sleep(0.001)
+    release.set()
+    leader_thread.join(5)
+    follower_thread.join(5)
+    return results
+
+
+def test_followers_share_the_leader_result():
+    cache = SingleFlightCache(ttl=60)
+
+    results = run_leader_and_follower(cache, lambda: "leader value")
+
+    assert results == {"leader": "leader value", "follower": "leader value"}
+    assert cache.stats["misses"] == 1
+
+
+def test_followers_share_ordinary_errors():
+    cache = SingleFlightCache(ttl=60, retry_on=(DeadlineExceeded,))
+
+    def fail():
+        raise ValueError("upstream down")
+
+    results = run_leader_and_follower(cache, fail)
+
+    assert isinstance(results["leader"], ValueError)
+    assert results["follower"] is results["leader"]
+
+
+def test_followers_retry_when_the_leader_runs_out_of_time():
+    cache = SingleFlightCache(ttl=60, retry_on=(DeadlineExceeded,))
+
+    def expire():
+        raise DeadlineExceeded("Request deadline of 1s exceeded")
+
+    results = run_leader_and_follower(cache, expire)
+
+    assert isinstance(results["leader"], DeadlineExceeded)
+    assert results["follower"] == "follower value"
+    assert cache.stats["retried"] == 1
+    assert cache.get_or_compute("k", pytest.fail) == "follower value"
@@ -0,0 +1,70 @@
+import re
+import threading
+
+from core.metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry
+
+SAMPLE = re.compile(r'^(\w+)(?:\{(.*)\})? (\S+)$')
+
+
+def parse(text):
+    """Exposition text as {(name, ((label, value), ...)): value}, plus the declared types"""
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            types[name] = kind
+        elif line and not line.startswith("#"):
+            name, labels, value = SAMPLE.match(line).groups()
+            pairs = tuple(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', labels or ""))
+            samples[(name, pairs)] = float(value)
+    return samples, types
+
+
+def test_counter_and_histogram_exposition():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests", ["route"])
+    latency = registry.histogram("test_latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, route="/a")
+    samples, types = parse(registry.render())
+
+    assert types == {"test_requests_total": "counter", "test_latency_seconds": "histogram"}
+    assert samples[("test_requests_total", (("route", '/a\\"b'),))] == 3
+    assert samples[("test_latency_seconds_bucket", (("route", "/a"), ("le", "0.1")))] == 1
+    assert samples[("test_latency_seconds_bucket", (("route", "/a"), ("le", "1")))] == 2
+    assert samples[("test_latency_seconds_bucket", (("route", "/a"), ("le", "+Inf")))] == 3
+    assert samples[("test_latency_seconds_count", (("route", "/a"),))] == 3
+    assert samples[("test_latency_seconds_sum", (("route", "/a"),))] == 5.55
+
+
+def test_metrics_endpoint_reports_requests_and_pools(client, provider):
+    from core.executors import pipeline_pool
+
+    def ohlcv_lookups(samples):
+        return sum(value for (name, labels), value in samples.items()
+                   if name == "stockify_cache_requests_total" and ("cache", "ohlcv") in labels)
+
+    before, _ = parse(client.get("/metrics").text)
+    assert client.post("/data", json={"stock": "AAPL"}).status_code == 200
+    release = threading.Event()
+    pipeline_pool.submit(release.wait, 5)
+    try:
+        response = client.get("/metrics")
+    finally:
+        release.set()
+    samples, types = parse(response.text)
+
+    assert response.headers["content-type"] == PROMETHEUS_CONTENT_TYPE
+    route = (("method", "POST"), ("route", "/data"), ("status", "200"))
+    assert types["stockify_http_request_duration_seconds"] == "histogram"
+    assert samples[("stockify_http_request_duration_seconds_count", route)] >= 1
+    assert samples[("stockify_http_request_duration_seconds_bucket", route + (("le", "+Inf"),))] >= 1
+    assert types["stockify_market_data_duration_seconds"] == "histogram"
+    assert types["stockify_cache_requests_total"] == "counter"
+    assert ohlcv_lookups(samples) == ohlcv_lookups(before) + 1
+    assert types["stockify_pool_pending"] == "gauge"
+    assert samples[("stockify_pool_pending", (("pool", "pipeline"),))] == 1
+    assert samples[("stockify_pool_max_workers", (("pool", "market-data"),))] == 8
@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.bench_news_parsing import SAVED_PAGE, legacy_extract
+from news.parsing import available_backends, parse_story_items
+
+
+@pytest.fixture(scope="module")
+def saved_page():
+    with open(SAVED_PAGE, "rb") as f:
+        return f.read()
+
+
+def test_every_backend_extracts_the_same_items(saved_page):
+    results = {backend: parse_story_items(saved_page, backend) for backend in available_backends()}
+
+    expected = results.pop("html.parser")
+    assert expected
+    for backend, items in results.items():
+        assert items == expected, backend
+
+
+def test_saved_page_items_match_the_legacy_extraction(saved_page):
+    items = parse_story_items(saved_page, "html.parser")
+
+    # Ad slots in the stream are not story items
+    assert [item["title"] for item in items] == legacy_extract(saved_page)
+    assert all(item["href"] and item["publishing"] for item in items)
+    assert any(item["summary"] == "" for item in items)
+    assert any(item["image"] is None for item in items)
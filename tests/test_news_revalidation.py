@@ -0,0 +1,125 @@
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.memo import SingleFlightCache
+from news.news import YahooFinanceStockNewsScraper
+
+TOPIC_PAGE = b"""<html><body><ul>
+<li class="stream-item story-item">
+  <a class="subtle-link fin-size-small titles" href="/news/nvidia-stock-rallies.html">
+    <h3 class="clamp">Nvidia stock rallies after earnings</h3><p class="clamp">Shares jumped.</p>
+  </a>
+  <div class="publishing">Reuters \xe2\x80\xa2 2 hours ago</div>
+</li>
+</ul></body></html>"""
+
+ETAG = '"topic-v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 12:00:00 GMT"
+
+
+class TopicServer(ThreadingHTTPServer):
+    """Topic page with validators, answering 304 to a matching If-None-Match and recording request headers"""
+
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, delay=0.0):
+        super().__init__(("127.0.0.1", 0), TopicHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/topic/stock-market-news/"
+
+
+class TopicHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(dict(self.headers))
+        time.sleep(self.server.delay)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(TOPIC_PAGE)))
+        self.end_headers()
+        self.wfile.write(TOPIC_PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(delay=0.0):
+    server = TopicServer(delay)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def server():
+    topic_server = serve()
+    yield topic_server
+    topic_server.shutdown()
+    topic_server.server_close()
+
+
+@pytest.fixture
+def scraper():
+    news_scraper = YahooFinanceStockNewsScraper()
+    # Revalidate on every fetch instead of serving from the TTL cache
+    news_scraper.page_cache = SingleFlightCache(ttl=0)
+    news_scraper.parses = []
+    parse = news_scraper._parse_story_items
+
+    def counting_parse(content):
+        news_scraper.parses.append(content)
+        return parse(content)
+
+    news_scraper._parse_story_items = counting_parse
+    return news_scraper
+
+
+def test_not_modified_page_reuses_the_cached_parse(server, scraper):
+    first = scraper.parse_story_items_cached(scraper.fetch_page(server.url))
+    second = scraper.parse_story_items_cached(scraper.fetch_page(server.url))
+
+    assert len(server.requests) == 2
+    assert second == first
+    assert [item["title"] for item in first] == ["Nvidia stock rallies after earnings"]
+    assert len(scraper.parses) == 1
+
+
+def test_stored_validators_are_sent_back(server, scraper):
+    scraper.fetch_page(server.url)
+    scraper.fetch_page(server.url)
+
+    first, second = server.requests
+    assert "If-None-Match" not in first and "If-Modified-Since" not in first
+    assert second["If-None-Match"] == ETAG
+    assert second["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_concurrent_refreshes_share_one_request(scraper):
+    slow_server = serve(delay=0.2)
+    try:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(scraper.fetch_page(slow_server.url))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+    finally:
+        slow_server.shutdown()
+        slow_server.server_close()
+
+    assert results == [TOPIC_PAGE] * 8
+    assert len(slow_server.requests) == 1
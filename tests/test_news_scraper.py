@@ -0,0 +1,70 @@
+import pytest
+
+from news.news import YahooFinanceStockNewsScraper
+
+
+def story(title, summary="", href=None):
+    return {
+        "href": href or f"/news/{title.lower().replace(' ', '-')}.html",
+        "title": title,
+        "summary": summary,
+        "publishing": "Reuters • 2 hours ago",
+        "image": "https://example.com/image.jpg",
+    }
+
+
+class CountingMatcher:
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.scanned = []
+
+    def matches(self, text):
+        self.scanned.append(text)
+        return self.matcher.matches(text)
+
+    def search(self, text):
+        self.scanned.append(text)
+        return self.matcher.search(text)
+
+
+def scrape(monkeypatch, items):
+    scraper = YahooFinanceStockNewsScraper()
+    scraper.stock_matcher = CountingMatcher(scraper.stock_matcher)
+    monkeypatch.setattr(scraper, "fetch_page", lambda url: b"<html></html>")
+    monkeypatch.setattr(scraper, "parse_story_items_cached", lambda content: items)
+    return scraper, scraper.get_stock_news_articles(max_articles=10)
+
+
+def test_each_headline_is_scanned_for_keywords_once(monkeypatch):
+    items = [
+        story("Nvidia stock rallies after earnings"),
+        story("ACME names new chief executive"),
+        story("Remarkable snowfall blankets mountains"),
+    ]
+
+    scraper, articles = scrape(monkeypatch, items)
+
+    assert len(scraper.stock_matcher.scanned) == len(items)
+    assert [article["title"] for article in articles] == [item["title"] for item in items[:2]]
+    assert articles[0]["matched_keywords"] == ["earnings", "stock"]
+    assert articles[1]["matched_keywords"] == []
+
+
+@pytest.mark.parametrize("headline, keyword", [
+    ("Markets slide as yields climb", "market"),
+    ("ETFs draw record inflows", "etf"),
+    ("Analysts split on chipmaker", "analyst"),
+    ("Utilities raise dividends", "dividend"),
+    ("Brokers issue upgrades for retailers", "upgrade"),
+    ("Quarter misses estimates", "miss"),
+])
+def test_plural_keywords_still_match(headline, keyword):
+    scraper = YahooFinanceStockNewsScraper()
+
+    assert scraper.stock_matcher.search(headline)
+    assert keyword in [match for match, _, _ in scraper.stock_matcher.matches(headline)]
+
+
+@pytest.mark.parametrize("headline", ["Download the new app", "Goldman names new partner"])
+def test_keywords_do_not_match_inside_longer_words(headline):
+    assert not YahooFinanceStockNewsScraper().stock_matcher.search(headline)
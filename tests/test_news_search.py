@@ -0,0 +1,25 @@
+import pytest
+
+from news.store import article_store
+
+
+@pytest.fixture
+def articles():
+    return article_store.add([
+        {"title": f"Semiconductor rally lifts chipmakers {i}", "url": f"https://finance.yahoo.com/news/chips-{i}", "summary": ""}
+        for i in range(3)
+    ])
+
+
+@pytest.mark.parametrize("limit", [-1, 0, 101])
+def test_search_rejects_limits_outside_1_to_100(client, limit):
+    response = client.get("/news/search", params={"q": "semiconductor", "limit": limit})
+
+    assert response.status_code == 422
+
+
+def test_search_returns_at_most_limit_articles(client, articles):
+    response = client.get("/news/search", params={"q": "semiconductor", "limit": 2})
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
@@ -0,0 +1,38 @@
+import time
+
+from Graphs.cache import OHLCVCache
+
+
+def test_cold_fetch_requests_full_history(provider, tmp_path):
+    cache = OHLCVCache(cache_dir=str(tmp_path))
+
+    cache.get("AAPL")
+
+    ticker, options = provider.downloads[0]
+    assert ticker == "AAPL"
+    assert options["period"] == "max"
+    assert "start" not in options
+
+
+def test_cold_batch_fetch_requests_full_history(provider, tmp_path):
+    cache = OHLCVCache(cache_dir=str(tmp_path))
+
+    frames = cache.get_many(["AAPL", "MSFT"])
+
+    tickers, options = provider.downloads[0]
+    assert tickers == ["AAPL", "MSFT"]
+    assert options["period"] == "max"
+    assert "start" not in options
+    assert set(frames) == {"AAPL", "MSFT"}
+
+
+def test_stale_refresh_only_fetches_the_tail(provider, tmp_path):
+    cache = OHLCVCache(cache_dir=str(tmp_path), max_age=0)
+    stored = cache.get("AAPL")
+    time.sleep(0.01)
+
+    cache.get("AAPL")
+
+    _, options = provider.downloads[1]
+    assert options["start"] == stored.index.max().strftime("%Y-%m-%d")
+    assert "period" not in options
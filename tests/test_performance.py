@@ -0,0 +1,69 @@
+import math
+import statistics
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Report.performance import PERFORMANCE_COLUMNS, close_matrix, compute_performance
+
+DATES = pd.to_datetime(["2023-01-02", "2023-06-01", "2024-01-02", "2025-01-02"])
+STOCK = [100.0, 110.0, 99.0, 121.0]
+BENCHMARK = [100.0, 105.0, 100.0, 110.0]
+
+
+def returns(prices):
+    return [b / a - 1 for a, b in zip(prices, prices[1:])]
+
+
+@pytest.fixture
+def performance():
+    closes = pd.DataFrame({"ABC": STOCK, "SPY": BENCHMARK}, index=DATES)
+    return compute_performance(closes, benchmark="SPY")
+
+
+def test_total_return_and_cagr(performance):
+    years = (DATES[-1] - DATES[0]).days / 365.25
+
+    assert performance.loc["ABC", "Period % Change"] == pytest.approx(21.0)
+    assert performance.loc["ABC", "CAGR %"] == pytest.approx((1.21 ** (1 / years) - 1) * 100, abs=0.005)
+
+
+def test_max_drawdown_is_the_deepest_fall_from_a_peak(performance):
+    # 110 down to 99
+    assert performance.loc["ABC", "Max Drawdown %"] == pytest.approx(-10.0)
+    # 105 down to 100
+    assert performance.loc["SPY", "Max Drawdown %"] == pytest.approx(-4.76, abs=0.005)
+
+
+def test_volatility_is_annualized_sample_deviation(performance):
+    expected = statistics.stdev(returns(STOCK)) * math.sqrt(252) * 100
+
+    assert performance.loc["ABC", "Volatility %"] == pytest.approx(expected, abs=0.005)
+
+
+def test_beta_against_the_benchmark(performance):
+    r, b = returns(STOCK), returns(BENCHMARK)
+    r_mean, b_mean = statistics.mean(r), statistics.mean(b)
+    covariance = sum((x - r_mean) * (y - b_mean) for x, y in zip(r, b)) / (len(r) - 1)
+
+    assert performance.loc["ABC", "Beta"] == pytest.approx(covariance / statistics.variance(b), abs=0.005)
+    assert performance.loc["SPY", "Beta"] == pytest.approx(1.0)
+
+
+def test_symbols_without_two_prices_are_left_out():
+    closes = pd.DataFrame({"ABC": STOCK, "NEW": [np.nan, np.nan, np.nan, 50.0]}, index=DATES)
+
+    assert list(compute_performance(closes).index) == ["ABC"]
+
+
+@pytest.mark.parametrize("closes", [
+    pd.DataFrame(columns=["ABC", "SPY"], dtype=float),
+    pd.DataFrame({"ABC": [np.nan] * 4, "SPY": [np.nan] * 4}, index=DATES),
+    close_matrix(pd.DataFrame(), ["ABC", "SPY"]),
+])
+def test_no_usable_prices_give_an_empty_table(closes):
+    performance = compute_performance(closes, benchmark="SPY")
+
+    assert performance.empty
+    assert list(performance.columns) == PERFORMANCE_COLUMNS + ["Beta"]
@@ -0,0 +1,80 @@
+import json
+import sys
+import threading
+
+import pytest
+
+from core.profiler import Profile
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    """Enable the admin endpoints with a known token"""
+    import app_final
+
+    monkeypatch.setattr(app_final, "ADMIN_TOKEN", TOKEN)
+    return {"X-Admin-Token": TOKEN}
+
+
+@pytest.mark.parametrize("path", ["/admin/profiling", "/admin/profiles", "/admin/profiles/missing"])
+def test_admin_endpoints_are_disabled_without_a_configured_token(client, monkeypatch, path):
+    import app_final
+
+    monkeypatch.setattr(app_final, "ADMIN_TOKEN", None)
+
+    assert client.get(path, headers={"X-Admin-Token": ""}).status_code == 403
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}])
+@pytest.mark.parametrize("path", ["/admin/profiling", "/admin/profiles", "/admin/profiles/missing"])
+def test_admin_endpoints_reject_a_missing_or_wrong_token(client, admin, headers, path):
+    assert client.get(path, headers=headers).status_code == 401
+    assert client.post("/admin/profiling", json={"enabled": True}, headers=headers).status_code == 401
+
+
+def test_profile_header_is_ignored_without_the_admin_token(client, admin):
+    response = client.get("/health", headers={"X-Stockify-Profile": "1", "X-Admin-Token": "wrong"})
+
+    assert response.status_code == 200
+    assert "x-stockify-profile-id" not in response.headers
+
+
+def test_profiled_request_is_downloadable_as_speedscope(client, admin, provider):
+    response = client.post("/data", json={"stock": "AAPL"}, headers={"X-Stockify-Profile": "1", **admin})
+    profile_id = response.headers["x-stockify-profile-id"]
+
+    assert profile_id in [p["id"] for p in client.get("/admin/profiles", headers=admin).json()["profiles"]]
+    download = client.get(f"/admin/profiles/{profile_id}", headers=admin)
+    document = download.json()
+
+    assert download.headers["content-disposition"] == f'attachment; filename="{profile_id}.speedscope.json"'
+    assert document["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    assert document["name"] == "POST /data"
+    (profile,) = document["profiles"]
+    assert profile["type"] == "sampled" and profile["unit"] == "seconds"
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert client.get("/admin/profiles/missing", headers=admin).status_code == 404
+
+
+def test_speedscope_document_indexes_shared_frames():
+    profile = Profile("GET /test", hz=100)
+
+    def sample():
+        profile.sample(sys._current_frames(), {threading.get_ident(): "worker"})
+
+    profile.track(sample)
+    profile.track(sample)
+    profile.sample(sys._current_frames(), {})  # untracked threads are not sampled
+    document = json.loads(json.dumps(profile.speedscope()))
+
+    frames = document["shared"]["frames"]
+    (sampled,) = document["profiles"]
+    (stack,) = sampled["samples"]
+    assert len({frame["name"] for frame in frames}) == len(frames)
+    assert ";".join(frames[i]["name"] for i in stack) + " 2\n" == profile.collapsed()
+    assert sampled["weights"] == [0.02]
+    assert sampled["endValue"] == 0.02
+    assert frames[stack[0]] == {"name": "worker"}
+    assert frames[stack[-1]]["name"].startswith("sample (")
@@ -0,0 +1,48 @@
+import pytest
+
+from core.pipeline import Deadline, DeadlineExceeded
+from Report.report import analyze_company, get_final_investment_report, get_market_analysis
+
+
+def test_full_report_has_every_section(agents):
+    report = get_final_investment_report(["AAPL", "MSFT"])
+
+    for section in ("Section 1", "Section 2", "Section 3", "Section 4", "Disclaimer"):
+        assert section in report
+
+
+def test_market_analysis_propagates_deadline_errors(agents):
+    agents["market_analyst"].error = DeadlineExceeded("Request deadline of 1s exceeded")
+
+    with pytest.raises(DeadlineExceeded):
+        get_market_analysis(["AAPL"])
+
+
+def test_company_analysis_propagates_deadline_errors(agents):
+    agents["company_researcher"].error = DeadlineExceeded("Request deadline of 1s exceeded")
+
+    with pytest.raises(DeadlineExceeded):
+        analyze_company("AAPL")
+
+
+def test_stage_hitting_its_deadline_is_marked_incomplete(agents):
+    agents["market_analyst"].error = DeadlineExceeded("Request deadline of 1s exceeded")
+    statuses = {}
+
+    report = get_final_investment_report(["AAPL"], progress=statuses.__setitem__, deadline=Deadline(30))
+
+    assert statuses["market"] == "timed_out"
+    assert "Market analysis incomplete (timed out" in report
+
+
+def test_rate_limited_sections_fail_the_report(agents, monkeypatch):
+    from Report.llm_scheduler import RateLimited, llm_scheduler
+
+    monkeypatch.setattr(llm_scheduler, "max_retries", 0)
+    agents["company_researcher"].error = RateLimited("Quota exhausted")
+    statuses = {}
+
+    with pytest.raises(RateLimited):
+        get_final_investment_report(["AAPL"], progress=statuses.__setitem__)
+
+    assert statuses["company:AAPL"] == "failed"
@@ -0,0 +1,30 @@
+import time
+
+from Report.report import stream_investment_report
+
+
+def test_full_stream_ends_with_the_disclaimer(agents):
+    chunks = list(stream_investment_report(["AAPL", "MSFT"]))
+
+    report = "".join(chunks)
+    assert "## Section 4" in report
+    assert "**Disclaimer:**" in report
+    assert agents["team_lead"].prompts
+
+
+def test_closing_the_stream_stops_the_remaining_stages(agents):
+    agents["market_analyst"].delay = 0.5
+    agents["company_researcher"].delay = 0.5
+    statuses = {}
+
+    chunks = stream_investment_report(["AAPL", "MSFT"], progress=statuses.__setitem__)
+    assert next(chunks).startswith("# Stock Investment Report")
+    # The client disconnects while market and company stages are still running
+    chunks.close()
+    time.sleep(1.0)
+
+    assert not agents["stock_strategist"].prompts
+    assert not agents["team_lead"].prompts
+    assert statuses["strategist"] == "skipped"
+    assert statuses["team_lead"] == "skipped"
+    assert statuses["market"] == "timed_out"
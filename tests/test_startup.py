@@ -0,0 +1,22 @@
+import os
+import sys
+import json
+import subprocess
+
+from benchmarks.bench_import_time import DEFERRED_MODULES
+from tests.conftest import ROOT
+
+# Top-level packages that only endpoints and the warm-up may import
+HEAVY_PACKAGES = ["pandas", "yfinance", "bs4", "agno"]
+
+
+def test_importing_the_api_defers_heavy_packages():
+    code = "import sys, json, app_final; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True, check=True,
+    )
+    modules = json.loads(result.stdout.splitlines()[-1])
+
+    loaded = [name for name in modules if name.split(".")[0] in HEAVY_PACKAGES or name in DEFERRED_MODULES]
+    assert loaded == []